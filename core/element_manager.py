@@ -162,6 +162,32 @@ class ElementManager:
         return True
 
     def get_locator(self, key: str) -> Optional[Tuple[str, str]]:
+        item = self._find_item(key)
+        if not isinstance(item, dict):
+            return None
+        by = item.get("by")
+        value = item.get("value")
+        if not isinstance(by, str) or not isinstance(value, str):
+            return None
+        return by, value
+
+    def get_frames(self, key: str) -> Optional[List[Any]]:
+        """
+        Frame chain (outermost first) the element lives in.
+        Returns None when the entry does not record one, [] for the top-level document.
+        A string value is split on ">>".
+        """
+        item = self._find_item(key)
+        if not isinstance(item, dict) or "frames" not in item:
+            return None
+        frames = item.get("frames")
+        if isinstance(frames, str):
+            return [part.strip() for part in frames.split(">>") if part.strip()]
+        if isinstance(frames, list):
+            return list(frames)
+        return None
+
+    def _find_item(self, key: str) -> Optional[Dict[str, Any]]:
         group, name = self._parse_key(key)
         data = self._read_all()
         item = None
@@ -182,13 +208,7 @@ class ElementManager:
                             break
                     if item:
                         break
-        if not isinstance(item, dict):
-            return None
-        by = item.get("by")
-        value = item.get("value")
-        if not isinstance(by, str) or not isinstance(value, str):
-            return None
-        return by, value
+        return item if isinstance(item, dict) else None
 
     def _parse_key(self, key: str) -> Tuple[str, str]:
         if not isinstance(key, str):
@@ -1,9 +1,23 @@
 import logging
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 from core.action_base import ActionBase
 from core.flow_control import BreakLoopException, ContinueLoopException
 from core.exit_flow import ExitFlowException
+from core.run_metrics import RunMetrics
+from core import step_profiler
+from core.step_profiler import StepProfiler
+
+# Callables run once after every workflow run (e.g. flushing background work started by tools).
+# Each hook receives the run context.
+_SHUTDOWN_HOOKS: List[Callable[[Dict[str, Any]], None]] = []
+
+
+def register_shutdown_hook(hook: Callable[[Dict[str, Any]], None]) -> None:
+    """Register a callable to run at the end of every Engine.run()."""
+    if hook not in _SHUTDOWN_HOOKS:
+        _SHUTDOWN_HOOKS.append(hook)
+
 
 class Engine:
     """
@@ -59,7 +73,13 @@ class Engine:
                     action_instance = action_class(params)
                     self.logger.info(f"{prefix}Executing {action_instance.name}")
                     
-                    success = action_instance.execute(context)
+                    profiler = context.get("__profiler__")
+                    frame = profiler.begin(line if line is not None else id(step), f"{prefix}{action_instance.name}") if profiler else None
+                    try:
+                        success = action_instance.execute(context)
+                    finally:
+                        if frame is not None:
+                            profiler.end(frame)
                     if not success:
                         self.logger.error(f"{prefix}Step {tool_id} failed.")
                         return False
@@ -91,8 +111,28 @@ class Engine:
         
         # Inject the runner
         self.context["__runner__"] = self.execute_step_data
+        self.context["__metrics__"] = RunMetrics()
+        profiler = StepProfiler(metrics=self.context["__metrics__"])
+        self.context["__profiler__"] = profiler
+        step_profiler.activate(profiler)
         
-        if hasattr(self, 'workflow_data'):
-            self.execute_step_data(self.workflow_data, self.context)
+        try:
+            if hasattr(self, 'workflow_data'):
+                self.execute_step_data(self.workflow_data, self.context)
+        finally:
+            self._run_shutdown_hooks()
+            step_profiler.activate(None)
+            counters = self.context["__metrics__"].snapshot()
+            if counters:
+                self.logger.info(f"Run metrics: {counters}")
+            if profiler.total_commands:
+                self.logger.info(f"Step profile:\n{profiler.format_report()}")
         
         self.logger.info("Workflow execution finished.")
+
+    def _run_shutdown_hooks(self):
+        for hook in list(_SHUTDOWN_HOOKS):
+            try:
+                hook(self.context)
+            except Exception as e:
+                self.logger.exception(f"Shutdown hook {getattr(hook, '__name__', hook)} failed: {e}")
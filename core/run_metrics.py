@@ -0,0 +1,34 @@
+import threading
+from typing import Dict, Any
+
+
+class RunMetrics:
+    """
+    Per-run counters collected by tools (cache hits, bytes transferred, ...).
+    The engine injects one instance into the context as '__metrics__' and logs a summary at the end.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+
+    def incr(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def get(self, name: str, default: float = 0) -> float:
+        return self.counters.get(name, default)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.counters)
+
+
+def get_metrics(context: Dict[str, Any]) -> RunMetrics:
+    """
+    Returns the run's metrics object, creating it when an action runs outside the engine.
+    """
+    metrics = context.get("__metrics__")
+    if not isinstance(metrics, RunMetrics):
+        metrics = RunMetrics()
+        context["__metrics__"] = metrics
+    return metrics
@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from core.run_metrics import RunMetrics
+
+DEFAULT_ROUNDTRIP_BUDGET = 20
+
+_local = threading.local()
+
+
+class StepProfiler:
+    """
+    Per-step profile of a run: wall time plus the WebDriver commands issued while the step was the
+    innermost running step (loop containers only get the commands they issue themselves).
+
+    The engine injects one instance into the context as '__profiler__' and activates it for the
+    running thread; instrumented drivers report each command through record_command().
+    """
+
+    def __init__(self, roundtrip_budget: Optional[int] = None, metrics: Optional[RunMetrics] = None):
+        if roundtrip_budget is None:
+            try:
+                roundtrip_budget = int(os.environ.get("STEP_ROUNDTRIP_BUDGET", DEFAULT_ROUNDTRIP_BUDGET))
+            except ValueError:
+                roundtrip_budget = DEFAULT_ROUNDTRIP_BUDGET
+        self.roundtrip_budget = roundtrip_budget
+        self.metrics = metrics
+        self.steps: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self.total_commands = 0
+        self._stack: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def begin(self, key: Any, label: str) -> Dict[str, Any]:
+        frame = {"key": key, "label": label, "start": time.perf_counter(),
+                 "commands": 0, "command_time": 0.0, "bytes_out": 0, "bytes_in": 0, "by_command": Counter()}
+        self._stack.append(frame)
+        return frame
+
+    def end(self, frame: Dict[str, Any]) -> None:
+        elapsed = time.perf_counter() - frame["start"]
+        if self._stack and self._stack[-1] is frame:
+            self._stack.pop()
+        elif frame in self._stack:
+            self._stack.remove(frame)
+
+        with self._lock:
+            step = self.steps.get(frame["key"])
+            if step is None:
+                step = self.steps[frame["key"]] = {
+                    "label": frame["label"], "runs": 0, "time": 0.0, "commands": 0, "command_time": 0.0,
+                    "bytes_out": 0, "bytes_in": 0, "max_commands": 0, "over_budget": 0, "by_command": Counter()}
+            step["runs"] += 1
+            step["time"] += elapsed
+            for name in ("commands", "command_time", "bytes_out", "bytes_in"):
+                step[name] += frame[name]
+            step["by_command"].update(frame["by_command"])
+            step["max_commands"] = max(step["max_commands"], frame["commands"])
+
+        if self.roundtrip_budget and frame["commands"] > self.roundtrip_budget:
+            step["over_budget"] += 1
+            if self.metrics is not None:
+                self.metrics.incr("web_steps_over_budget")
+            top = ", ".join(f"{c}×{n}" for c, n in frame["by_command"].most_common(3))
+            print(f"[Profiler] {frame['label']}: {frame['commands']} WebDriver round-trips "
+                  f"(budget {self.roundtrip_budget}), {top}")
+
+    def record_command(self, command: str, seconds: float, bytes_out: int, bytes_in: int) -> None:
+        with self._lock:
+            self.total_commands += 1
+            if self._stack:
+                frame = self._stack[-1]
+                frame["commands"] += 1
+                frame["command_time"] += seconds
+                frame["bytes_out"] += bytes_out
+                frame["bytes_in"] += bytes_in
+                frame["by_command"][command] += 1
+        if self.metrics is not None:
+            self.metrics.incr("web_commands")
+            self.metrics.incr(f"web_cmd.{command}")
+            self.metrics.incr("web_command_ms", round(seconds * 1000, 3))
+            self.metrics.incr("web_bytes_out", bytes_out)
+            self.metrics.incr("web_bytes_in", bytes_in)
+
+    def report(self, sort_by: str = "time", top: int = 10) -> List[Dict[str, Any]]:
+        """Aggregated rows per step, most expensive first."""
+        with self._lock:
+            rows = [dict(step, key=key, by_command=dict(step["by_command"])) for key, step in self.steps.items()]
+        rows.sort(key=lambda r: r.get(sort_by, 0), reverse=True)
+        return rows[:top] if top else rows
+
+    def format_report(self, top: int = 10) -> str:
+        lines = [f"{'step':<36} {'runs':>5} {'time(ms)':>10} {'cmds':>6} {'cmd(ms)':>9} {'KB out/in':>13}  top commands"]
+        for row in self.report(top=top):
+            commands = ", ".join(f"{c}×{n}" for c, n in Counter(row["by_command"]).most_common(3))
+            flag = " !" if row["over_budget"] else ""
+            lines.append(f"{row['label'][:36]:<36} {row['runs']:>5} {row['time'] * 1000:>10.1f} {row['commands']:>6} "
+                         f"{row['command_time'] * 1000:>9.1f} {row['bytes_out'] / 1024:>6.1f}/{row['bytes_in'] / 1024:<6.1f} {commands}{flag}")
+        return "\n".join(lines)
+
+
+def activate(profiler: Optional[StepProfiler]) -> None:
+    """Make `profiler` receive the commands issued by the current thread."""
+    _local.profiler = profiler
+
+
+def current_profiler() -> Optional[StepProfiler]:
+    return getattr(_local, "profiler", None)
+
+
+def record_command(command: str, seconds: float, bytes_out: int = 0, bytes_in: int = 0) -> None:
+    profiler = current_profiler()
+    if profiler is not None:
+        profiler.record_command(command, seconds, bytes_out, bytes_in)
@@ -3,7 +3,7 @@ import json
 from typing import Dict, List, Any
 
 
-LOGIC_LOOP_TOOLS = {"For循环", "Foreach循环", "Foreach字典循环", "While循环"}
+LOGIC_LOOP_TOOLS = {"For循环", "Foreach循环", "Foreach字典循环", "While循环", "Excel分块循环", "多标签页循环"}
 
 
 def compute_logic_hierarchy(steps, strict: bool = False):
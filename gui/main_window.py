@@ -25,17 +25,22 @@ from core.workflow_manager import WorkflowManager, compute_logic_hierarchy, LOGI
 from core.element_manager import ElementManager
 from tools.basic_tools import PrintLogAction, DelayAction, SetVariableAction, ExitProgramAction
 from tools.web_tools import (OpenBrowserAction, CloseBrowserAction, ClickElementAction, 
-                             InputTextAction, GoToUrlAction, GetElementInfoAction, SendKeysAction,
-                             HoverElementAction, SwitchFrameAction, ScrollToElementAction, SwitchWindowAction,
+                             InputTextAction, FillFormAction, GoToUrlAction, GetElementInfoAction, SendKeysAction,
+                             HoverElementAction, SwitchFrameAction, ScrollToElementAction, SwitchWindowAction, TabPoolLoopAction,
                              DrawMousePathAction, HttpDownloadAction,
                              SaveElementAction, SetCheckboxAction,
                              WaitElementAction, WaitAllElementsAction,
-                             GetFirstVisibleAction, FindChildAction, FindChildrenAction)
+                             GetFirstVisibleAction, FindChildAction, FindChildrenAction, ScrapeTableAction,
+                             ElementOCRAction, BatchHttpDownloadAction,
+                             StartNetworkCaptureAction, CaptureDownloadUrlAction,
+                             SaveSessionAction, RestoreSessionAction)
 from tools.logic_tools import (LoopAction, ForEachAction, ForEachDictAction, WhileAction, 
                                IfAction, ElseIfAction, ElseAction, 
                                BreakAction, ContinueAction)
-from tools.util_tools import (WaitForFileAndCopyAction, ClearDirectoryAction, OCRImageAction, WeChatNotifyAction, PathExistsAction)
-from tools.excel_tools import (OpenExcelAction, ReadExcelAction, WriteExcelAction, CloseExcelAction, GetExcelRowCountAction, SaveExcelAction)
+from tools.util_tools import (WaitForFileAndCopyAction, ClearDirectoryAction, BulkCopyFilesAction, BulkMoveFilesAction, OCRImageAction, BatchOCRAction, WeChatNotifyAction, PathExistsAction)
+from tools.excel_tools import (OpenExcelAction, ReadExcelAction, WriteExcelAction, CloseExcelAction, GetExcelRowCountAction, GetExcelUsedRangeAction, SaveExcelAction,
+                               BatchReadExcelAction, BatchReadExcelLoopAction)
+from tools.table_tools import (TableFilterAction, TableSortAction, TableDedupeAction, TableGroupAction, TableJoinAction)
 from gui.widget_factory import WidgetFactory
 import check_workflow_structure as wfcheck
 
@@ -59,6 +64,7 @@ TOOL_CATEGORIES = {
         "跳转链接": GoToUrlAction,
         "点击元素": ClickElementAction,
         "输入文本": InputTextAction,
+        "批量填写表单": FillFormAction,
         "发送按键": SendKeysAction,
         "获取元素信息": GetElementInfoAction,
         "设置复选框": SetCheckboxAction,
@@ -67,13 +73,21 @@ TOOL_CATEGORIES = {
         "滚动到元素": ScrollToElementAction,
         "切换 iFrame": SwitchFrameAction,
         "切换窗口": SwitchWindowAction,
+        "多标签页循环": TabPoolLoopAction,
         "绘制鼠标轨迹": DrawMousePathAction,
         "HTTP 下载": HttpDownloadAction,
+        "批量 HTTP 下载": BatchHttpDownloadAction,
+        "开始监听网络": StartNetworkCaptureAction,
+        "捕获下载链接": CaptureDownloadUrlAction,
+        "保存登录状态": SaveSessionAction,
+        "恢复登录状态": RestoreSessionAction,
         "等待元素": WaitElementAction,
         "等待全部元素": WaitAllElementsAction,
         "获取第一个可见元素": GetFirstVisibleAction,
         "查找子元素": FindChildAction,
         "查找所有子元素": FindChildrenAction,
+        "表格批量抓取": ScrapeTableAction,
+        "元素 OCR 识别": ElementOCRAction,
         "关闭浏览器": CloseBrowserAction
     },
     "Excel 工具": {
@@ -81,8 +95,18 @@ TOOL_CATEGORIES = {
         "读取 Excel": ReadExcelAction,
         "写入 Excel": WriteExcelAction,
         "获取行数": GetExcelRowCountAction,
+        "获取已用范围": GetExcelUsedRangeAction,
         "保存 Excel": SaveExcelAction,
-        "关闭 Excel": CloseExcelAction
+        "关闭 Excel": CloseExcelAction,
+        "批量读取 Excel": BatchReadExcelAction,
+        "Excel分块循环": BatchReadExcelLoopAction
+    },
+    "表格数据": {
+        "表格筛选": TableFilterAction,
+        "表格排序": TableSortAction,
+        "表格去重": TableDedupeAction,
+        "表格分组汇总": TableGroupAction,
+        "表格关联": TableJoinAction
     },
     "逻辑控制": {
         "For循环": LoopAction,
@@ -100,7 +124,10 @@ TOOL_CATEGORIES = {
     "数据与工具": {
         "等待并复制文件": WaitForFileAndCopyAction,
         "清空文件夹": ClearDirectoryAction,
+        "批量复制文件": BulkCopyFilesAction,
+        "批量移动文件": BulkMoveFilesAction,
         "OCR 文字识别": OCRImageAction,
+        "批量 OCR 识别": BatchOCRAction,
         "企业微信通知": WeChatNotifyAction,
         "判断路径是否存在": PathExistsAction
     }
@@ -141,7 +168,7 @@ for cat, tools in TOOL_CATEGORIES.items():
         ENGINE_REGISTRY[tool_id] = cls
         ENGINE_REGISTRY[display_name] = cls
 
-LOGIC_TOOLS = ["For循环", "Foreach循环", "Foreach字典循环", "While循环", "If 条件", "Else If 条件", "Else 否则"]
+LOGIC_TOOLS = ["For循环", "Foreach循环", "Foreach字典循环", "While循环", "Excel分块循环", "多标签页循环", "If 条件", "Else If 条件", "Else 否则"]
 
 class ParameterDialog(QDialog):
     def __init__(self, tool_name, schema, current_params=None, parent=None, scope_anchor=None, extra_context=None):
@@ -1281,7 +1308,7 @@ class MainWindow(QMainWindow):
             d = it.data(0, Qt.UserRole) or {}
             return d.get("tool_name") == "EndMarker"
         def is_loop_tool_name(n):
-            return n in ("For循环", "Foreach循环", "Foreach字典循环", "While循环")
+            return n in LOGIC_LOOP_TOOLS
         def add_vars_from_item(it, into):
             d = it.data(0, Qt.UserRole) or {}
             tname = d.get("tool_name")
@@ -2259,7 +2286,7 @@ class MainWindow(QMainWindow):
             item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
             end_text = None
             end_params = {}
-            if tool_name in ("For循环", "Foreach循环", "Foreach字典循环", "While循环"):
+            if tool_name in LOGIC_LOOP_TOOLS:
                 end_text = "循环体结束"
                 end_params = {"scope": "loop"}
             elif tool_name == "If 条件":
@@ -2640,7 +2667,7 @@ class MainWindow(QMainWindow):
                     if is_else_header and not hidden and not it.isExpanded():
                         collapsed_else_block = True
 
-                if name in ("For循环", "Foreach循环", "Foreach字典循环", "While循环"):
+                if name in LOGIC_LOOP_TOOLS:
                     loop_stack.append(it)
                 elif name == "EndMarker" and scope == "loop":
                     if loop_stack:
@@ -284,16 +284,17 @@ class WidgetFactory:
                         for name, meta in group_items.items():
                             by = meta.get("by") if isinstance(meta, dict) else ""
                             value = meta.get("value") if isinstance(meta, dict) else ""
+                            frames = meta.get("frames") if isinstance(meta, dict) else None
                             key = f"{group}/{name}"
-                            items.append((key, by, value))
+                            items.append((key, by, value, frames))
                 items.sort(key=lambda x: x[0])
 
                 lst.clear()
                 ft = (filter_text or "").lower()
-                for key, by, value in items:
+                for key, by, value, frames in items:
                     if ft in key.lower():
                         item = QListWidgetItem(f"{key}  [{by}]")
-                        item.setData(Qt.UserRole, {"key": key, "by": by, "value": value})
+                        item.setData(Qt.UserRole, {"key": key, "by": by, "value": value, "frames": frames})
                         lst.addItem(item)
             
             populate()
@@ -335,12 +336,15 @@ class WidgetFactory:
             by_input = QComboBox()
             by_input.addItems(["xpath", "css", "id", "name", "class_name", "tag_name", "link_text", "partial_link_text"])
             value_input = QLineEdit()
+            frames_input = QLineEdit()
+            frames_input.setPlaceholderText("不在 iframe 中留空；多级用 >> 分隔")
             desc_input = QLineEdit()
             
             clayout.addRow("分组:", group_input)
             clayout.addRow("名称:", name_input)
             clayout.addRow("定位方式:", by_input)
             clayout.addRow("定位值:", value_input)
+            clayout.addRow("所在 iframe:", frames_input)
             clayout.addRow("备注:", desc_input)
             
             # Buttons
@@ -362,6 +366,9 @@ class WidgetFactory:
                     return
                 
                 meta = {"description": desc_input.text().strip()}
+                frames = [p.strip() for p in frames_input.text().split(">>") if p.strip()]
+                if frames:
+                    meta["frames"] = frames
                 try:
                     private_mgr.save_element(group, name, by, value, meta)
                     cdlg.accept()
@@ -413,7 +420,8 @@ class WidgetFactory:
                 group = parts[0] if len(parts) > 0 else "Default"
                 name = parts[1] if len(parts) > 1 else key
                 
-                private_mgr.save_element(group, name, data["by"], data["value"])
+                meta = {"frames": data["frames"]} if data.get("frames") is not None else None
+                private_mgr.save_element(group, name, data["by"], data["value"], meta)
                 
                 # Refresh private list to show the new item
                 if "private" in refresh_funcs:
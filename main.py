@@ -7,6 +7,7 @@ from tools.util_tools import ExtractContentAction
 import sys
 from PySide6.QtWidgets import QApplication
 from gui.main_window import FlowManagerWindow
+from utils.img_ocr import ImgOcr
 
 # Registry of available tools
 TOOL_REGISTRY = {
@@ -121,6 +122,8 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1].lower() == "cli":
         main()
     else:
+        # Opt-in (OCR_WARMUP=1): load the OCR model in the background while the window starts
+        ImgOcr.warm_up_if_enabled()
         app = QApplication(sys.argv)
         win = FlowManagerWindow()
         win.show()
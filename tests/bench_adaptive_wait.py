@@ -0,0 +1,156 @@
+"""
+Adaptive wait polling benchmark.
+
+Serves a local page whose element appears after a given delay and measures the mean
+time-to-detect (element inserted -> wait returns) and the number of polls for each
+wait policy in WAIT_POLICIES, in headless Chrome.
+
+Without Chrome/chromedriver (or with --simulate) a fake driver whose element appears
+after the same delays is used, which measures the polling overshoot alone.
+
+Usage:
+    python tests/bench_adaptive_wait.py [--rounds N] [--delays 50,200,800,2000] [--chrome PATH] [--simulate]
+"""
+import sys
+import os
+import argparse
+import shutil
+import statistics
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from utils.adaptive_wait import AdaptiveWait, WAIT_POLICIES
+
+
+def build_page(delay_ms):
+    return f"""<!doctype html><html><head><meta charset="utf-8"></head><body>
+<div id="box"></div>
+<script>
+setTimeout(function () {{
+  var el = document.createElement('button');
+  el.id = 'late'; el.textContent = 'ready';
+  document.getElementById('box').appendChild(el);
+  window.__shownAt = Date.now();
+}}, {int(delay_ms)});
+</script></body></html>""".encode("utf-8")
+
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        delay = int(parse_qs(urlparse(self.path).query).get("delay", ["0"])[0])
+        body = build_page(delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Polls:
+    """统计等待条件被调用的次数"""
+
+    def __init__(self, condition):
+        self.condition = condition
+        self.count = 0
+
+    def __call__(self, driver):
+        self.count += 1
+        return self.condition(driver)
+
+
+class _SimulatedDriver:
+    """元素在 delay 秒后出现，模拟一次 find_element 往返约 2ms"""
+
+    def __init__(self, delay):
+        self.shown_at = time.time() + delay
+
+    def find_element(self, by, value):
+        time.sleep(0.002)
+        if time.time() < self.shown_at:
+            raise NoSuchElementException(value)
+        return object()
+
+
+def find_chromedriver():
+    local = os.path.join(os.path.dirname(__file__), "..", "drivers",
+                         "chromedriver.exe" if sys.platform == "win32" else "chromedriver")
+    if os.path.exists(local):
+        return os.path.abspath(local)
+    return shutil.which("chromedriver")
+
+
+def measure_browser(driver, url, delay_ms, policy):
+    driver.get(f"{url}?delay={delay_ms}")
+    polls = _Polls(EC.presence_of_element_located((By.ID, "late")))
+    AdaptiveWait(driver, 10, policy=policy).until(polls)
+    detected = time.time() * 1000
+    shown = driver.execute_script("return window.__shownAt;")
+    return detected - shown, polls.count
+
+
+def measure_simulated(delay_ms, policy):
+    driver = _SimulatedDriver(delay_ms / 1000.0)
+    polls = _Polls(EC.presence_of_element_located((By.ID, "late")))
+    AdaptiveWait(driver, 10, policy=policy).until(polls)
+    return (time.time() - driver.shown_at) * 1000, polls.count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delays", default="50,200,800,2000", help="element delays (ms)")
+    parser.add_argument("--chrome", default="")
+    parser.add_argument("--simulate", action="store_true", help="use a fake driver instead of Chrome")
+    args = parser.parse_args()
+    delays = [int(d) for d in args.delays.split(",") if d.strip()]
+
+    driver, server, url = None, None, ""
+    chrome_path = args.chrome or next((shutil.which(n) for n in ("google-chrome", "chromium", "chromium-browser", "chrome") if shutil.which(n)), None)
+    if not args.simulate and chrome_path and find_chromedriver():
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from utils.driver_helper import DriverHelper
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+        options = DriverHelper.build_selenium_chrome_options(executable_path=chrome_path, headless=True)
+        driver = webdriver.Chrome(service=Service(find_chromedriver()), options=options)
+        print(f"mode: headless Chrome  site: {url}  rounds: {args.rounds}")
+    else:
+        print(f"mode: simulated driver (Chrome/chromedriver not used)  rounds: {args.rounds}")
+
+    print(f"{'policy':<8} {'delay(ms)':>10} {'detect mean(ms)':>16} {'detect max(ms)':>15} {'polls':>7}")
+    try:
+        for name in WAIT_POLICIES:
+            for delay in delays:
+                lags, polls = [], []
+                for _ in range(args.rounds):
+                    if driver is not None:
+                        lag, count = measure_browser(driver, url, delay, name)
+                    else:
+                        lag, count = measure_simulated(delay, name)
+                    lags.append(lag)
+                    polls.append(count)
+                print(f"{name:<8} {delay:>10} {statistics.mean(lags):>16.1f} {max(lags):>15.1f} {statistics.mean(polls):>7.1f}")
+    finally:
+        if driver is not None:
+            driver.quit()
+        if server is not None:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
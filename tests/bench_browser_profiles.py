@@ -0,0 +1,128 @@
+"""
+Browser performance-profile benchmark.
+
+Serves a local test site (DOM text plus slow images, fonts and media) and measures
+driver.get() navigation time in headless Chrome for each profile in PERFORMANCE_PROFILES.
+
+Usage:
+    python tests/bench_browser_profiles.py [--rounds N] [--delay MS] [--chrome PATH]
+
+Requires Chrome/Chromium and a matching chromedriver on PATH (or in drivers/).
+"""
+import sys
+import os
+import argparse
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+
+from utils.driver_helper import DriverHelper, PERFORMANCE_PROFILES
+
+# 1x1 透明 PNG
+_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000100e221bc330000000049454e44ae426082"
+)
+
+
+def build_page(images=30):
+    rows = "".join(f"<tr><td>{i}</td><td>item-{i}</td></tr>" for i in range(200))
+    imgs = "".join(f'<img src="/img/{i}.png" width="8" height="8">' for i in range(images))
+    return f"""<!doctype html><html><head><meta charset="utf-8">
+<style>@font-face {{ font-family: slow; src: url(/font/slow.woff2); }} body {{ font-family: slow, sans-serif; }}</style>
+</head><body><h1 id="title">profile bench</h1><table>{rows}</table>{imgs}
+<video src="/media/clip.mp4" preload="auto"></video></body></html>""".encode("utf-8")
+
+
+def make_handler(delay):
+    page = build_page()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.startswith("/img/"):
+                body, ctype = _PNG, "image/png"
+            elif self.path.startswith("/font/"):
+                body, ctype = b"\0" * 2048, "font/woff2"
+            elif self.path.startswith("/media/"):
+                body, ctype = b"\0" * 65536, "video/mp4"
+            else:
+                body, ctype = page, "text/html; charset=utf-8"
+            if ctype != "text/html; charset=utf-8":
+                # 模拟慢速静态资源
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def find_chromedriver():
+    local = os.path.join(os.path.dirname(__file__), "..", "drivers",
+                         "chromedriver.exe" if sys.platform == "win32" else "chromedriver")
+    if os.path.exists(local):
+        return os.path.abspath(local)
+    return shutil.which("chromedriver")
+
+
+def launch(profile_name, chrome_path, cache_dir):
+    profile = DriverHelper.resolve_performance_profile(profile_name)
+    options = DriverHelper.build_selenium_chrome_options(executable_path=chrome_path, headless=True)
+    DriverHelper.apply_performance_options(options, profile, cache_dir if profile_name != "标准" else None)
+    driver = webdriver.Chrome(service=Service(find_chromedriver()), options=options)
+    DriverHelper.apply_network_blocking(driver, profile)
+    return driver
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delay", type=int, default=200, help="static resource delay (ms)")
+    parser.add_argument("--chrome", default="")
+    args = parser.parse_args()
+
+    chrome_path = args.chrome or next((shutil.which(n) for n in ("google-chrome", "chromium", "chromium-browser", "chrome") if shutil.which(n)), None)
+    if not chrome_path or not find_chromedriver():
+        print("Chrome/chromedriver not found, skipping benchmark.")
+        return
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.delay / 1000.0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"site: {url}  static delay: {args.delay} ms  rounds: {args.rounds}")
+    print(f"{'profile':<8} {'median(ms)':>12} {'min(ms)':>10} {'text ok':>8}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name in PERFORMANCE_PROFILES:
+            driver = launch(name, chrome_path, cache_dir)
+            try:
+                times, ok = [], True
+                for i in range(args.rounds):
+                    start = time.perf_counter()
+                    driver.get(f"{url}?r={i}")
+                    ok = ok and driver.find_element(By.ID, "title").text == "profile bench"
+                    times.append((time.perf_counter() - start) * 1000)
+                print(f"{name:<8} {statistics.median(times):>12.1f} {min(times):>10.1f} {str(ok):>8}")
+            finally:
+                driver.quit()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+OCR input-path benchmark.
+
+Compares the legacy path (PIL decode -> RGB -> PNG re-encode -> ddddocr) with the
+raw-bytes fast path on a captcha corpus.
+
+Usage:
+    python tests/bench_ocr.py [corpus_dir] [--rounds N]
+
+Without corpus_dir a synthetic corpus of PNG/JPEG captchas is generated in a temp dir.
+"""
+import sys
+import os
+import argparse
+import random
+import string
+import tempfile
+import time
+from io import BytesIO
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image, ImageDraw
+
+from utils.img_ocr import ImgOcr
+
+
+def make_corpus(directory, count=200):
+    rnd = random.Random(42)
+    for i in range(count):
+        text = "".join(rnd.choice(string.ascii_uppercase + string.digits) for _ in range(4))
+        img = Image.new("RGB", (120, 40), (rnd.randint(200, 255),) * 3)
+        draw = ImageDraw.Draw(img)
+        draw.text((10 + rnd.randint(0, 20), 12), text, fill="black")
+        for _ in range(6):
+            draw.line([(rnd.randint(0, 120), rnd.randint(0, 40)), (rnd.randint(0, 120), rnd.randint(0, 40))], fill="gray")
+        ext = "png" if i % 2 == 0 else "jpg"
+        img.save(os.path.join(directory, f"{i:04d}.{ext}"))
+
+
+def legacy_bytes(path):
+    # What OCRImageAction + ImgOcr did before: decode, convert, re-encode
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+        buf = BytesIO()
+        img.save(buf, format="PNG")
+        return buf.getvalue()
+
+
+def run(paths, prepare, ocr, rounds):
+    best = None
+    results = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = [ocr.ocr.classification(prepare(p)) for p in paths]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?", default="")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    ocr = ImgOcr.shared()
+    ocr.ocr.classification(Image.new("RGB", (64, 24), "white"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = args.corpus
+        if not corpus:
+            corpus = tmp
+            make_corpus(corpus)
+        paths = sorted(os.path.join(corpus, f) for f in os.listdir(corpus)
+                       if f.lower().endswith((".png", ".jpg", ".jpeg", ".gif", ".bmp")))
+        print(f"Corpus: {corpus} ({len(paths)} images, best of {args.rounds})")
+
+        def read_raw(p):
+            with open(p, "rb") as f:
+                return f.read()
+
+        # Preparation cost alone (what the fast path removes)
+        for label, prepare in (("legacy decode+encode", legacy_bytes), ("fast raw bytes", ocr._to_classifier_bytes)):
+            start = time.perf_counter()
+            for p in paths:
+                prepare(p)
+            print(f"  prepare  {label:<22} {(time.perf_counter() - start) * 1000 / len(paths):8.3f} ms/img")
+
+        legacy_time, legacy_results = run(paths, legacy_bytes, ocr, args.rounds)
+        fast_time, fast_results = run(paths, ocr._to_classifier_bytes, ocr, args.rounds)
+        same = sum(a == b for a, b in zip(legacy_results, fast_results))
+        print(f"  end2end  legacy                 {legacy_time * 1000 / len(paths):8.3f} ms/img")
+        print(f"  end2end  fast                   {fast_time * 1000 / len(paths):8.3f} ms/img")
+        print(f"  identical results: {same}/{len(paths)}")
+
+
+if __name__ == "__main__":
+    main()
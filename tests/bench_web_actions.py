@@ -0,0 +1,164 @@
+"""
+Web action benchmark suite.
+
+Drives the real web actions (GoToUrlAction, WaitElementAction, ClickElementAction,
+GetElementInfoAction, FindChildrenAction, SwitchFrameAction, ScrollToElementAction,
+HttpDownloadAction, ScrapeTableAction) against the local stand-in site
+(tests/local_site.py) in headless Chrome and reports latency percentiles and
+WebDriver round-trips per scenario.
+Runs fully offline.
+
+Usage:
+    python tests/bench_web_actions.py [--rounds N] [--only name,name] [--chrome PATH]
+
+Requires Chrome/Chromium and a matching chromedriver on PATH (or in drivers/); skips otherwise.
+"""
+import sys
+import os
+import argparse
+import contextlib
+import io
+import shutil
+import statistics
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from local_site import LocalSite
+from core import step_profiler
+from core.step_profiler import StepProfiler
+from utils.driver_instrument import DriverInstrument
+from utils.frame_path import FramePath
+from tools.web_tools import (GoToUrlAction, WaitElementAction, ClickElementAction, GetElementInfoAction,
+                             FindChildrenAction, SwitchFrameAction, ScrollToElementAction, HttpDownloadAction,
+                             ScrapeTableAction)
+
+
+def find_chromedriver():
+    local = os.path.join(os.path.dirname(__file__), "..", "drivers",
+                         "chromedriver.exe" if sys.platform == "win32" else "chromedriver")
+    if os.path.exists(local):
+        return os.path.abspath(local)
+    return shutil.which("chromedriver")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def run(action, ctx):
+    if not action.execute(ctx):
+        raise RuntimeError(f"{action.name} failed: {action.params}")
+
+
+def goto(site, path, wait="页面加载完成"):
+    return GoToUrlAction({"url": site.url(path), "wait_condition": wait, "timeout": 20})
+
+
+def wait(by, value, wait_type="visible", output="element", timeout=20):
+    return WaitElementAction({"by": by, "value": value, "wait_type": wait_type, "timeout": timeout,
+                              "output_variable": output})
+
+
+def scenarios(site, tmp):
+    """name -> (setup actions, timed actions)"""
+    return {
+        "goto": ([], [goto(site, "/delayed?ms=0")]),
+        "wait_delayed_200ms": ([goto(site, "/delayed?ms=200")], [wait("id", "late")]),
+        "click_repeated_x10": ([goto(site, "/delayed?ms=0"), wait("id", "late")],
+                               [ClickElementAction({"by": "id", "value": "late", "timeout": 10}) for _ in range(10)]),
+        "get_info": ([goto(site, "/delayed?ms=0"), wait("id", "late")],
+                     [GetElementInfoAction({"by": "id", "value": "title", "output_variable": "title", "timeout": 10})]),
+        "find_children_500": ([goto(site, "/table?rows=500&pages=1"), wait("css", "#data tbody", "present", "tbody")],
+                              [FindChildrenAction({"parent_element": "tbody", "xpath": "./tr", "output_variable": "rows"})]),
+        "frame_text": ([goto(site, "/frames")],
+                       [SwitchFrameAction({"iframe_id": "outer"}),
+                        GetElementInfoAction({"by": "id", "value": "inner-text", "output_variable": "inner", "timeout": 10})]),
+        "frame_nested_x5": ([goto(site, "/frames")],
+                            [action for _ in range(5) for action in (
+                                SwitchFrameAction({"iframe_id": "outer >> inner"}),
+                                GetElementInfoAction({"by": "id", "value": "leaf-text", "output_variable": "leaf", "timeout": 10}),
+                                SwitchFrameAction({"iframe_id": "outer"}),
+                                GetElementInfoAction({"by": "id", "value": "inner-text", "output_variable": "inner", "timeout": 10}))]),
+        "spa_lazy_route": ([goto(site, "/spa?ms=150"), wait("id", "home")],
+                           [ClickElementAction({"by": "id", "value": "nav-list", "timeout": 10}),
+                            wait("css", "#list li:nth-child(50)")]),
+        "infinite_scroll_60": ([goto(site, "/scroll?total=60&batch=20&ms=50")],
+                               [ScrollToElementAction({"by": "id", "value": "sentinel", "timeout": 10}),
+                                wait("css", "#feed li:nth-child(40)", "present"),
+                                ScrollToElementAction({"by": "id", "value": "sentinel", "timeout": 10}),
+                                wait("id", "end", "present")]),
+        "scrape_5_pages_nav": ([goto(site, "/table?rows=50&pages=5")],
+                               [ScrapeTableAction({"rows_locator": "#data tbody tr", "next_locator": "#next",
+                                                   "columns": "id => td.id\nname => td.name\nprice => td.price"})]),
+        "scrape_5_pages_js": ([goto(site, "/table?rows=50&pages=5&mode=js&ms=100")],
+                              [ScrapeTableAction({"rows_locator": "#data tbody tr", "next_locator": "#next"})]),
+        "scrape_scroll_60": ([goto(site, "/scroll?total=60&batch=20&ms=50")],
+                             [ScrapeTableAction({"rows_locator": "#feed li", "paging_mode": "无限滚动", "page_timeout": 2})]),
+        "http_download_4mb": ([goto(site, "/")],
+                              [HttpDownloadAction({"url": site.url("/download/report.bin?size=4194304"),
+                                                   "save_path": os.path.join(tmp, "report.bin"), "resume": False})]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--only", default="", help="comma separated scenario names")
+    parser.add_argument("--chrome", default="")
+    parser.add_argument("--verbose", action="store_true", help="show action logs")
+    args = parser.parse_args()
+
+    chrome_path = args.chrome or next((shutil.which(n) for n in ("google-chrome", "chromium", "chromium-browser", "chrome") if shutil.which(n)), None)
+    if not chrome_path or not find_chromedriver():
+        print("Chrome/chromedriver not found, skipping benchmark.")
+        return
+
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from utils.driver_helper import DriverHelper
+
+    options = DriverHelper.build_selenium_chrome_options(executable_path=chrome_path, headless=True)
+    driver = webdriver.Chrome(service=Service(find_chromedriver()), options=options)
+    DriverInstrument.install(driver)
+    only = {n.strip() for n in args.only.split(",") if n.strip()}
+
+    with LocalSite() as site, tempfile.TemporaryDirectory() as tmp:
+        print(f"site: {site.base_url}  rounds: {args.rounds}")
+        print(f"{'scenario':<22} {'p50(ms)':>9} {'p90(ms)':>9} {'p99(ms)':>9} {'max(ms)':>9} {'cmds':>6}")
+        try:
+            for name, (setup, timed) in scenarios(site, tmp).items():
+                if only and name not in only:
+                    continue
+                times, commands = [], []
+                for _ in range(args.rounds):
+                    ctx = {"driver": driver}
+                    log = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+                    with log:
+                        FramePath.reset(driver)
+                        for action in setup:
+                            run(action, ctx)
+                        profiler = StepProfiler(roundtrip_budget=0)
+                        step_profiler.activate(profiler)
+                        start = time.perf_counter()
+                        for action in timed:
+                            run(action, ctx)
+                        times.append((time.perf_counter() - start) * 1000)
+                        step_profiler.activate(None)
+                    commands.append(profiler.total_commands)
+                print(f"{name:<22} {percentile(times, 50):>9.1f} {percentile(times, 90):>9.1f} "
+                      f"{percentile(times, 99):>9.1f} {max(times):>9.1f} {statistics.mean(commands):>6.1f}")
+        finally:
+            step_profiler.activate(None)
+            driver.quit()
+
+
+if __name__ == "__main__":
+    main()
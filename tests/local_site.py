@@ -0,0 +1,279 @@
+"""
+Local stand-in web site for tests and benchmarks (offline, stdlib only).
+
+Pages:
+    /delayed?ms=N             button#late appears after N ms; clicking it updates #result
+    /frames                   iframe#outer -> iframe#inner -> #leaf-text (two nesting levels)
+    /table?rows=N&page=P&pages=M
+                              table#data with N rows; a#next links to the next page (server paging)
+    /table?mode=js&...        same table, a#next re-renders tbody in place after ms (client paging)
+    /scroll?total=N&batch=B&ms=M
+                              ul#feed grows by B items (fetched from /api/items) each time
+                              div#sentinel scrolls into view, until N items
+    /spa?ms=N                 hash-routed single page app; #app renders each route after N ms
+    /download/<name>?size=N   N deterministic bytes, Content-Disposition attachment, Range support
+    /api/items?offset=&limit= JSON list of items
+
+Usage:
+    with LocalSite() as site:
+        driver.get(site.url("/delayed?ms=200"))
+"""
+import json
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+
+def _page(title, body, script=""):
+    return f"""<!doctype html><html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>{body}<script>{script}</script></body></html>"""
+
+
+def _int(query, name, default):
+    try:
+        return int(query.get(name, [default])[0])
+    except (TypeError, ValueError):
+        return default
+
+
+def download_bytes(size):
+    """Deterministic content for /download/<name>?size=N"""
+    pattern = bytes(range(256))
+    return (pattern * (size // 256 + 1))[:size]
+
+
+def delayed_page(query):
+    ms = _int(query, "ms", 300)
+    body = '<h1 id="title">delayed</h1><div id="box"></div><p id="result">waiting</p>'
+    script = f"""
+var clicks = 0;
+setTimeout(function () {{
+  var btn = document.createElement('button');
+  btn.id = 'late'; btn.textContent = 'ready';
+  btn.onclick = function () {{ clicks++; document.getElementById('result').textContent = 'clicked ' + clicks; }};
+  document.getElementById('box').appendChild(btn);
+}}, {ms});
+"""
+    return _page("delayed", body, script)
+
+
+def frames_page(path):
+    if path == "/frames/leaf":
+        return _page("leaf", '<p id="leaf-text">leaf content</p><input id="leaf-input">')
+    if path == "/frames/inner":
+        return _page("inner", '<p id="inner-text">inner</p><iframe id="inner" name="inner" src="/frames/leaf"></iframe>')
+    return _page("frames", '<p id="top-text">top</p><iframe id="outer" name="outer" src="/frames/inner"></iframe>')
+
+
+def _rows_html(rows, page):
+    return "".join(f'<tr><td class="id">{(page - 1) * rows + i + 1}</td><td class="name">item-{page}-{i + 1}</td>'
+                   f'<td class="price">{(i * 37) % 1000 / 10:.1f}</td></tr>' for i in range(rows))
+
+
+def table_page(query):
+    rows = _int(query, "rows", 50)
+    page = _int(query, "page", 1)
+    pages = _int(query, "pages", 5)
+    ms = _int(query, "ms", 100)
+    mode = query.get("mode", ["server"])[0]
+    pager = f'<span id="page">{page}</span>/<span id="pages">{pages}</span>'
+    if page < pages:
+        href = f"/table?rows={rows}&page={page + 1}&pages={pages}&mode={mode}&ms={ms}"
+        pager += f' <a id="next" href="{href}">next</a>'
+    body = (f'<table id="data"><thead><tr><th>id</th><th>name</th><th>price</th></tr></thead>'
+            f'<tbody>{_rows_html(rows, page)}</tbody></table><div id="pager">{pager}</div>')
+    script = ""
+    if mode == "js":
+        # 客户端分页：点击下一页后延迟重绘 tbody，不发生导航
+        script = f"""
+var page = {page}, pages = {pages}, rows = {rows};
+function render() {{
+  var html = '';
+  for (var i = 0; i < rows; i++) {{
+    html += '<tr><td class="id">' + ((page - 1) * rows + i + 1) + '</td><td class="name">item-' + page + '-' + (i + 1) +
+            '</td><td class="price">' + ((i * 37) % 1000 / 10).toFixed(1) + '</td></tr>';
+  }}
+  document.querySelector('#data tbody').innerHTML = html;
+  document.getElementById('page').textContent = page;
+  if (page >= pages) {{ var n = document.getElementById('next'); if (n) {{ n.remove(); }} }}
+}}
+var next = document.getElementById('next');
+if (next) {{
+  next.addEventListener('click', function (e) {{
+    e.preventDefault();
+    if (page >= pages) {{ return; }}
+    setTimeout(function () {{ page++; render(); }}, {ms});
+  }});
+}}
+"""
+    return _page("table", body, script)
+
+
+def scroll_page(query):
+    total = _int(query, "total", 100)
+    batch = _int(query, "batch", 20)
+    ms = _int(query, "ms", 100)
+    body = '<ul id="feed"></ul><div id="sentinel" style="height:20px">loading</div>'
+    script = f"""
+var loaded = 0, loading = false, total = {total}, batch = {batch};
+var feed = document.getElementById('feed'), sentinel = document.getElementById('sentinel');
+function more() {{
+  if (loading || loaded >= total) {{ return; }}
+  loading = true;
+  fetch('/api/items?offset=' + loaded + '&limit=' + Math.min(batch, total - loaded) + '&ms={ms}')
+    .then(function (r) {{ return r.json(); }})
+    .then(function (items) {{
+      items.forEach(function (item) {{
+        var li = document.createElement('li');
+        li.className = 'item'; li.style.height = '40px'; li.textContent = item.name;
+        feed.appendChild(li);
+      }});
+      loaded += items.length; loading = false;
+      if (loaded >= total) {{ sentinel.textContent = 'end'; sentinel.id = 'end'; }}
+    }});
+}}
+new IntersectionObserver(function (entries) {{
+  if (entries[0].isIntersecting) {{ more(); }}
+}}).observe(sentinel);
+more();
+"""
+    return _page("scroll", body, script)
+
+
+def spa_page(query):
+    ms = _int(query, "ms", 200)
+    body = ('<nav><a id="nav-home" href="#/home">home</a> <a id="nav-list" href="#/list">list</a></nav>'
+            '<div id="app"><div class="skeleton">loading</div></div>')
+    script = f"""
+var app = document.getElementById('app');
+function route() {{
+  var name = (location.hash || '#/home').slice(2);
+  app.innerHTML = '<div class="skeleton">loading</div>';
+  setTimeout(function () {{
+    if (name === 'list') {{
+      var html = '<ul id="list">';
+      for (var i = 1; i <= 50; i++) {{ html += '<li class="item">row ' + i + '</li>'; }}
+      app.innerHTML = html + '</ul>';
+    }} else {{
+      app.innerHTML = '<h2 id="home">home view</h2>';
+    }}
+  }}, {ms});
+}}
+window.addEventListener('hashchange', route);
+route();
+"""
+    return _page("spa", body, script)
+
+
+def index_page():
+    links = ["/delayed?ms=300", "/frames", "/table", "/table?mode=js", "/scroll", "/spa", "/download/report.bin?size=1024"]
+    return _page("local site", "".join(f'<p><a href="{link}">{link}</a></p>' for link in links))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _html(self, text):
+        self._send(200, text.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _download(self, name, query):
+        body = download_bytes(_int(query, "size", 1024 * 1024))
+        headers = {"Accept-Ranges": "bytes", "ETag": f'"{len(body)}"',
+                   "Content-Disposition": f"attachment; filename*=UTF-8''{quote(name)}"}
+        status, start, end = 200, 0, len(body) - 1
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), end) if match.group(2) else end
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+        self._send(status, body[start:end + 1], "application/octet-stream", headers)
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        path, query = parsed.path, parse_qs(parsed.query)
+        self.server.site.requests.append(self.path)
+        if path == "/":
+            self._html(index_page())
+        elif path == "/delayed":
+            self._html(delayed_page(query))
+        elif path.startswith("/frames"):
+            self._html(frames_page(path))
+        elif path == "/table":
+            self._html(table_page(query))
+        elif path == "/scroll":
+            self._html(scroll_page(query))
+        elif path == "/spa":
+            self._html(spa_page(query))
+        elif path.startswith("/download/"):
+            self._download(path[len("/download/"):] or "file.bin", query)
+        elif path == "/api/items":
+            ms = _int(query, "ms", 0)
+            if ms:
+                threading.Event().wait(ms / 1000.0)
+            offset, limit = _int(query, "offset", 0), _int(query, "limit", 20)
+            items = [{"id": i, "name": f"item {i}"} for i in range(offset, offset + limit)]
+            self._send(200, json.dumps(items).encode("utf-8"), "application/json")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+
+class LocalSite:
+    """Threaded HTTP server on 127.0.0.1 with a random port"""
+
+    def __init__(self):
+        self.server = None
+        self.requests = []
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def url(self, path: str = "/") -> str:
+        return self.base_url + path
+
+    def start(self) -> "LocalSite":
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.site = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "LocalSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    with LocalSite() as site:
+        print(f"serving {site.base_url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
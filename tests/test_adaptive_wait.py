@@ -0,0 +1,80 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from utils.adaptive_wait import AdaptiveWait, WaitPolicy
+from tools.web_tools import ClickElementAction
+
+
+def test_intervals_back_off_to_cap():
+    intervals = WaitPolicy(0.025, 2, 0.1).intervals()
+    assert [next(intervals) for _ in range(5)] == [0.025, 0.05, 0.1, 0.1, 0.1]
+
+
+def test_parse():
+    assert WaitPolicy.parse("默认") is None
+    assert WaitPolicy.parse("") is None
+    assert WaitPolicy.parse("固定").factor == 1.0
+    policy = WaitPolicy.parse("0.01,3,0.2")
+    assert (policy.initial, policy.factor, policy.max_interval) == (0.01, 3.0, 0.2)
+    assert WaitPolicy.parse({"initial": 0.05}).initial == 0.05
+
+
+def test_detects_quickly_and_times_out():
+    shown_at = time.monotonic() + 0.06
+
+    def condition(driver):
+        if time.monotonic() < shown_at:
+            raise NoSuchElementException("late")
+        return "element"
+
+    assert AdaptiveWait(None, 2).until(condition) == "element"
+    # 固定 0.5 秒轮询会在 0.5 秒时才发现
+    assert time.monotonic() - shown_at < 0.2
+
+    start = time.monotonic()
+    try:
+        AdaptiveWait(None, 0.3, policy="固定").until(lambda d: False)
+        assert False, "expected timeout"
+    except TimeoutException:
+        pass
+    # 不越过截止时间
+    assert time.monotonic() - start < 0.45
+
+    assert AdaptiveWait(None, 1).until_not(lambda d: False) is False
+
+
+def test_policy_scope_and_action_param():
+    default = AdaptiveWait.current_policy()
+    with AdaptiveWait.policy_scope("省资源") as policy:
+        assert AdaptiveWait(None, 1).policy is policy
+        with AdaptiveWait.policy_scope("默认"):
+            assert AdaptiveWait(None, 1).policy is policy
+    assert AdaptiveWait.current_policy() is default
+
+    names = [p["name"] for p in ClickElementAction({}).get_param_schema()]
+    assert names[-1] == "wait_policy"
+
+    seen = []
+
+    class _Driver:
+        def find_element(self, by, value):
+            seen.append(AdaptiveWait.current_policy().initial)
+            raise NoSuchElementException(value)
+
+    assert not ClickElementAction({"by": "css", "value": "#x", "timeout": 0, "wait_policy": "快速"}).execute({"driver": _Driver()})
+    assert seen and all(v == 0.01 for v in seen)
+    assert AdaptiveWait.current_policy() is default
+
+
+if __name__ == "__main__":
+    test_intervals_back_off_to_cap()
+    test_parse()
+    test_detects_quickly_and_times_out()
+    test_policy_scope_and_action_param()
+    print("adaptive wait tests passed")
@@ -0,0 +1,171 @@
+import sys
+import os
+import json
+import re
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.download_manager import DownloadManager
+
+BIG = os.urandom(10 * 1024 * 1024 + 123)
+SMALL = b"0123456789" * 100
+FILES = {
+    "/big.bin": (BIG, ""),
+    "/small.bin": (SMALL, ""),
+    "/export?id=1": (b"report one", 'attachment; filename="report.xlsx"'),
+    "/export?id=2": (b"report two", "attachment; filename*=UTF-8''%E6%8A%A5%E8%A1%A8.xlsx"),
+    "/export?id=3": (b"report three", 'attachment; filename="report.xlsx"'),
+}
+RANGES = []
+REQUESTS = []
+# Single-use export links: a second GET fails
+ONCE = {"/once.bin": b"signed export " * 1000}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        REQUESTS.append(self.path)
+        if self.path in ONCE:
+            body = ONCE.pop(self.path)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path not in FILES:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body, disposition = FILES[self.path]
+        status, start, end = 200, 0, len(body) - 1
+        header = self.headers.get("Range")
+        if header:
+            RANGES.append((self.path, header))
+            m = re.match(r"bytes=(\d+)-(\d*)", header)
+            start = int(m.group(1))
+            end = min(int(m.group(2)), end) if m.group(2) else end
+            status = 206
+        self.send_response(status)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", '"v1"')
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+        if disposition:
+            self.send_header("Content-Disposition", disposition)
+        self.end_headers()
+        self.wfile.write(body[start:end + 1])
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_segmented_and_resume():
+    server, base = _serve()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            RANGES.clear()
+            path = os.path.join(tmp, "big.bin")
+            assert DownloadManager.download(base + "/big.bin", path, segments=4, chunk_size=256 * 1024) == path
+            with open(path, "rb") as f:
+                assert f.read() == BIG
+            # The first plain GET serves segment one, the other 3 segments use Range
+            assert len([r for r in RANGES if r[0] == "/big.bin"]) == 3
+            assert REQUESTS.count("/big.bin") == 4
+            assert not os.path.exists(path + ".part.json")
+
+            # Small files and single-use links take exactly one request
+            REQUESTS.clear()
+            path = os.path.join(tmp, "once.bin")
+            assert DownloadManager.download(base + "/once.bin", path) == path
+            with open(path, "rb") as f:
+                assert f.read() == b"signed export " * 1000
+            assert REQUESTS == ["/once.bin"]
+
+            # Resume a partial single-stream download
+            RANGES.clear()
+            path = os.path.join(tmp, "small.bin")
+            with open(path + ".part", "wb") as f:
+                f.write(SMALL[:300])
+            with open(path + ".part.json", "w") as f:
+                json.dump({"validator": '"v1"', "total": None}, f)
+            DownloadManager.download(base + "/small.bin", path)
+            with open(path, "rb") as f:
+                assert f.read() == SMALL
+            assert ("/small.bin", "bytes=300-") in RANGES
+
+            assert DownloadManager.get_session(base + "/a") is DownloadManager.get_session(base + "/b")
+
+            # Each browser gets its own cookie jar for the same domain
+            class _Driver:
+                def __init__(self, session_id, token):
+                    self.session_id, self.token = session_id, token
+
+                def get_cookies(self):
+                    return [{"name": "token", "value": self.token, "domain": "127.0.0.1", "path": "/"}]
+
+                def execute_script(self, script):
+                    return None
+
+            first, second = _Driver("run-1", "alice"), _Driver("run-2", "bob")
+            for driver in (first, second):
+                DownloadManager.sync_driver_cookies(DownloadManager.get_session(base, driver), base, driver)
+            assert DownloadManager.get_session(base, first).cookies.get("token") == "alice"
+            assert DownloadManager.get_session(base, second).cookies.get("token") == "bob"
+            assert DownloadManager.get_session(base).cookies.get("token") is None
+            DownloadManager.close_driver_sessions(first)
+            assert DownloadManager.get_session(base, first).cookies.get("token") is None
+
+            # Host-only cookies of the page are still sent to another download host
+            class _PortalDriver(_Driver):
+                def get_cookies(self):
+                    return [{"name": "sid", "value": "portal", "domain": "portal.example.com", "path": "/app"},
+                            {"name": "lang", "value": "other", "domain": "other.example.com", "path": "/"},
+                            {"name": "lang", "value": "zh", "domain": ".example.com", "path": "/"}]
+
+            import requests
+            portal = _PortalDriver("run-3", "")
+            url = "https://download.example.com/files/1.zip"
+            session = DownloadManager.get_session(url, portal)
+            DownloadManager.sync_driver_cookies(session, url, portal)
+            prepared = session.prepare_request(requests.Request("GET", url))
+            assert "sid=portal" in prepared.headers["Cookie"] and "lang=zh" in prepared.headers["Cookie"]
+            assert "lang=other" not in prepared.headers["Cookie"]
+    finally:
+        server.shutdown()
+        DownloadManager.close_all()
+
+
+def test_download_many():
+    server, base = _serve()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            urls = [base + "/export?id=1", base + "/export?id=2", base + "/export?id=3", base + "/missing"]
+            results = DownloadManager.download_many(urls, tmp, max_concurrency=2)
+            assert os.path.basename(results[1]["path"]) == "报表.xlsx"
+            names = sorted(os.listdir(tmp))
+            assert names == ["report (1).xlsx", "report.xlsx", "报表.xlsx"]
+            assert results[3]["path"] is None and results[3]["error"]
+    finally:
+        server.shutdown()
+        DownloadManager.close_all()
+
+
+if __name__ == "__main__":
+    test_segmented_and_resume()
+    test_download_many()
+    print("download manager OK")
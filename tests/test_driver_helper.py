@@ -0,0 +1,104 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium import webdriver
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+
+from utils.driver_helper import DriverHelper, BLOCK_PATTERNS
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+
+def test_resolve_profiles():
+    standard = DriverHelper.resolve_performance_profile("标准")
+    assert standard["page_load_strategy"] == "normal"
+    assert standard["patterns"] == []
+
+    text = DriverHelper.resolve_performance_profile("纯文本")
+    assert text["page_load_strategy"] == "eager"
+    for pattern in BLOCK_PATTERNS["images"] + BLOCK_PATTERNS["fonts"]:
+        assert pattern in text["patterns"]
+
+    override = DriverHelper.resolve_performance_profile("快速", "none")
+    assert override["page_load_strategy"] == "none"
+    # 未知档位/策略回退到标准
+    assert DriverHelper.resolve_performance_profile("xx", "bogus")["page_load_strategy"] == "normal"
+
+
+def test_apply_options_and_blocking(tmp_path):
+    profile = DriverHelper.resolve_performance_profile("纯文本")
+    cache_dir = str(tmp_path / "cache")
+    options = DriverHelper.apply_performance_options(webdriver.ChromeOptions(), profile, cache_dir)
+    assert options.page_load_strategy == "eager"
+    assert f"--disk-cache-dir={cache_dir}" in options.arguments
+    assert os.path.isdir(cache_dir)
+    assert options.experimental_options["prefs"]["profile.managed_default_content_settings.images"] == 2
+
+    ff = DriverHelper.apply_performance_options(FirefoxOptions(), profile, firefox=True)
+    assert ff.page_load_strategy == "eager"
+    assert ff.preferences["permissions.default.image"] == 2
+
+    driver = _FakeDriver()
+    assert DriverHelper.apply_network_blocking(driver, profile)
+    assert driver.cdp[0][0] == "Network.enable"
+    assert driver.cdp[1] == ("Network.setBlockedURLs", {"urls": profile["patterns"]})
+
+    driver = _FakeDriver()
+    assert not DriverHelper.apply_network_blocking(driver, DriverHelper.resolve_performance_profile("标准"))
+    assert driver.cdp == []
+
+
+def test_disk_cache_slots_are_exclusive(tmp_path):
+    import subprocess
+
+    class _Browser:
+        alive = True
+
+        @property
+        def current_window_handle(self):
+            if not self.alive:
+                raise RuntimeError("browser closed")
+            return "main"
+
+    root = str(tmp_path / "cache")
+    first, second = _Browser(), _Browser()
+    slot_a = DriverHelper.claim_disk_cache_dir(root)
+    DriverHelper.attach_disk_cache_dir(slot_a, first)
+    slot_b = DriverHelper.claim_disk_cache_dir(root)
+    DriverHelper.attach_disk_cache_dir(slot_b, second)
+    assert slot_a != slot_b and os.path.isdir(slot_a) and os.path.isdir(slot_b)
+
+    # 另一个进程同样拿不到已占用的槽位
+    project = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = f"import sys; sys.path.insert(0, {project!r}); from utils.driver_helper import DriverHelper; print(DriverHelper.claim_disk_cache_dir({root!r}))"
+    other = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert other not in (slot_a, slot_b)
+
+    # 关闭浏览器后释放，下一个会话复用同一槽位（缓存得以复用）；未正常关闭的浏览器在下次占用时回收
+    DriverHelper.release_disk_cache_dir(driver=first)
+    assert DriverHelper.claim_disk_cache_dir(root) == slot_a
+    second.alive = False
+    assert DriverHelper.claim_disk_cache_dir(root) == slot_b
+    DriverHelper.release_disk_cache_dir(slot_a)
+    DriverHelper.release_disk_cache_dir(slot_b)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_resolve_profiles()
+    with tempfile.TemporaryDirectory() as d:
+        test_apply_options_and_blocking(Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_disk_cache_slots_are_exclusive(Path(d))
+    print("OK")
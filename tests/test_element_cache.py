@@ -0,0 +1,189 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.common.exceptions import StaleElementReferenceException
+
+from utils.element_cache import ElementCache
+from tools.web_tools import ClickElementAction, InputTextAction, GetElementInfoAction
+
+
+class _Element:
+    def __init__(self, page, name):
+        self.page = page
+        self.id = f"{page.doc}-{name}"
+        self.name = name
+        self.connected = True
+        self.clicks = 0
+        self.value = ""
+
+    def _check(self):
+        if not self.connected:
+            raise StaleElementReferenceException("stale")
+
+    def is_displayed(self):
+        self._check()
+        return True
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        self._check()
+        self.clicks += 1
+
+    def clear(self):
+        self._check()
+        self.value = ""
+
+    def send_keys(self, text):
+        self._check()
+        self.value += text
+
+    @property
+    def text(self):
+        self._check()
+        return f"text of {self.name}"
+
+
+class _FakeDriver:
+    """按定位值返回元素；execute_script 模拟页面内的批量校验脚本"""
+
+    def __init__(self):
+        self.session_id = f"fake-{id(self)}"
+        self.doc = 0
+        self.mut = 0
+        self.finds = 0
+        self.scripts = 0
+        self.elements = {}
+
+    def find_element(self, by, value):
+        self.finds += 1
+        if value not in self.elements:
+            self.elements[value] = _Element(self, value)
+        return self.elements[value]
+
+    def replace(self, value):
+        """页面重新渲染：旧元素脱离文档，同一定位会找到新元素"""
+        self.elements.pop(value).connected = False
+        self.mut += 1
+
+    def navigate(self):
+        for el in self.elements.values():
+            el.connected = False
+        self.elements = {}
+        self.doc += 1
+        self.mut = 0
+
+    def get(self, url):
+        self.navigate()
+
+    def execute_script(self, script, entries):
+        self.scripts += 1
+        ok = []
+        for e in entries:
+            el = e["element"]
+            if not el.connected:
+                ok.append(False)
+                continue
+            if e["doc"] != self.doc or e["mut"] != self.mut:
+                ok.append(self.elements.get(e["value"]) is el)
+                continue
+            ok.append(True)
+        return {"doc": self.doc, "mut": self.mut, "ok": ok}
+
+
+def _click(ctx, value="#btn"):
+    return ClickElementAction({"by": "css", "value": value, "timeout": 1}).execute(ctx)
+
+
+def test_repeated_locator_uses_cache():
+    driver = _FakeDriver()
+    ctx = {"driver": driver}
+    for _ in range(5):
+        assert _click(ctx)
+    assert driver.finds == 1
+    assert driver.elements["#btn"].clicks == 5
+    # 第一次未命中不执行校验脚本，之后每次一次脚本调用
+    assert driver.scripts == 4
+    metrics = ctx["__metrics__"].snapshot()
+    assert metrics["element_cache_hits"] == 4 and metrics["element_cache_misses"] == 1
+
+
+def test_replaced_element_is_refound():
+    driver = _FakeDriver()
+    ctx = {"driver": driver}
+    assert _click(ctx)
+    old = driver.elements["#btn"]
+    driver.replace("#btn")
+    assert _click(ctx)
+    assert old.clicks == 1 and driver.elements["#btn"].clicks == 1
+    assert driver.finds == 2
+
+
+def test_stale_during_action_refinds():
+    driver = _FakeDriver()
+    ctx = {"driver": driver}
+    InputTextAction({"by": "css", "value": "#q", "text": "a", "timeout": 1}).execute(ctx)
+    cache = ElementCache.for_driver(driver)
+    cached = driver.elements["#q"]
+    # 校验通过后元素才被替换：执行时抛 StaleElementReferenceException
+    original_lookup = cache.lookup
+
+    def _lookup(drv, locators, condition="present"):
+        result = original_lookup(drv, locators, condition)
+        driver.replace("#q")
+        return result
+
+    cache.lookup = _lookup
+    try:
+        assert InputTextAction({"by": "css", "value": "#q", "text": "b", "timeout": 1}).execute(ctx)
+    finally:
+        del cache.lookup
+    assert cached.value == "a"
+    assert driver.elements["#q"].value == "b"
+
+
+def test_navigation_and_frame_switch_invalidate():
+    driver = _FakeDriver()
+    ctx = {"driver": driver}
+    action = GetElementInfoAction({"by": "css", "value": "#t", "timeout": 1, "output_variable": "out"})
+    assert action.execute(ctx) and ctx["out"] == "text of #t"
+
+    driver.navigate()
+    assert action.execute(ctx)
+    assert driver.finds == 2
+
+    cache = ElementCache.for_driver(driver)
+    cache.set_frame_path(("frame1",))
+    assert not cache.entries
+    assert action.execute(ctx)
+    assert driver.finds == 3
+    assert all(key[0] == ("frame1",) for key in cache.entries)
+
+    ElementCache.drop(driver)
+    assert ElementCache.for_driver(driver) is not cache
+
+
+def test_batched_lookup():
+    driver = _FakeDriver()
+    cache = ElementCache.for_driver(driver)
+    a, b = driver.find_element("css selector", "#a"), driver.find_element("css selector", "#b")
+    cache.store(("css selector", "#a"), a)
+    cache.store(("css selector", "#b"), b)
+    driver.replace("#b")
+    result = cache.lookup(driver, [("css selector", "#a"), ("css selector", "#b"), ("css selector", "#c")])
+    assert result == [a, None, None]
+    assert driver.scripts == 1
+    assert len(cache.entries) == 1
+
+
+if __name__ == "__main__":
+    test_repeated_locator_uses_cache()
+    test_replaced_element_is_refound()
+    test_stale_during_action_refinds()
+    test_navigation_and_frame_switch_invalidate()
+    test_batched_lookup()
+    print("element cache tests passed")
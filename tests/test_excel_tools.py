@@ -0,0 +1,221 @@
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import openpyxl
+from openpyxl.styles import Font
+
+from tools import excel_tools
+from tools.excel_tools import (EXCEL_SESSIONS, OpenExcelAction, GetExcelRowCountAction,
+                               GetExcelUsedRangeAction, WriteExcelAction, SaveExcelAction,
+                               CloseExcelAction, BatchReadExcelAction, BatchReadExcelLoopAction,
+                               wait_all_saves)
+
+
+def _make_workbook(path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["name", "amount"])
+    ws.append(["a", 1])
+    ws.append(["b", 2])
+    # Trailing formatting without values inflates ws.max_row
+    ws.cell(row=50, column=5).font = Font(bold=True)
+    wb.save(path)
+
+
+def test_row_count_and_used_range():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "meta.xlsx")
+        _make_workbook(path)
+        ctx = {}
+        assert OpenExcelAction({"file_path": path, "alias": "meta"}).execute(ctx)
+        try:
+            assert GetExcelRowCountAction({"alias": "meta", "output_variable": "rows"}).execute(ctx)
+            assert ctx["rows"] == 3
+
+            assert WriteExcelAction({"alias": "meta", "address": "C5", "value": "x"}).execute(ctx)
+            assert GetExcelUsedRangeAction({"alias": "meta", "output_variable": "used"}).execute(ctx)
+            assert ctx["used"]["last_row"] == 5
+            assert ctx["used"]["address"] == "A1:C5"
+            assert ctx["used"]["header_row"] == 1
+
+            # Clearing the boundary cell invalidates and the next query rescans
+            assert WriteExcelAction({"alias": "meta", "address": "C5", "value": ""}).execute(ctx)
+            assert GetExcelRowCountAction({"alias": "meta", "output_variable": "rows"}).execute(ctx)
+            assert ctx["rows"] == 3
+        finally:
+            CloseExcelAction({"alias": "meta", "save": False}).execute(ctx)
+        assert "meta" not in EXCEL_SESSIONS
+
+
+def test_async_save():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "async.xlsx")
+        _make_workbook(path)
+        ctx = {}
+        assert OpenExcelAction({"file_path": path, "alias": "bg", "data_only": False}).execute(ctx)
+        assert WriteExcelAction({"alias": "bg", "address": "A4", "value": "c"}).execute(ctx)
+        assert SaveExcelAction({"alias": "bg", "async_save": True}).execute(ctx)
+        # A write waits for the pending save before touching the workbook
+        assert WriteExcelAction({"alias": "bg", "address": "A5", "value": "d"}).execute(ctx)
+        assert EXCEL_SESSIONS["bg"]["dirty"]
+        assert CloseExcelAction({"alias": "bg", "async_save": True}).execute(ctx)
+        wait_all_saves()
+
+        wb = openpyxl.load_workbook(path)
+        assert wb.active["A4"].value == "c"
+        assert wb.active["A5"].value == "d"
+        wb.close()
+        assert sorted(os.listdir(tmp)) == ["async.xlsx"]
+
+
+def test_async_close_then_reopen():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reopen.xlsx")
+        _make_workbook(path)
+        real_save = excel_tools._atomic_save
+
+        def slow_save(wb, target):
+            time.sleep(0.3)
+            real_save(wb, target)
+
+        ctx = {}
+        excel_tools._atomic_save = slow_save
+        try:
+            assert OpenExcelAction({"file_path": path, "alias": "w"}).execute(ctx)
+            assert WriteExcelAction({"alias": "w", "address": "A4", "value": "late"}).execute(ctx)
+            assert CloseExcelAction({"alias": "w", "async_save": True}).execute(ctx)
+            # Reopening the same file waits for the close-save of the dropped session
+            assert OpenExcelAction({"file_path": path, "alias": "r"}).execute(ctx)
+            assert EXCEL_SESSIONS["r"]["wb"].active["A4"].value == "late"
+            CloseExcelAction({"alias": "r", "save": False}).execute(ctx)
+
+            def failing_save(wb, target):
+                raise OSError("disk full")
+
+            excel_tools._atomic_save = failing_save
+            assert OpenExcelAction({"file_path": path, "alias": "w"}).execute(ctx)
+            assert CloseExcelAction({"alias": "w", "async_save": True}).execute(ctx)
+            # The failed close-save fails the next action on that file, once
+            assert not OpenExcelAction({"file_path": path, "alias": "r"}).execute(ctx)
+            assert OpenExcelAction({"file_path": path, "alias": "r"}).execute(ctx)
+            CloseExcelAction({"alias": "r", "save": False}).execute(ctx)
+
+            # Unreported failures surface at the end of the run
+            assert OpenExcelAction({"file_path": path, "alias": "w"}).execute(ctx)
+            assert CloseExcelAction({"alias": "w", "async_save": True}).execute(ctx)
+            try:
+                wait_all_saves()
+                raise AssertionError("expected failure")
+            except RuntimeError as e:
+                assert "disk full" in str(e)
+            wait_all_saves()
+        finally:
+            excel_tools._atomic_save = real_save
+
+
+def test_lru_eviction_and_run_scope():
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = os.path.join(tmp, "first.xlsx"), os.path.join(tmp, "second.xlsx")
+        _make_workbook(first)
+        _make_workbook(second)
+        saved_limit = EXCEL_SESSIONS.memory_limit
+        EXCEL_SESSIONS.memory_limit = 1  # Every workbook exceeds the ceiling
+        ctx = {}
+        try:
+            assert OpenExcelAction({"file_path": first, "alias": "first", "read_only": True}).execute(ctx)
+            assert OpenExcelAction({"file_path": second, "alias": "second"}).execute(ctx)
+            # The least recently used read-only session was evicted
+            assert EXCEL_SESSIONS.peek("first")["wb"] is None
+
+            # Writable sessions are never evicted, dirty or not
+            assert GetExcelRowCountAction({"alias": "first", "output_variable": "rows"}).execute(ctx)
+            assert ctx["rows"] == 3
+            assert EXCEL_SESSIONS.peek("second")["wb"] is not None
+            assert WriteExcelAction({"alias": "second", "address": "B4", "value": 3}).execute(ctx)
+            assert EXCEL_SESSIONS.peek("second")["wb"] is not None
+        finally:
+            EXCEL_SESSIONS.memory_limit = saved_limit
+
+        # End of run: unsaved session is flushed, all sessions of the run are released
+        EXCEL_SESSIONS.close_run_sessions(id(ctx))
+        assert "first" not in EXCEL_SESSIONS and "second" not in EXCEL_SESSIONS
+        wb = openpyxl.load_workbook(second)
+        assert wb.active["B4"].value == 3
+        wb.close()
+
+
+def test_batch_read_bounded_in_flight():
+    from concurrent.futures import Future
+
+    class _InlinePool:
+        submitted = 0
+
+        def __init__(self, max_workers):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args):
+            _InlinePool.submitted += 1
+            future = Future()
+            future.set_result(fn(*args))
+            return future
+
+    real_pool = excel_tools.ProcessPoolExecutor
+    excel_tools.ProcessPoolExecutor = _InlinePool
+    try:
+        paths = [f"missing-{i}.xlsx" for i in range(50)]
+        consumed = 0
+        for result in excel_tools.iter_workbook_rows(paths, workers=2):
+            consumed += 1
+            # Never more than workers * 2 files parsed ahead of the consumer
+            assert _InlinePool.submitted - consumed < 4
+            assert result["path"] == paths[consumed - 1]
+        assert consumed == _InlinePool.submitted == 50
+    finally:
+        excel_tools.ProcessPoolExecutor = real_pool
+
+
+def test_batch_read():
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(3):
+            _make_workbook(os.path.join(tmp, f"day{i}.xlsx"))
+        with open(os.path.join(tmp, "broken.xlsx"), "w") as f:
+            f.write("not a workbook")
+
+        ctx = {"folder": tmp}
+        assert BatchReadExcelAction({"paths": os.path.join("{folder}", "*.xlsx"), "workers": 2,
+                                     "source_column": "file"}).execute(ctx)
+        assert len(ctx["excel_rows"]) == 6
+        assert ctx["excel_rows"][0] == {"name": "a", "amount": 1, "file": os.path.join(tmp, "day0.xlsx")}
+        assert [e["path"] for e in ctx["excel_errors"]] == [os.path.join(tmp, "broken.xlsx")]
+
+        # Streaming: one child run per chunk
+        seen = []
+
+        def runner(children, context):
+            seen.append((os.path.basename(context["excel_file"]), len(context["excel_chunk"])))
+            return True
+
+        ctx = {"__runner__": runner, "files": [os.path.join(tmp, "day0.xlsx"), os.path.join(tmp, "day1.xlsx")]}
+        assert BatchReadExcelLoopAction({"paths": "{files}", "chunk_size": 1, "workers": 1}).execute(ctx)
+        assert seen == [("day0.xlsx", 1), ("day0.xlsx", 1), ("day1.xlsx", 1), ("day1.xlsx", 1)]
+
+
+if __name__ == "__main__":
+    test_row_count_and_used_range()
+    test_async_save()
+    test_async_close_then_reopen()
+    test_lru_eviction_and_run_scope()
+    test_batch_read_bounded_in_flight()
+    test_batch_read()
+    print("excel tools OK")
@@ -0,0 +1,166 @@
+import sys
+import os
+import tempfile
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.file_tools as file_tools
+from utils.file_tools import FileTools
+from tools.util_tools import BulkCopyFilesAction, BulkMoveFilesAction
+
+
+def _download_later(directory, names, delay=0.2):
+    """Simulates a browser: write <name>.crdownload, then rename to the final name."""
+    def _run():
+        time.sleep(delay)
+        for name in names:
+            tmp = os.path.join(directory, name + ".crdownload")
+            with open(tmp, "wb") as f:
+                f.write(b"x" * 1024)
+            os.replace(tmp, os.path.join(directory, name))
+    t = threading.Thread(target=_run)
+    t.start()
+    return t
+
+
+def _check_wait(use_watcher):
+    saved = file_tools._open_watcher
+    if not use_watcher:
+        file_tools._open_watcher = lambda directory: None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "stale.xlsx"), "wb") as f:
+                f.write(b"old")
+            t = _download_later(tmp, ["a.xlsx", "b.xlsx"])
+            start = time.time()
+            files = FileTools.wait_for_files(tmp, count=2, timeout=10, stable_seconds=0.3)
+            t.join()
+            assert sorted(os.path.basename(p) for p in files) == ["a.xlsx", "b.xlsx"]
+            assert time.time() - start < 5
+
+            # Nothing new arrives -> timeout
+            assert FileTools.wait_for_files(tmp, count=1, timeout=0.3, stable_seconds=0.1) is None
+    finally:
+        file_tools._open_watcher = saved
+
+
+def test_wait_for_files():
+    _check_wait(use_watcher=True)
+    _check_wait(use_watcher=False)
+
+
+def test_copy_file_multiple():
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = os.path.join(tmp, "src"), os.path.join(tmp, "dst")
+        os.makedirs(src)
+        t = _download_later(src, ["r1.csv", "r2.csv"], delay=0.1)
+        assert FileTools.copy_file(src, dst, timeout=10, count=2, stable_seconds=0.2)
+        t.join()
+        assert sorted(os.listdir(dst)) == ["r1.csv", "r2.csv"]
+
+
+def test_fast_copy_and_bulk_ops():
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, "big.bin")
+        payload = os.urandom(3 * 1024 * 1024 + 17)
+        with open(big, "wb") as f:
+            f.write(payload)
+        for mode in ("auto", "hardlink", "copy"):
+            dst = os.path.join(tmp, f"copy_{mode}.bin")
+            FileTools.fast_copy(big, dst, link_mode=mode)
+            with open(dst, "rb") as f:
+                assert f.read() == payload
+            assert int(os.path.getmtime(dst)) == int(os.path.getmtime(big))
+
+        src_dir = os.path.join(tmp, "src")
+        os.makedirs(os.path.join(src_dir, "sub"))
+        for i in range(20):
+            with open(os.path.join(src_dir, f"f{i}.txt"), "w") as f:
+                f.write(str(i))
+        ctx = {"folder": src_dir}
+        assert BulkCopyFilesAction({"sources": os.path.join("{folder}", "*.txt"), "dest_dir": os.path.join(tmp, "out"),
+                                    "output_variable": "copied"}).execute(ctx)
+        assert len(ctx["copied"]) == 20
+        assert BulkMoveFilesAction({"sources": "{copied}", "dest_dir": os.path.join(tmp, "moved")}).execute(ctx)
+        assert len(os.listdir(os.path.join(tmp, "moved"))) == 20
+        assert os.listdir(os.path.join(tmp, "out")) == []
+
+        summary = FileTools.clear_directory(src_dir)
+        assert (summary["files"], summary["dirs"], summary["errors"]) == (20, 1, [])
+        assert os.listdir(src_dir) == []
+
+
+def test_copy_onto_itself_keeps_source():
+    import shutil
+    with tempfile.TemporaryDirectory() as tmp:
+        d = os.path.join(tmp, "d")
+        os.makedirs(d)
+        src, link = os.path.join(d, "x.bin"), os.path.join(tmp, "x.bin")
+        payload = os.urandom(2 * 1024 * 1024)
+        with open(src, "wb") as f:
+            f.write(payload)
+        os.link(src, link)
+
+        # 复制到自身或其硬链接：抛出 SameFileError，源文件不被截断
+        for dst in (src, link, d):
+            for mode in ("auto", "hardlink", "copy"):
+                try:
+                    FileTools.fast_copy(src, dst, link_mode=mode)
+                    raise AssertionError("expected SameFileError")
+                except shutil.SameFileError:
+                    pass
+                assert os.path.getsize(src) == len(payload)
+
+        # 硬链接模式批量复制到源所在目录：跳过，唯一的副本不会被删除
+        result = FileTools.bulk_transfer([src], d, link_mode="hardlink")
+        assert result["skipped"] == [src] and result["errors"] == []
+        with open(src, "rb") as f:
+            assert f.read() == payload
+
+        # 覆盖已有的不同文件仍然生效
+        other = os.path.join(tmp, "other.bin")
+        with open(other, "wb") as f:
+            f.write(b"old")
+        assert FileTools.fast_copy(src, other, link_mode="hardlink") == "hardlink"
+        assert os.path.samefile(src, other) and not [n for n in os.listdir(tmp) if n.endswith(".lnk")]
+
+
+
+def test_bulk_transfer_same_name_sources():
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = []
+        for i in range(6):
+            folder = os.path.join(tmp, f"in{i}")
+            os.makedirs(folder)
+            sources.append(os.path.join(folder, "report.csv"))
+            with open(sources[-1], "w") as f:
+                f.write(str(i) * 200000)
+        out = os.path.join(tmp, "out")
+
+        # 同名文件依次写入：覆盖时输入顺序中最后一个生效，不会混写
+        result = FileTools.bulk_transfer(sources, out, workers=6)
+        assert len(result["done"]) == 6 and result["errors"] == []
+        with open(os.path.join(out, "report.csv")) as f:
+            assert f.read() == "5" * 200000
+
+        result = FileTools.bulk_transfer(sources, os.path.join(tmp, "keep"), overwrite=False, workers=6)
+        assert len(result["done"]) == 1 and result["skipped"] == sources[1:]
+        with open(os.path.join(tmp, "keep", "report.csv")) as f:
+            assert f.read() == "0" * 200000
+
+        # 路径解析：{列表变量} 或带占位符的通配符
+        ctx = {"files": sources[:2], "root": tmp}
+        assert FileTools.resolve_paths("{files}", ctx) == sources[:2]
+        assert FileTools.resolve_paths(os.path.join("{root}", "in*", "*.csv"), ctx) == sorted(sources)
+
+
+if __name__ == "__main__":
+    test_wait_for_files()
+    test_copy_file_multiple()
+    test_fast_copy_and_bulk_ops()
+    test_copy_onto_itself_keeps_source()
+    test_bulk_transfer_same_name_sources()
+    print("file tools OK")
@@ -0,0 +1,135 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.webdriver.common.by import By
+
+from core.element_manager import ElementManager
+from core.run_metrics import RunMetrics
+from utils.frame_path import FramePath
+from tools.web_tools import FillFormAction, _parse_form_fields, _parse_form_locator
+
+
+class _FakeElement:
+    def __init__(self):
+        self.typed = []
+        self.cleared = False
+
+    def get_attribute(self, name):
+        return "text"
+
+    def clear(self):
+        self.cleared = True
+
+    def send_keys(self, text):
+        self.typed.append(text)
+
+
+class _FakeDriver:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.payloads = []
+
+    def execute_script(self, script, *args):
+        self.payloads.append(args[0])
+        return self.responses.pop(0)
+
+
+def test_parse_fields_and_locators():
+    context = {"user": "alice", "mapping": {"#a": 1, "#b": None}}
+    fields = _parse_form_fields(context, "说明行\ncss:#user => {user}\n//input[@name='pwd'] => secret => keys\n\n#city => 北京")
+    assert [f["text"] for f in fields] == ["alice", "secret", "北京"]
+    assert [f["keys"] for f in fields] == [False, True, False]
+    assert _parse_form_fields(context, "{mapping}") == [
+        {"locator": "#a", "text": "1", "keys": False}, {"locator": "#b", "text": "", "keys": False}]
+
+    assert _parse_form_locator(context, "css:#user") == (By.CSS_SELECTOR, "#user")
+    assert _parse_form_locator(context, "//input[@a='b:c']") == (By.XPATH, "//input[@a='b:c']")
+    assert _parse_form_locator(context, "name:q") == (By.NAME, "q")
+    assert _parse_form_locator(context, "div.x") == (By.CSS_SELECTOR, "div.x")
+
+
+def test_fill_form_single_script_with_fallback():
+    masked = _FakeElement()
+    driver = _FakeDriver([
+        {"missing": [1]},
+        {"results": [{"status": "ok"}, {"status": "keys", "element": masked}]},
+    ])
+    context = {"driver": driver, "__metrics__": RunMetrics()}
+    action = FillFormAction(params={"fields": "#a => 1\n#b => 2020-01-01", "poll_interval": 0.01, "timeout": 2})
+    assert action.execute(context)
+    # 未就绪时整体重试，不逐字段往返
+    assert len(driver.payloads) == 2
+    assert driver.payloads[0][0] == {"by": By.CSS_SELECTOR, "value": "#a", "text": "1", "keys": False, "clear": True}
+    assert masked.cleared and masked.typed == ["2020-01-01"]
+    assert context["__metrics__"].get("form_fields_script") == 1
+    assert context["__metrics__"].get("form_fields_keys") == 1
+
+    driver = _FakeDriver([{"results": [{"status": "error", "message": "option not found: x"}]}])
+    assert not FillFormAction(params={"fields": "#s => x"}).execute({"driver": driver})
+
+    driver = _FakeDriver([{"missing": [0]}] * 100)
+    assert not FillFormAction(params={"fields": "#gone => x", "timeout": 0, "poll_interval": 0.01}).execute({"driver": driver})
+
+
+class _FrameSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def frame(self, ref):
+        self.driver.path.append(ref)
+
+    def default_content(self):
+        self.driver.path = []
+
+    def parent_frame(self):
+        self.driver.path = self.driver.path[:-1]
+
+
+class _FramedDriver:
+    """iframe 元素即其名称；记录每次填表脚本执行时所在的 frame"""
+
+    def __init__(self):
+        self.session_id = f"fill-form-{id(self)}"
+        self.path = []
+        self.switch_to = _FrameSwitch(self)
+        self.calls = []
+
+    def find_elements(self, by, value):
+        return [value.split('"')[1]]
+
+    def execute_script(self, script, *args):
+        if "__waFramePath" in script:
+            return None
+        fields = args[0]
+        self.calls.append((list(self.path), [f["value"] for f in fields]))
+        return {"results": [{"status": "ok"} for _ in fields]}
+
+
+def test_fill_form_groups_fields_by_frame():
+    mgr = ElementManager()
+    mgr.save_element("登录", "用户名", "id", "user", {"frames": ["login"]})
+    mgr.save_element("登录", "密码", "id", "pwd", {"frames": ["login"]})
+    mgr.save_element("登录", "验证码", "id", "code", {"frames": ["login", "captcha"]})
+    driver = _FramedDriver()
+    FramePath.on_window_switch(driver, "main")
+    context = {"driver": driver, "element_manager_private": mgr}
+    fields = "元素库:登录/用户名 => a\n#remember => 1\n元素库:登录/验证码 => 1234\n元素库:登录/密码 => b"
+    assert FillFormAction(params={"fields": fields}).execute(context)
+    # 当前 frame 的字段先填，同一 iframe 的字段一次脚本调用
+    assert driver.calls == [([], ["#remember"]), (["login"], ["user", "pwd"]), (["login", "captcha"], ["code"])]
+
+    # 其他动作使用的定位同样进入元素库记录的 iframe
+    driver.switch_to.default_content()
+    FramePath.reset(driver)
+    assert _parse_form_locator(context, "元素库:登录/验证码", driver=driver) == (By.ID, "code")
+    assert driver.path == ["login", "captcha"]
+
+
+if __name__ == "__main__":
+    test_parse_fields_and_locators()
+    test_fill_form_single_script_with_fallback()
+    test_fill_form_groups_fields_by_frame()
+    print("OK")
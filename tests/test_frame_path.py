@@ -0,0 +1,284 @@
+import sys
+import os
+import re
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from core.element_manager import ElementManager
+from utils.element_cache import ElementCache
+from utils.frame_path import FramePath
+from utils.tab_pool import switch_window
+from tools.web_tools import SwitchFrameAction, GoToUrlAction, _resolve_locator_from_element_library
+
+
+class _Frame:
+    def __init__(self, doc, name, children=()):
+        self.doc = doc
+        self.id = f"{name}-{doc.version}"
+        self.name = name
+        self.children = [_Frame(doc, c[0], c[1]) if isinstance(c, tuple) else _Frame(doc, c) for c in children]
+
+
+class _Doc:
+    version = 0
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def frame(self, ref):
+        d = self.driver
+        d.commands.append("frame")
+        children = d.stack[-1].children if d.stack else d.top
+        if isinstance(ref, int):
+            d.stack.append(children[ref])
+            return
+        if ref.doc is not d.doc or ref not in children:
+            raise StaleElementReferenceException("stale frame")
+        d.stack.append(ref)
+
+    def default_content(self):
+        self.driver.commands.append("default")
+        self.driver.stack = []
+
+    def parent_frame(self):
+        self.driver.commands.append("parent")
+        self.driver.stack = self.driver.stack[:-1]
+
+    def window(self, handle):
+        self.driver.commands.append("window")
+        self.driver.stack = []
+
+
+class _FakeDriver:
+    """
+    模拟嵌套 iframe：outer > inner > leaf，以及顶层的 side
+    reload() 相当于页面刷新，之前取得的 iframe 元素全部失效
+    """
+
+    def __init__(self):
+        self.session_id = f"frames-{id(self)}"
+        self.commands = []
+        self.stack = []
+        self.reload()
+
+    def reload(self):
+        self.doc = _Doc()
+        self.doc.version = getattr(self, "version", 0) + 1
+        self.version = self.doc.version
+        self.top = [_Frame(self.doc, "outer", [("inner", ["leaf"])]), _Frame(self.doc, "side")]
+        self.stack = []
+
+    @property
+    def switch_to(self):
+        return _SwitchTo(self)
+
+    @property
+    def path(self):
+        return [f.name for f in self.stack]
+
+    def get(self, url):
+        self.commands.append("get")
+        self.reload()
+
+    def find_elements(self, by, value):
+        self.commands.append("find")
+        children = self.stack[-1].children if self.stack else self.top
+        if by == "tag name":
+            return list(children)
+        names = set(re.findall(r'="([^"]+)"', value)) if by == "css selector" else {value}
+        return [f for f in children if f.name in names]
+
+    def execute_script(self, script, *args):
+        # frame 文档的标记随 reload 生成新的 _Frame 而消失
+        self.commands.append("script")
+        document = self.stack[-1] if self.stack else self.doc
+        if "__waFramePath =" in script:
+            document.stamp = args[0]
+            return None
+        return getattr(document, "stamp", None)
+
+    def find_element(self, by, value):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(value)
+        return found[0]
+
+
+def _fresh():
+    driver = _FakeDriver()
+    FramePath.on_window_switch(driver, "main")
+    return driver
+
+
+def test_minimal_switching():
+    driver = _fresh()
+    assert FramePath.enter(driver, "outer >> inner") == FramePath.parse(["outer", "inner"])[0]
+    assert driver.path == ["outer", "inner"]
+    assert driver.commands == ["find", "frame", "find", "frame", "script"]
+
+    # 已在目标路径：只核对一次文档标记，不切换
+    driver.commands.clear()
+    FramePath.enter(driver, ["outer", "inner"])
+    assert driver.commands == ["script"]
+
+    # 进入更深一级只切换差异部分（先核对记录的位置）
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner >> leaf")
+    assert driver.path == ["outer", "inner", "leaf"] and driver.commands == ["script", "find", "frame", "script"]
+
+    # 回到上一级用 parent_frame，再次进入使用缓存的 iframe 句柄
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner")
+    assert driver.commands == ["script", "parent", "script"]
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner >> leaf")
+    assert driver.commands == ["script", "frame", "script"]
+
+    # 无公共前缀：回到顶层后进入，句柄同样来自缓存
+    driver.commands.clear()
+    FramePath.enter(driver, "side")
+    assert driver.path == ["side"] and driver.commands == ["default", "find", "frame", "script"]
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner >> leaf")
+    assert driver.path == ["outer", "inner", "leaf"] and driver.commands == ["default", "frame", "frame", "frame", "script"]
+    assert ElementCache.for_driver(driver).frame_path == FramePath.current(driver)
+
+
+def test_stale_handles_and_navigation():
+    driver = _fresh()
+    FramePath.enter(driver, "outer >> inner")
+    FramePath.enter(driver, "side")
+
+    # 页面在外部刷新：缓存的句柄失效后就地重新查找，并丢弃其下各级的句柄
+    driver.reload()
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner")
+    assert driver.path == ["outer", "inner"]
+    assert driver.commands == ["default", "frame", "find", "frame", "find", "frame", "script"]
+
+    # 记录与实际不符（外部切回了顶层）：核对标记不符，回到顶层按完整路径进入
+    driver.stack = []
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner >> leaf")
+    assert driver.path == ["outer", "inner", "leaf"]
+    assert driver.commands == ["script", "default", "find", "frame", "find", "frame", "find", "frame", "script"]
+
+    # 通过 GoToUrlAction 导航：记录回到顶层，句柄作废
+    assert GoToUrlAction({"url": "http://example.test/", "wait_condition": "无"}).execute({"driver": driver})
+    assert FramePath.current(driver) == ()
+    driver.commands.clear()
+    FramePath.enter(driver, "outer")
+    assert driver.commands == ["find", "frame", "script"]
+
+    # 找不到时抛出异常
+    try:
+        FramePath.enter(driver, "outer >> missing", timeout=0.2)
+        raise AssertionError("expected failure")
+    except Exception as e:
+        assert not isinstance(e, AssertionError)
+
+
+def test_window_switch_resets_path():
+    driver = _fresh()
+    FramePath.enter(driver, "outer >> inner")
+    switch_window(driver, "other")
+    assert FramePath.current(driver) == ()
+    driver.commands.clear()
+    FramePath.enter(driver, "outer")
+    assert driver.commands == ["find", "frame", "script"]
+
+
+def test_same_path_after_untracked_navigation():
+    driver = _fresh()
+    FramePath.enter(driver, "outer >> inner")
+
+    # 点击等操作导致页面导航（未经 GoToUrlAction）：已回到新文档顶层，记录的路径仍是 outer >> inner
+    driver.reload()
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner")
+    assert driver.path == ["outer", "inner"]
+    assert driver.commands == ["script", "default", "find", "frame", "find", "frame", "script"]
+
+    # 外部切换到了别的 frame：标记不符，同样重新进入
+    driver.switch_to.default_content()
+    driver.switch_to.frame(driver.top[1])
+    driver.commands.clear()
+    FramePath.enter(driver, "outer >> inner")
+    assert driver.path == ["outer", "inner"]
+    assert driver.commands[0] == "script" and driver.commands[1] == "default"
+
+    # 目标是记录路径的上级或更深一级时同样先核对，不会在顶层执行 parent_frame 后误记为已在 outer
+    for target, expected in (("outer", ["outer"]), ("outer >> inner >> leaf", ["outer", "inner", "leaf"])):
+        FramePath.enter(driver, "outer >> inner")
+        driver.reload()
+        FramePath.enter(driver, target)
+        assert driver.path == expected and FramePath.current(driver) == FramePath.parse(target)[0]
+        driver.reload()
+        assert FramePath.enter(driver, target) and driver.path == expected
+
+    # SwitchFrameAction "上一级" 同理
+    FramePath.enter(driver, "outer >> inner >> leaf")
+    driver.reload()
+    assert SwitchFrameAction({"switch_type": "上一级"}).execute({"driver": driver})
+    assert driver.path == ["outer", "inner"]
+
+    # SwitchFrameAction 在同一路径上也不会停留在错误的文档里
+    driver.reload()
+    assert SwitchFrameAction({"iframe_id": "outer >> inner"}).execute({"driver": driver})
+    assert driver.path == ["outer", "inner"]
+
+
+def test_switch_frame_action():
+    driver = _fresh()
+    ctx = {"driver": driver}
+    assert SwitchFrameAction({"iframe_id": "outer >> inner >> leaf"}).execute(ctx)
+    assert driver.path == ["outer", "inner", "leaf"]
+    assert SwitchFrameAction({"switch_type": "上一级"}).execute(ctx)
+    assert driver.path == ["outer", "inner"] and FramePath.current(driver) == FramePath.parse("outer >> inner")[0]
+
+    # 网页元素：相对当前位置进入
+    ctx["leaf"] = driver.stack[-1].children[0]
+    assert SwitchFrameAction({"switch_type": "网页元素", "target_element_variable": "{leaf}"}).execute(ctx)
+    assert driver.path == ["outer", "inner", "leaf"] and len(FramePath.current(driver)) == 3
+
+    assert SwitchFrameAction({"iframe_id": ""}).execute(ctx)
+    assert driver.path == [] and FramePath.current(driver) == ()
+    assert not SwitchFrameAction({"iframe_id": "nope", "timeout": 0.2}).execute(ctx)
+
+
+def test_element_library_frames():
+    mgr = ElementManager()
+    mgr.save_element("Default", "leaf_input", "id", "leaf-input", {"frames": ["outer", "inner", "leaf"]})
+    mgr.save_element("Default", "top_title", "id", "title", {"frames": []})
+    mgr.save_element("Default", "anywhere", "id", "x")
+    assert mgr.get_frames("leaf_input") == ["outer", "inner", "leaf"]
+    assert mgr.get_frames("anywhere") is None
+
+    driver = _fresh()
+    ctx = {"element_manager_private": mgr}
+    assert _resolve_locator_from_element_library(ctx, "leaf_input", driver=driver) == ("id", "leaf-input")
+    assert driver.path == ["outer", "inner", "leaf"]
+    driver.commands.clear()
+    assert _resolve_locator_from_element_library(ctx, "leaf_input", driver=driver)
+    assert driver.commands == ["script"]
+
+    # 未记录 frames 的元素保持当前位置；记录为 [] 的元素回到顶层
+    assert _resolve_locator_from_element_library(ctx, "anywhere", driver=driver) == ("id", "x")
+    assert driver.path == ["outer", "inner", "leaf"]
+    assert _resolve_locator_from_element_library(ctx, "top_title", driver=driver) == ("id", "title")
+    assert driver.path == []
+
+
+if __name__ == "__main__":
+    test_minimal_switching()
+    test_stale_handles_and_navigation()
+    test_window_switch_resets_path()
+    test_same_path_after_untracked_navigation()
+    test_switch_frame_action()
+    test_element_library_frames()
+    print("frame path tests passed")
@@ -0,0 +1,60 @@
+import sys
+import os
+import json
+import tempfile
+from urllib.request import Request, urlopen
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from local_site import LocalSite, download_bytes
+from tools.web_tools import HttpDownloadAction
+
+
+def _get(url, headers=None):
+    with urlopen(Request(url, headers=headers or {}), timeout=5) as resp:
+        return resp.status, dict(resp.headers), resp.read()
+
+
+def test_pages():
+    with LocalSite() as site:
+        for path, marker in [("/delayed?ms=50", b"late"), ("/frames", b'id="outer"'), ("/frames/inner", b'id="inner"'),
+                             ("/frames/leaf", b"leaf-text"), ("/scroll", b"sentinel"), ("/spa", b'id="app"')]:
+            status, _, body = _get(site.url(path))
+            assert status == 200 and marker in body, path
+
+        _, _, body = _get(site.url("/table?rows=10&page=2&pages=2"))
+        assert body.count(b"<tr><td") == 10 and b"item-2-10" in body and b'id="next"' not in body
+        _, _, body = _get(site.url("/table?rows=10&page=1&pages=2&mode=js"))
+        assert b'id="next"' in body and b"mode=js" in body
+
+        _, _, body = _get(site.url("/api/items?offset=5&limit=3"))
+        assert [item["id"] for item in json.loads(body)] == [5, 6, 7]
+        assert "/api/items?offset=5&limit=3" in site.requests
+
+
+def test_download_with_range():
+    with LocalSite() as site:
+        url = site.url("/download/%E6%8A%A5%E8%A1%A8.bin?size=5000")
+        status, headers, body = _get(url)
+        assert status == 200 and body == download_bytes(5000)
+        assert "attachment" in headers["Content-Disposition"]
+
+        status, headers, body = _get(url, {"Range": "bytes=100-199"})
+        assert status == 206 and body == download_bytes(5000)[100:200]
+        assert headers["Content-Range"] == "bytes 100-199/5000"
+
+        with tempfile.TemporaryDirectory() as tmp:
+            save_path = os.path.join(tmp, "report.bin")
+            size = 3 * 1024 * 1024 + 17
+            action = HttpDownloadAction({"url": site.url(f"/download/report.bin?size={size}"), "save_path": save_path,
+                                         "use_browser_cookies": False, "segments": 4})
+            assert action.execute({})
+            with open(save_path, "rb") as f:
+                assert f.read() == download_bytes(size)
+
+
+if __name__ == "__main__":
+    test_pages()
+    test_download_with_range()
+    print("local site tests passed")
@@ -0,0 +1,69 @@
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.network_capture import NetworkCapture
+from tools.web_tools import CaptureDownloadUrlAction
+
+
+def _log(method, url, headers):
+    return {"message": json.dumps({"message": {"method": method, "params": {"response": {"url": url, "headers": headers}}}})}
+
+
+class _FakeDriver:
+    def __init__(self, logs=None, hook_results=None):
+        self.logs = logs
+        self.hook_results = list(hook_results or [])
+        self.scripts = []
+
+    def get_log(self, kind):
+        if self.logs is None:
+            raise Exception("log type 'performance' not found")
+        logs, self.logs = self.logs, []
+        return logs
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        self.scripts.append("install")
+
+    def execute_async_script(self, script, *args):
+        return self.hook_results.pop(0) if self.hook_results else None
+
+
+def test_match_rules():
+    rules = NetworkCapture.build_rules()
+    assert NetworkCapture.match_response("https://x/export", {"Content-Disposition": "attachment; filename=a.xlsx"}, rules)
+    assert NetworkCapture.match_response("https://x/f", {"content-type": "application/octet-stream"}, rules)
+    assert not NetworkCapture.match_response("https://x/app.js", {"content-type": "application/octet-stream"}, rules)
+    assert not NetworkCapture.match_response("https://x/page", {"content-type": "text/html"}, rules)
+    rules = NetworkCapture.build_rules(url_contains="report")
+    assert not NetworkCapture.match_response("https://x/other", {"Content-Disposition": "attachment"}, rules)
+
+
+def test_wait_modes():
+    logs = [_log("Network.requestWillBeSent", "https://x/a", {}),
+            _log("Network.responseReceived", "https://x/index.html", {"content-type": "text/html"}),
+            _log("Network.responseReceived", "https://x/export?id=1", {"Content-Disposition": "attachment; filename=r.xlsx"})]
+    driver = _FakeDriver(logs=logs)
+    assert NetworkCapture.wait_for_download_url(driver, timeout=1, mode="log") == "https://x/export?id=1"
+
+    # Hook not installed yet -> installs and keeps waiting; performance log unavailable
+    driver = _FakeDriver(logs=None, hook_results=[{"error": "not_installed"}, {"url": "https://x/dl", "content_type": "text/csv"}])
+    ctx = {"driver": driver}
+    assert CaptureDownloadUrlAction({"mode": "自动", "timeout": 2}).execute(ctx)
+    assert ctx["download_url"] == "https://x/dl"
+    assert driver.scripts == ["install"]
+
+    driver = _FakeDriver(logs=[], hook_results=[])
+    assert NetworkCapture.wait_for_download_url(driver, timeout=0.3, mode="auto", slice_seconds=0.05) is None
+
+
+if __name__ == "__main__":
+    test_match_rules()
+    test_wait_modes()
+    print("network capture OK")
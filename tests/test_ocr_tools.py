@@ -0,0 +1,156 @@
+import sys
+import os
+import base64
+import io
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image, ImageDraw
+
+from utils import img_ocr
+from utils.img_ocr import ImgOcr
+from utils.ocr_cache import OcrCache
+from core.run_metrics import get_metrics
+from tools.util_tools import OCRImageAction, BatchOCRAction
+from tools.web_tools import ElementOCRAction
+
+
+def _captcha(text="AB12"):
+    img = Image.new("RGB", (120, 40), "white")
+    ImageDraw.Draw(img).text((10, 12), text, fill="black")
+    return img
+
+
+def test_shared_and_batch():
+    if img_ocr.ddddocr is None:
+        print("ddddocr not installed, skipping")
+        return
+    assert ImgOcr.shared() is ImgOcr.shared()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "c.png")
+        _captcha().save(path)
+        buf = io.BytesIO()
+        _captcha().save(buf, format="PNG")
+        b64 = "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+        ctx = {"images": [path, b64, os.path.join(tmp, "missing.png")]}
+        assert BatchOCRAction({"list_variable": "{images}", "max_workers": 2}).execute(ctx)
+        texts = ctx["ocr_texts"]
+        assert len(texts) == 3
+        assert isinstance(texts[0], str) and texts[0] == texts[1]
+        assert texts[2] is None
+        assert [e["index"] for e in ctx["ocr_errors"]] == [2]
+
+
+def test_raw_bytes_fast_path():
+    if img_ocr.ddddocr is None:
+        print("ddddocr not installed, skipping")
+        return
+    ocr = ImgOcr.shared()
+    with tempfile.TemporaryDirectory() as tmp:
+        png, gif = os.path.join(tmp, "c.png"), os.path.join(tmp, "c.gif")
+        _captcha().save(png)
+        _captcha().save(gif)
+        with open(png, "rb") as f:
+            raw = f.read()
+
+        # PNG bytes are passed through untouched, other formats are converted
+        assert ocr._to_classifier_bytes(raw) == raw
+        assert ImgOcr.sniff_format(ocr._to_classifier_bytes(gif)) == "PNG"
+
+        expected = ocr.recognize(raw)
+        assert ocr.recognize(png) == expected
+        # Image objects opened from a file stay usable (no verify())
+        with Image.open(png) as img:
+            assert ocr.recognize(img) == expected
+            assert img.size == (120, 40)
+
+
+def test_ocr_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = os.path.join(tmp, "ocr.db")
+        cache = OcrCache(max_entries=1, db_path=db, ttl=0)
+        key_a, key_b = OcrCache.make_key(b"a"), OcrCache.make_key(b"b")
+        cache.put(key_a, "AAAA")
+        cache.put(key_b, "BBBB")  # evicts key_a from memory, still on disk
+        assert cache.get(key_a) == "AAAA"
+        assert cache.get(OcrCache.make_key(b"c")) is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        cache.close()
+
+        # Persisted across instances, expired entries are dropped
+        cache = OcrCache(max_entries=10, db_path=db, ttl=60)
+        assert cache.get(key_b) == "BBBB"
+        cache.ttl = 1e-9
+        assert cache.get(key_b) is None
+        cache.close()
+
+
+def test_action_cache_metrics():
+    if img_ocr.ddddocr is None:
+        print("ddddocr not installed, skipping")
+        return
+    ocr = ImgOcr.shared()
+    saved = ocr.cache
+    ocr.cache = OcrCache(max_entries=16)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "c.png")
+            _captcha("ZZ99").save(path)
+            ctx = {}
+            assert OCRImageAction({"image_path": path}).execute(ctx)
+            metrics = get_metrics(ctx)
+            assert metrics.get("ocr_cache_misses") == 1
+            ctx["images"] = [path, path]
+            assert BatchOCRAction({"list_variable": "images"}).execute(ctx)
+            assert metrics.get("ocr_cache_hits") == 2
+            assert ctx["ocr_texts"] == [ctx["ocr_text"]] * 2
+    finally:
+        ocr.cache = saved
+
+
+class _FakeDriver:
+    def __init__(self, data_url):
+        self.data_url = data_url
+        self.scripts = 0
+
+    def execute_script(self, script, *args):
+        self.scripts += 1
+        return self.data_url
+
+
+class _FakeElement:
+    def __init__(self, png, driver):
+        self.parent = driver
+        self.screenshot_as_png = png
+
+
+def test_element_ocr_in_memory():
+    if img_ocr.ddddocr is None:
+        print("ddddocr not installed, skipping")
+        return
+    buf = io.BytesIO()
+    _captcha("Q7K2").save(buf, format="PNG")
+    png = buf.getvalue()
+    expected = ImgOcr.shared().recognize(png)
+
+    # Canvas capture, and screenshot fallback when the canvas is tainted
+    for data_url in ("data:image/png;base64," + base64.b64encode(png).decode(), None):
+        driver = _FakeDriver(data_url)
+        ctx = {"captcha": _FakeElement(png, driver)}
+        assert ElementOCRAction({"locator_source": "网页元素", "target_element_variable": "{captcha}",
+                                 "capture_mode": "图片绘制", "output_variable": "code"}).execute(ctx)
+        assert ctx["code"] == expected
+        assert driver.scripts == 1
+
+
+if __name__ == "__main__":
+    test_shared_and_batch()
+    test_raw_bytes_fast_path()
+    test_ocr_cache()
+    test_action_cache_metrics()
+    test_element_ocr_in_memory()
+    print("ocr tools OK")
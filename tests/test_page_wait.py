@@ -0,0 +1,75 @@
+import sys
+import os
+import itertools
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.page_wait import PageWait
+from tools.web_tools import GoToUrlAction, WaitElementAction
+
+
+_SESSION_IDS = itertools.count()
+
+
+class _FakeDriver:
+    def __init__(self, results=None):
+        self.session_id = f"page-wait-{next(_SESSION_IDS)}"
+        self.results = list(results or [])
+        self.calls = []
+        self.wait_options = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.calls.append(cmd)
+
+    def execute_script(self, script, *args):
+        self.calls.append("install")
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        self.wait_options.append(args[0])
+        return self.results.pop(0) if self.results else {"ok": False}
+
+    def get(self, url):
+        self.calls.append(f"get {url}")
+
+
+def test_wait_quiet_reinstalls_after_navigation():
+    driver = _FakeDriver([{"error": "not_installed"}, {"ok": True, "pending": 0}])
+    assert PageWait.wait_quiet(driver, network_idle_ms=300, dom_stable_ms=100, timeout=5)
+    assert "install" in driver.calls
+    options = driver.wait_options[-1]
+    assert options["network_ms"] == 300 and options["dom_ms"] == 100
+    assert options["interval"] == 25
+
+    assert PageWait.wait_quiet(_FakeDriver(), timeout=1)
+    assert not PageWait.wait_dom_stable(_FakeDriver([{"ok": False}]), idle_ms=200, timeout=1)
+
+
+def test_actions_use_page_waits():
+    driver = _FakeDriver([{"ok": True}])
+    action = GoToUrlAction(params={"url": "http://localhost/{page}", "wait_condition": "网络空闲", "idle_ms": 400})
+    assert action.execute({"driver": driver, "page": "list"})
+    # 导航前先注入记录脚本
+    assert driver.calls.index("Page.addScriptToEvaluateOnNewDocument") < driver.calls.index("get http://localhost/list")
+    assert driver.wait_options[0]["network_ms"] == 400 and driver.wait_options[0]["dom_ms"] == 0
+
+    # 循环中反复导航：新文档脚本只注册一次，当前页面仍每次注入
+    driver.results.extend([{"ok": True}] * 3)
+    for _ in range(3):
+        assert action.execute({"driver": driver, "page": "list"})
+    assert driver.calls.count("Page.addScriptToEvaluateOnNewDocument") == 1
+    assert driver.calls.count("install") == 4
+
+    driver = _FakeDriver([{"ok": True}])
+    action = WaitElementAction(params={"wait_type": "dom_stable", "idle_ms": 250, "timeout": 3})
+    assert action.execute({"driver": driver})
+    assert driver.wait_options[0]["dom_ms"] == 250
+
+
+if __name__ == "__main__":
+    test_wait_quiet_reinstalls_after_navigation()
+    test_actions_use_page_waits()
+    print("OK")
@@ -0,0 +1,76 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.profile_manager import ProfileManager
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise Exception("session deleted")
+        return "T0"
+
+
+def _write(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def test_clone_links_immutable_and_copies_mutable(tmp_path):
+    template = tmp_path / "golden"
+    _write(str(template / "Default" / "Extensions" / "abc" / "manifest.json"), b"{}")
+    _write(str(template / "Default" / "Local Storage" / "leveldb" / "000003.ldb"), b"table")
+    _write(str(template / "Default" / "Local Storage" / "leveldb" / "000004.log"), b"log")
+    _write(str(template / "Default" / "Cookies"), b"sqlite")
+    _write(str(template / "Default" / "Cache" / "data_0"), b"cache")
+    _write(str(template / "SingletonLock"), b"lock")
+
+    clone = ProfileManager.clone(str(template), base_dir=str(tmp_path / "clones"), run_id="run-1")
+    try:
+        same = lambda rel: os.stat(os.path.join(clone, rel)).st_ino == os.stat(os.path.join(str(template), rel)).st_ino
+        assert same(os.path.join("Default", "Extensions", "abc", "manifest.json"))
+        assert same(os.path.join("Default", "Local Storage", "leveldb", "000003.ldb"))
+        assert not same(os.path.join("Default", "Local Storage", "leveldb", "000004.log"))
+        assert not same(os.path.join("Default", "Cookies"))
+        assert not os.path.exists(os.path.join(clone, "Default", "Cache"))
+        assert not os.path.exists(os.path.join(clone, "SingletonLock"))
+
+        # 修改克隆中的可变文件不影响模板
+        _write(os.path.join(clone, "Default", "Cookies"), b"changed")
+        with open(template / "Default" / "Cookies", "rb") as f:
+            assert f.read() == b"sqlite"
+    finally:
+        ProfileManager.release(clone)
+    assert not os.path.exists(clone)
+
+
+def test_release_keeps_running_browsers(tmp_path):
+    template = tmp_path / "golden"
+    _write(str(template / "Default" / "Preferences"), b"{}")
+    clone = ProfileManager.clone(str(template), base_dir=str(tmp_path), run_id="run-2")
+    driver = _FakeDriver()
+    ProfileManager.attach(clone, driver)
+
+    assert ProfileManager.release_run("run-2") == 0
+    assert os.path.isdir(clone)
+    driver.alive = False
+    assert ProfileManager.release_driver(driver) == clone
+    assert not os.path.exists(clone)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as d:
+        test_clone_links_immutable_and_copies_mutable(Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_release_keeps_running_browsers(Path(d))
+    print("OK")
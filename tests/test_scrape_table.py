@@ -0,0 +1,162 @@
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import openpyxl
+from selenium.common.exceptions import WebDriverException
+
+from tools.web_tools import (ScrapeTableAction, _parse_table_columns, _SCRAPE_PAGE_JS, _WAIT_TABLE_CHANGE_JS,
+                             _COUNT_ROWS_JS)
+from tools.excel_tools import OpenExcelAction, CloseExcelAction
+
+
+class _Timeouts:
+    script = 30
+
+
+class _FakeDriver:
+    """
+    模拟分页表格：每页 rows_per_page 行，翻页（或滚动）后数据变化
+    scroll=True 时滚动追加行而不是翻页；navigate=True 时翻页脚本因页面卸载而中断
+    """
+
+    def __init__(self, pages=3, rows_per_page=4, scroll=False, navigate=False):
+        self.pages = pages
+        self.rows_per_page = rows_per_page
+        self.scroll = scroll
+        self.navigate = navigate
+        self.page = 1
+        self.loaded = rows_per_page
+        self.timeouts = _Timeouts()
+        self.scrape_calls = 0
+        self.wait_calls = 0
+
+    def set_script_timeout(self, seconds):
+        self.timeouts.script = seconds
+
+    def _rows(self):
+        if self.scroll:
+            return [[str(i + 1), f"item-{i + 1}"] for i in range(self.loaded)]
+        return [[str((self.page - 1) * self.rows_per_page + i + 1), f"item-{self.page}-{i + 1}"]
+                for i in range(self.rows_per_page)]
+
+    def execute_script(self, script, opts):
+        if script == _COUNT_ROWS_JS:
+            return True
+        assert script == _SCRAPE_PAGE_JS
+        self.scrape_calls += 1
+        rows = self._rows()
+        out, stopped = [], False
+        for values in rows[opts["offset"]:]:
+            if opts["stop_text"] and any(opts["stop_text"] in v for v in values):
+                stopped = True
+                break
+            out.append(values)
+            if opts["limit"] and len(out) >= opts["limit"]:
+                stopped = True
+                break
+        result = {"rows": out, "total": len(rows), "signature": f"{len(rows)}|{rows[0]}", "headers": ["id", "name"],
+                  "stopped": stopped, "advanced": False}
+        if not stopped and opts["advance"]:
+            if self.scroll:
+                if self.loaded < self.pages * self.rows_per_page:
+                    self.loaded += self.rows_per_page
+                result["advanced"] = True
+            elif self.page < self.pages:
+                self.page += 1
+                result["advanced"] = True
+        return result
+
+    def execute_async_script(self, script, opts):
+        assert script == _WAIT_TABLE_CHANGE_JS
+        self.wait_calls += 1
+        if self.navigate:
+            raise WebDriverException("javascript error: document unloaded while waiting for result")
+        rows = self._rows()
+        return {"changed": f"{len(rows)}|{rows[0]}" != opts["signature"], "navigated": False}
+
+
+def _scrape(driver, **params):
+    ctx = {"driver": driver}
+    base = {"rows_locator": "#data tbody tr", "next_locator": "#next", "columns": "id => td.id\nname => td.name"}
+    base.update(params)
+    assert ScrapeTableAction(base).execute(ctx)
+    return ctx
+
+
+def test_parse_columns():
+    cols = _parse_table_columns({}, "名称 => td.name\n链接 => a => href\n行 => .\n第二列 => ./td[2]\n忽略这一行")
+    assert [c["name"] for c in cols] == ["名称", "链接", "行", "第二列"]
+    assert cols[0]["by"] == "css selector" and cols[1]["attr"] == "href"
+    assert cols[2]["value"] == "" and cols[3] == {"name": "第二列", "by": "xpath", "value": "./td[2]", "attr": "text"}
+    assert _parse_table_columns({}, "x => xpath://td")[0]["value"] == ".//td"
+    cols = _parse_table_columns({"spec": [{"name": "a", "locator": "td", "attr": "title"}]}, "{spec}")
+    assert cols[0]["attr"] == "title"
+
+
+def test_next_button_paging():
+    driver = _FakeDriver(pages=3)
+    ctx = _scrape(driver)
+    rows = ctx["table_rows"]
+    assert len(rows) == 12 and ctx["table_row_count"] == 12
+    assert rows[0] == {"id": "1", "name": "item-1-1"} and rows[-1] == {"id": "12", "name": "item-3-4"}
+    # 每页一次抓取脚本
+    assert driver.scrape_calls == 3 and driver.wait_calls == 2
+    assert driver.timeouts.script == 30
+    assert ctx["__metrics__"].snapshot()["table_pages"] == 3
+
+
+def test_stop_conditions():
+    driver = _FakeDriver(pages=5)
+    ctx = _scrape(driver, max_pages=2)
+    assert len(ctx["table_rows"]) == 8 and driver.page == 2
+
+    ctx = _scrape(_FakeDriver(pages=5), max_rows=6)
+    assert [r["id"] for r in ctx["table_rows"]] == ["1", "2", "3", "4", "5", "6"]
+
+    ctx = _scrape(_FakeDriver(pages=5), stop_text="item-2-3")
+    assert ctx["table_rows"][-1]["name"] == "item-2-2"
+
+    # 不翻页 + 不指定列：表头作为键
+    driver = _FakeDriver(pages=5)
+    ctx = _scrape(driver, paging_mode="不翻页", columns="")
+    assert len(ctx["table_rows"]) == 4 and set(ctx["table_rows"][0]) == {"id", "name"} and driver.page == 1
+
+
+def test_infinite_scroll_and_navigation():
+    driver = _FakeDriver(pages=3, scroll=True)
+    ctx = _scrape(driver, paging_mode="无限滚动")
+    assert [r["id"] for r in ctx["table_rows"]] == [str(i) for i in range(1, 13)]
+
+    driver = _FakeDriver(pages=3, navigate=True)
+    ctx = _scrape(driver)
+    assert len(ctx["table_rows"]) == 12 and ctx["table_rows"][4]["name"] == "item-2-1"
+
+
+def test_excel_output():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.xlsx")
+        openpyxl.Workbook().save(path)
+        ctx = {"driver": _FakeDriver(pages=2)}
+        assert OpenExcelAction({"file_path": path, "alias": "scrape"}).execute(ctx)
+        try:
+            assert ScrapeTableAction({"rows_locator": "tr", "next_locator": "#next", "columns": "编号 => td.id\n名称 => td.name",
+                                      "output_target": "Excel 会话", "excel_alias": "scrape"}).execute(ctx)
+        finally:
+            CloseExcelAction({"alias": "scrape", "save": True}).execute(ctx)
+        ws = openpyxl.load_workbook(path).active
+        values = [list(r) for r in ws.iter_rows(values_only=True)]
+        assert values[0] == ["编号", "名称"] and values[1] == ["1", "item-1-1"] and len(values) == 9
+        assert ctx["table_row_count"] == 8
+
+
+if __name__ == "__main__":
+    test_parse_columns()
+    test_next_button_paging()
+    test_stop_conditions()
+    test_infinite_scroll_and_navigation()
+    test_excel_output()
+    print("scrape table tests passed")
@@ -0,0 +1,141 @@
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import session_snapshot
+from utils.session_snapshot import SessionSnapshot
+from tools.web_tools import SaveSessionAction, RestoreSessionAction
+
+
+class _FakeDriver:
+    def __init__(self, url="https://app.example.com/home", cookies=None, local=None):
+        self.current_url = url
+        self.cookies = list(cookies or [])
+        self.local = dict(local or {})
+        self.session = {}
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+        self.current_url = url
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def execute_script(self, script, *args):
+        if "setItem" in script:
+            self.local.update(args[0])
+            self.session.update(args[1])
+            return None
+        return {"origin": "https://app.example.com", "local": dict(self.local), "session": dict(self.session)}
+
+
+def test_encrypt_roundtrip_and_tamper():
+    blob = SessionSnapshot.encrypt({"token": "秘密"}, password="pw")
+    assert b"token" not in blob
+    assert SessionSnapshot.decrypt(blob, password="pw") == {"token": "秘密"}
+    assert SessionSnapshot.decrypt(blob, password="wrong") is None
+    raw = bytearray(blob)
+    raw[40] = ord("A") if raw[40] != ord("A") else ord("B")
+    assert SessionSnapshot.decrypt(bytes(raw), password="pw") is None
+
+
+def test_save_and_restore_actions(tmp_path):
+    path = str(tmp_path / "app.session")
+    source = _FakeDriver(cookies=[
+        {"name": "sid", "value": "1", "domain": ".example.com", "path": "/"},
+        {"name": "other", "value": "x", "domain": "tracker.net", "path": "/"},
+    ], local={"jwt": "abc"})
+    ctx = {"driver": source}
+    ctx["pw"] = "pw"
+    assert SaveSessionAction(params={"file_path": path, "password_variable": "{pw}", "required_cookies": "sid"}).execute(ctx)
+
+    # 口令只从变量/环境变量读取，不出现在工作流参数里
+    os.environ["TEST_SESSION_PW"] = "pw"
+    target = _FakeDriver(url="data:,")
+    ctx = {"driver": target}
+    action = RestoreSessionAction(params={"file_path": path, "password_env": "TEST_SESSION_PW", "url": "https://app.example.com/home"})
+    assert action.execute(ctx)
+    assert ctx["session_restored"] is True
+    assert [c["name"] for c in target.cookies] == ["sid"]
+    assert target.local == {"jwt": "abc"}
+    assert target.visited == ["https://app.example.com", "https://app.example.com/home"]
+
+    # 过期快照：输出 False，不写入任何内容
+    snapshot = SessionSnapshot.load(path, "pw")
+    snapshot["expires_at"] = time.time() - 1
+    SessionSnapshot.save(path, snapshot, "pw")
+    target = _FakeDriver(url="data:,")
+    ctx = {"driver": target}
+    assert action.execute(ctx)
+    assert ctx["session_restored"] is False and target.cookies == []
+
+
+
+class _CdpDriver(_FakeDriver):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        if cmd == "Network.getAllCookies":
+            return {"cookies": [{"name": "sso", "value": "t", "domain": ".example.com", "path": "/", "secure": True,
+                                 "httpOnly": True, "sameSite": "None", "expires": time.time() + 3600.75}]}
+        return {}
+
+
+def test_same_site_and_expiry_survive_restore(tmp_path):
+    path = str(tmp_path / "sso.session")
+    source = _CdpDriver()
+    snapshot = SessionSnapshot.capture(source, "example.com")
+    expires = snapshot["cookies"][0]["expiry"]
+    assert snapshot["cookies"][0]["sameSite"] == "None" and expires % 1
+    SessionSnapshot.save(path, snapshot, "pw")
+
+    # CDP 写回：sameSite 与精确的过期时间原样传递
+    target = _CdpDriver(url="https://app.example.com/")
+    SessionSnapshot.apply(target, SessionSnapshot.load(path, "pw"))
+    (cmd, params), = [c for c in target.cdp if c[0] == "Network.setCookies"]
+    assert params["cookies"][0]["sameSite"] == "None" and params["cookies"][0]["expires"] == expires
+
+    # 无 CDP 时经 add_cookie 写回，expiry 取整
+    plain = _FakeDriver(url="https://app.example.com/")
+    SessionSnapshot.apply(plain, SessionSnapshot.load(path, "pw"))
+    assert plain.cookies[0]["sameSite"] == "None" and plain.cookies[0]["expiry"] == int(expires)
+
+
+def test_machine_key_outside_snapshot_dir(tmp_path):
+    key_dir = tmp_path / "config"
+    os.environ[session_snapshot.KEY_DIR_ENV] = str(key_dir)
+    env_secret = os.environ.pop(session_snapshot.KEY_ENV, None)
+    try:
+        blob = SessionSnapshot.encrypt({"a": 1})
+        assert SessionSnapshot.key_path() == str(key_dir / session_snapshot.KEY_FILE_NAME)
+        assert os.path.exists(SessionSnapshot.key_path())
+        assert not os.path.exists(os.path.join(session_snapshot.DEFAULT_SNAPSHOT_DIR, ".key"))
+        assert SessionSnapshot.decrypt(blob) == {"a": 1}
+        assert SessionSnapshot.decrypt(blob, password="pw") is None
+    finally:
+        os.environ.pop(session_snapshot.KEY_DIR_ENV, None)
+        if env_secret is not None:
+            os.environ[session_snapshot.KEY_ENV] = env_secret
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_encrypt_roundtrip_and_tamper()
+    with tempfile.TemporaryDirectory() as d:
+        test_save_and_restore_actions(Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_same_site_and_expiry_survive_restore(Path(d))
+    with tempfile.TemporaryDirectory() as d:
+        test_machine_key_outside_snapshot_dir(Path(d))
+    print("OK")
@@ -0,0 +1,85 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.action_base import ActionBase
+from core.engine import Engine
+from core.step_profiler import StepProfiler
+from tools.logic_tools import LoopAction
+from utils.driver_instrument import DriverInstrument
+
+
+class _FakeExecutor:
+    def execute(self, command, params):
+        return {"value": "x" * 100}
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.command_executor = _FakeExecutor()
+
+
+class _ChattyAction(ActionBase):
+    @property
+    def name(self):
+        return "Chatty"
+
+    @property
+    def description(self):
+        return ""
+
+    def execute(self, context):
+        driver = context["fake_driver"]
+        for _ in range(int(self.params.get("count", 1))):
+            driver.command_executor.execute("findElement", {"using": "css selector", "value": "#a"})
+        driver.command_executor.execute("executeScript", {"script": "return 1", "args": []})
+        return True
+
+
+REGISTRY = {"Chatty": _ChattyAction, "Loop": LoopAction}
+
+
+def test_engine_profiles_commands_per_step():
+    driver = _FakeDriver()
+    assert DriverInstrument.install(driver)
+    assert not DriverInstrument.install(driver)
+
+    workflow = [
+        {"id": "Chatty", "line": 1, "params": {"count": 1}},
+        {"id": "Loop", "line": 2, "params": {"count": 3, "children": [
+            {"id": "Chatty", "line": 3, "params": {"count": 25}},
+        ]}},
+    ]
+    engine = Engine()
+    engine.load_workflow(workflow, REGISTRY)
+    engine.run({"fake_driver": driver})
+
+    profiler = engine.context["__profiler__"]
+    steps = {row["key"]: row for row in profiler.report(top=0)}
+    assert steps[1]["commands"] == 2 and steps[1]["runs"] == 1
+    # 循环容器只统计自身发出的命令
+    assert steps[2]["commands"] == 0
+    assert steps[3]["runs"] == 3 and steps[3]["commands"] == 78
+    assert steps[3]["by_command"] == {"findElement": 75, "executeScript": 3}
+    assert steps[3]["over_budget"] == 3 and steps[1]["over_budget"] == 0
+    assert steps[3]["bytes_in"] == 78 * 100
+
+    metrics = engine.context["__metrics__"]
+    assert metrics.get("web_commands") == 80
+    assert metrics.get("web_cmd.findElement") == 76
+    assert metrics.get("web_steps_over_budget") == 3
+    assert "Chatty" in profiler.format_report()
+
+
+def test_commands_outside_steps_are_counted():
+    profiler = StepProfiler(roundtrip_budget=0)
+    profiler.record_command("get", 0.01, 10, 0)
+    assert profiler.total_commands == 1 and profiler.report() == []
+
+
+if __name__ == "__main__":
+    test_engine_profiles_commands_per_step()
+    test_commands_outside_steps_are_counted()
+    print("OK")
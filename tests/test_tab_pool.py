@@ -0,0 +1,120 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.tab_pool import TabPool, WindowIndex
+from tools.web_tools import TabPoolLoopAction
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.switches += 1
+        self.driver.current = handle
+
+    def new_window(self, kind):
+        handle = f"T{len(self.driver.tabs)}"
+        self.driver.tabs[handle] = {"url": "about:blank", "checks": 0}
+        self.driver.current = handle
+
+
+class _FakeDriver:
+    """每个标签页在被检查 load_checks 次后就绪"""
+
+    def __init__(self, load_checks=2, cdp=True):
+        self.session_id = f"fake-{id(self)}"
+        self.tabs = {"T0": {"url": "about:blank", "checks": 0}}
+        self.current = "T0"
+        self.load_checks = load_checks
+        self.switches = 0
+        self.cdp_enabled = cdp
+        self.switch_to = _SwitchTo(self)
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    @property
+    def current_url(self):
+        return self.tabs[self.current]["url"]
+
+    def execute_script(self, script, *args):
+        tab = self.tabs[self.current]
+        if "location.href" in script:
+            tab["url"], tab["checks"] = args[0], 0
+            return None
+        tab["checks"] += 1
+        return "complete" if tab["checks"] >= self.load_checks else "pending"
+
+    def execute_cdp_cmd(self, cmd, params):
+        if not self.cdp_enabled:
+            raise Exception("not chromium")
+        return {"targetInfos": [{"targetId": h, "type": "page", "url": t["url"]} for h, t in self.tabs.items()]}
+
+    def close(self):
+        del self.tabs[self.current]
+
+
+def test_tab_pool_loop_overlaps_loads():
+    driver = _FakeDriver()
+    urls = [f"http://site/{i}" for i in range(7)]
+    seen = []
+
+    def runner(children, context):
+        # 循环体执行时当前标签页就是该 URL 所在的标签页
+        assert driver.current_url == context["tab_url"]
+        seen.append((context["loop_index"], context["tab_url"]))
+        return True
+
+    action = TabPoolLoopAction(params={"list_variable": "{urls}", "tab_count": 3})
+    context = {"driver": driver, "urls": urls, "__runner__": runner}
+    assert action.execute(context)
+    assert sorted(seen) == list(enumerate(urls))
+    assert context["tab_errors"] == []
+    # 新开的标签页已关闭，回到原标签页
+    assert list(driver.tabs) == ["T0"] and driver.current == "T0"
+
+
+def test_tab_pool_timeout():
+    driver = _FakeDriver(load_checks=10 ** 6)
+    pool = TabPool(driver, size=2, poll_interval=0.01)
+    pool.navigate(pool.handles[1], 0, "http://slow/")
+    handle, index, url, ready = pool.next_ready(timeout=0.05)
+    assert (handle, index, url, ready) == ("T1", 0, "http://slow/", False)
+    pool.close()
+
+
+def test_window_index_lookup():
+    driver = _FakeDriver()
+    driver.switch_to.new_window("tab")
+    driver.tabs["T1"]["url"] = "http://a/report?id=1"
+    driver.switch_to.window("T0")
+    driver.switches = 0
+    # CDP 一次取得全部 URL，只切换到目标窗口
+    assert WindowIndex.find(driver, "report") == "T1"
+    assert driver.switches == 1
+
+    driver = _FakeDriver(cdp=False)
+    driver.switch_to.new_window("tab")
+    driver.tabs["T1"]["url"] = "http://a/report"
+    assert WindowIndex.find(driver, "report") == "T1"
+    driver.switches = 0
+    # 第二次查找命中缓存
+    assert WindowIndex.find(driver, "report") == "T1"
+    assert driver.switches == 1
+    assert WindowIndex.find(driver, "missing") is None
+
+
+if __name__ == "__main__":
+    test_tab_pool_loop_overlaps_loads()
+    test_tab_pool_timeout()
+    test_window_index_lookup()
+    print("OK")
@@ -0,0 +1,97 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tools.table_tools as table_tools
+from tools.table_tools import (TableFilterAction, TableSortAction, TableDedupeAction,
+                               TableGroupAction, TableJoinAction)
+
+ROWS = [
+    {"name": "apple", "city": "北京", "amount": 10},
+    {"name": "banana", "city": "上海", "amount": 5},
+    {"name": "cherry", "city": "北京", "amount": None},
+    {"name": "apple", "city": "深圳", "amount": 7},
+    {"name": None, "city": "上海", "amount": 3},
+]
+
+
+def _run_both(fn):
+    """Runs a check with pandas (if installed) and with the pure-Python fallback."""
+    saved = table_tools.pd
+    try:
+        fn()
+        table_tools.pd = None
+        fn()
+    finally:
+        table_tools.pd = saved
+
+
+def test_filter():
+    def check():
+        ctx = {"rows": ROWS, "min_amount": 5}
+        assert TableFilterAction({"list_variable": "rows", "column": "amount", "relation": "大于等于",
+                                  "value": "{min_amount}", "output_variable": "out"}).execute(ctx)
+        assert [r["name"] for r in ctx["out"]] == ["apple", "banana", "apple"]
+
+        assert TableFilterAction({"list_variable": "{rows}", "column": "name", "relation": "包含",
+                                  "value": "an", "output_variable": "out"}).execute(ctx)
+        assert [r["name"] for r in ctx["out"]] == ["banana"]
+
+        assert TableFilterAction({"list_variable": "rows", "column": "amount", "relation": "是空值",
+                                  "output_variable": "out"}).execute(ctx)
+        assert [r["name"] for r in ctx["out"]] == ["cherry"]
+
+        assert TableFilterAction({"list_variable": "rows", "column": "city", "relation": "不等于",
+                                  "value": "北京", "output_variable": "out"}).execute(ctx)
+        assert len(ctx["out"]) == 3
+    _run_both(check)
+
+
+def test_contains_with_missing_values_matches_fallback():
+    values = ["apple", None, "lemon", "", None, "None"]
+    for op in ("包含", "不包含"):
+        for needle in ("", "on", "No", "ap", "x"):
+            mask = table_tools._vectorized_mask(values, op, needle)
+            expected = [table_tools._apply_relation(v, op, needle) for v in values]
+            assert mask is not None and list(mask) == expected, (op, needle, list(mask), expected)
+
+
+def test_sort_and_dedupe():
+    def check():
+        ctx = {"rows": ROWS}
+        assert TableSortAction({"list_variable": "rows", "columns": "amount", "order": "降序",
+                                "output_variable": "out"}).execute(ctx)
+        assert [r["amount"] for r in ctx["out"]] == [10, 7, 5, 3, None]
+
+        assert TableDedupeAction({"list_variable": "rows", "columns": "name",
+                                  "output_variable": "out"}).execute(ctx)
+        assert [r["name"] for r in ctx["out"]] == ["apple", "banana", "cherry", None]
+    _run_both(check)
+
+
+def test_group_and_join():
+    def check():
+        ctx = {"rows": ROWS, "cities": [{"city": "北京", "code": "BJ"}, {"city": "上海", "code": "SH"}]}
+        assert TableGroupAction({"list_variable": "rows", "group_by": "city",
+                                 "aggregates": "amount:sum, amount:max, *:count",
+                                 "output_variable": "out"}).execute(ctx)
+        assert ctx["out"] == [
+            {"city": "北京", "amount_sum": 10, "amount_max": 10, "count": 2},
+            {"city": "上海", "amount_sum": 8, "amount_max": 5, "count": 2},
+            {"city": "深圳", "amount_sum": 7, "amount_max": 7, "count": 1},
+        ]
+
+        assert TableJoinAction({"left_variable": "rows", "right_variable": "cities", "left_on": "city",
+                                "how": "left", "output_variable": "out"}).execute(ctx)
+        assert [r.get("code") for r in ctx["out"]] == ["BJ", "SH", "BJ", None, "SH"]
+    _run_both(check)
+
+
+if __name__ == "__main__":
+    test_filter()
+    test_contains_with_missing_values_matches_fallback()
+    test_sort_and_dedupe()
+    test_group_and_join()
+    print("table tools OK")
@@ -1,13 +1,355 @@
 import os
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, Any, List, Union
 import openpyxl
 from openpyxl.utils import get_column_letter
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
 from core.action_base import ActionBase
+from core.engine import register_shutdown_hook
+from core.flow_control import BreakLoopException, ContinueLoopException
+from utils.file_tools import FileTools
+
+# Approximate in-memory cost of one openpyxl cell (Cell object + value + style array)
+_CELL_BYTES = 400
+# Ceiling for all open workbooks, overridable via environment (MB, 0 disables eviction)
+_DEFAULT_MEMORY_LIMIT_MB = 1024
+
+# Background saves that have not been joined yet, keyed by absolute target path
+# (the session may already be closed): {"thread", "path", "error", "reported"}
+_PENDING_SAVES: Dict[str, Dict[str, Any]] = {}
+_SAVE_LOCK = threading.Lock()
+
+
+def _atomic_save(wb, path: str) -> None:
+    """Saves to a temp file in the target directory and renames it over the target."""
+    target = os.path.abspath(path)
+    directory = os.path.dirname(target)
+    ext = os.path.splitext(target)[1] or ".xlsx"
+    fd, tmp_path = tempfile.mkstemp(prefix=".~save_", suffix=ext, dir=directory)
+    os.close(fd)
+    try:
+        wb.save(tmp_path)
+        os.replace(tmp_path, target)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _join_save(pending: Dict[str, Any]) -> Union[Exception, None]:
+    """Joins a background save and unregisters it. Returns its error if it failed and was not reported yet."""
+    pending["thread"].join()
+    key = os.path.abspath(pending["path"])
+    with _SAVE_LOCK:
+        if _PENDING_SAVES.get(key) is pending:
+            del _PENDING_SAVES[key]
+        if pending["error"] is None or pending["reported"]:
+            return None
+        pending["reported"] = True
+        return pending["error"]
+
+
+def _wait_path_save(path: str) -> Union[Exception, None]:
+    """
+    Blocks until a background save targeting this file has finished, whichever session
+    started it (CloseExcel with async_save drops the session before the file is written).
+    Returns the error of a failed save that has not been reported yet.
+    """
+    with _SAVE_LOCK:
+        pending = _PENDING_SAVES.get(os.path.abspath(path))
+    return _join_save(pending) if pending else None
+
+
+def _wait_pending_save(session: Dict[str, Any]) -> bool:
+    """
+    Blocks until a background save of this session has finished.
+    openpyxl workbooks are not thread-safe (even reads create cells), so every action
+    touching a session calls this first. Returns False if the background save failed.
+    """
+    pending = session.get("pending_save")
+    if not pending:
+        return True
+    _join_save(pending)
+    session["pending_save"] = None
+    if pending.get("error") is not None:
+        print(f"[SaveExcel] Background save to {pending['path']} failed: {pending['error']}")
+        return False
+    return True
+
+
+def _start_background_save(alias: str, session: Dict[str, Any], path: str, close_after: bool = False) -> None:
+    wb = session["wb"]
+    pending = {"path": path, "error": None, "reported": False}
+
+    def _worker():
+        try:
+            _atomic_save(wb, path)
+            if os.path.abspath(path) == os.path.abspath(session["path"]):
+                session["dirty"] = False
+            print(f"[SaveExcel] Background save finished: {path}")
+        except Exception as e:
+            pending["error"] = e
+            print(f"[SaveExcel] Background save error ({path}): {e}")
+        finally:
+            if close_after:
+                try:
+                    wb.close()
+                except Exception:
+                    pass
+
+    thread = threading.Thread(target=_worker, name=f"ExcelSave-{alias}")
+    pending["thread"] = thread
+    session["pending_save"] = pending
+    with _SAVE_LOCK:
+        _PENDING_SAVES[os.path.abspath(path)] = pending
+    thread.start()
+
+
+def wait_all_saves(context: Dict[str, Any] = None) -> None:
+    """
+    Joins every pending background save. Registered as an engine shutdown hook.
+    Raises if a save failed and no action has reported it yet (e.g. a CloseExcel async save).
+    """
+    with _SAVE_LOCK:
+        pendings = list(_PENDING_SAVES.values())
+    if pendings:
+        print(f"[SaveExcel] Waiting for {len(pendings)} background save(s)...")
+    failed = []
+    for pending in pendings:
+        error = _join_save(pending)
+        if error is not None:
+            failed.append(f"{pending['path']}: {error}")
+    for session in list(EXCEL_SESSIONS.values()):
+        session["pending_save"] = None
+    if failed:
+        raise RuntimeError(f"Background Excel save failed, file(s) not written: {'; '.join(failed)}")
+
+
+def _estimate_session_bytes(session: Dict[str, Any]) -> int:
+    """Rough memory footprint of an open workbook."""
+    wb = session.get("wb")
+    if wb is None:
+        return 0
+    if session.get("read_only"):
+        # Read-only workbooks stream rows from the file; shared strings etc. scale with file size.
+        try:
+            return os.path.getsize(session["path"])
+        except OSError:
+            return 0
+    total = 0
+    for ws in getattr(wb, "worksheets", []):
+        total += len(getattr(ws, "_cells", {})) * _CELL_BYTES
+    return total
+
+
+class ExcelSessionManager(OrderedDict):
+    """
+    Registry of open workbooks keyed by alias, kept in least-recently-used order.
+
+    - Each session records the run (context) that opened it; sessions still open when
+      that run ends are flushed (with a warning if they have unsaved writes) and closed.
+    - When the estimated memory of all workbooks exceeds the limit, the least recently
+      used read-only sessions are evicted: the workbook is closed and reopened from its
+      path the next time the alias is accessed. Writable sessions are never evicted, even
+      when clean, since reopening would silently pick up changes made to the file outside
+      the workflow.
+    """
+
+    def __init__(self, memory_limit_mb: float = None):
+        super().__init__()
+        if memory_limit_mb is None:
+            try:
+                memory_limit_mb = float(os.environ.get("EXCEL_SESSION_MEMORY_LIMIT_MB", _DEFAULT_MEMORY_LIMIT_MB))
+            except ValueError:
+                memory_limit_mb = _DEFAULT_MEMORY_LIMIT_MB
+        self.set_memory_limit(memory_limit_mb)
+
+    def set_memory_limit(self, memory_limit_mb: float) -> None:
+        self.memory_limit = int(float(memory_limit_mb) * 1024 * 1024)
+
+    def __getitem__(self, alias):
+        session = super().__getitem__(alias)
+        self.move_to_end(alias)
+        if session.get("wb") is None:
+            self._reopen(alias, session)
+        return session
+
+    def get(self, alias, default=None):
+        if alias not in self:
+            return default
+        return self[alias]
+
+    def peek(self, alias):
+        """Returns the session without touching LRU order or reopening it."""
+        return super().get(alias)
+
+    def _reopen(self, alias: str, session: Dict[str, Any]) -> None:
+        options = session.get("options", {})
+        print(f"[ExcelSession] Reopening evicted session '{alias}' from {session['path']}")
+        session["wb"] = openpyxl.load_workbook(filename=session["path"], **options)
+        self.enforce_limit(keep=alias)
+
+    def memory_usage(self) -> int:
+        return sum(_estimate_session_bytes(s) for s in self.values())
+
+    def enforce_limit(self, keep: str = None) -> None:
+        if self.memory_limit <= 0:
+            return
+        total = self.memory_usage()
+        if total <= self.memory_limit:
+            return
+        for alias in list(self.keys()):
+            if total <= self.memory_limit:
+                break
+            session = self.peek(alias)
+            if alias == keep or session.get("wb") is None or not session.get("read_only"):
+                continue
+            size = _estimate_session_bytes(session)
+            try:
+                session["wb"].close()
+            except Exception:
+                pass
+            session["wb"] = None
+            total -= size
+            print(f"[ExcelSession] Evicted '{alias}' (~{size // (1024 * 1024)} MB), will reopen from {session['path']} on next use.")
+        if total > self.memory_limit:
+            writable = [a for a, s in self.items() if s.get("wb") is not None and not s.get("read_only")]
+            if writable:
+                print(f"[ExcelSession] Warning: memory limit exceeded, writable sessions are not evicted: {writable}")
+
+    def close_run_sessions(self, run_id: int) -> None:
+        """Flushes and closes every session opened by the given run."""
+        for alias in [a for a, s in self.items() if s.get("run_id") == run_id]:
+            session = self.peek(alias)
+            _wait_pending_save(session)
+            wb = session.get("wb")
+            try:
+                if wb is not None and session.get("dirty") and not session.get("read_only"):
+                    print(f"[ExcelSession] Warning: session '{alias}' was not saved/closed, saving to {session['path']}")
+                    wb.save(session["path"])
+                if wb is not None:
+                    wb.close()
+            except Exception as e:
+                print(f"[ExcelSession] Error flushing session '{alias}': {e}")
+            del self[alias]
+            print(f"[ExcelSession] Released session '{alias}' at workflow end.")
+
 
 # Global session storage for open Excel workbooks
-# Key: alias, Value: {"wb": workbook_obj, "path": file_path}
-EXCEL_SESSIONS = {}
+# Key: alias, Value: {"wb": workbook_obj | None (evicted), "path": file_path, "read_only": bool, "options": load kwargs,
+#                     "sheet_meta": {sheet_title: meta}, "dirty": bool, "pending_save": {"thread", "path", "error"} | None,
+#                     "run_id": id of the opening run's context}
+EXCEL_SESSIONS = ExcelSessionManager()
+
+
+def _release_run_sessions(context: Dict[str, Any]) -> None:
+    EXCEL_SESSIONS.close_run_sessions(id(context))
+    wait_all_saves()
+
+
+register_shutdown_hook(_release_run_sessions)
+
+
+def _is_empty_cell(value: Any) -> bool:
+    return value is None or value == ""
+
+
+def _scan_sheet(ws) -> Dict[str, int]:
+    """
+    Scans a worksheet once and returns the true used range:
+    last non-empty row/column and the first non-empty (header) row.
+    Trailing formatted-but-empty rows/columns are ignored.
+    """
+    last_row = 0
+    last_col = 0
+    header_row = 0
+    for r_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        for c_idx in range(len(row), 0, -1):
+            if not _is_empty_cell(row[c_idx - 1]):
+                last_row = r_idx
+                if c_idx > last_col:
+                    last_col = c_idx
+                if not header_row:
+                    header_row = r_idx
+                break
+    return {"last_row": last_row, "last_col": last_col, "header_row": header_row}
+
+
+def _get_sheet_meta(session: Dict[str, Any], ws) -> Dict[str, int]:
+    """Returns cached used-range metadata for a sheet, scanning it lazily on first use."""
+    cache = session.setdefault("sheet_meta", {})
+    meta = cache.get(ws.title)
+    if meta is None:
+        meta = _scan_sheet(ws)
+        cache[ws.title] = meta
+    return meta
+
+
+def _update_sheet_meta(session: Dict[str, Any], ws, row: int, col: int, value: Any) -> None:
+    """Keeps cached metadata in sync after a single cell write."""
+    cache = session.setdefault("sheet_meta", {})
+    meta = cache.get(ws.title)
+    if meta is None:
+        # Not scanned yet: nothing to keep in sync, it will be computed on demand.
+        return
+    if _is_empty_cell(value):
+        # Clearing a cell on the boundary may shrink the used range; rescan lazily.
+        if row >= meta["last_row"] or col >= meta["last_col"] or row <= meta["header_row"]:
+            cache.pop(ws.title, None)
+        return
+    if row > meta["last_row"]:
+        meta["last_row"] = row
+    if col > meta["last_col"]:
+        meta["last_col"] = col
+    if not meta["header_row"] or row < meta["header_row"]:
+        meta["header_row"] = row
+
+
+def append_rows(alias: str, rows: List[List[Any]], sheet_name: str = "", header: List[str] = None) -> int:
+    """
+    Appends rows below the used range of a sheet in an open session.
+    The header is written first when the sheet is still empty.
+    Returns the number of data rows written; raises KeyError/ValueError for a missing or read-only session.
+    """
+    if alias not in EXCEL_SESSIONS:
+        raise KeyError(f"Session '{alias}' not found.")
+    session = EXCEL_SESSIONS[alias]
+    if session.get("read_only"):
+        raise ValueError(f"Session '{alias}' is read-only.")
+    _wait_pending_save(session)
+    wb = session["wb"]
+    if sheet_name:
+        ws = wb[sheet_name] if sheet_name in wb.sheetnames else wb.create_sheet(sheet_name)
+    else:
+        ws = wb.active
+
+    meta = _get_sheet_meta(session, ws)
+    next_row = meta["last_row"] + 1
+    if header and not meta["last_row"]:
+        rows = [list(header)] + [list(r) for r in rows]
+        written = len(rows) - 1
+    else:
+        written = len(rows)
+    for values in rows:
+        for c_idx, value in enumerate(values, start=1):
+            if not _is_empty_cell(value):
+                ws.cell(row=next_row, column=c_idx, value=value)
+                _update_sheet_meta(session, ws, next_row, c_idx, value)
+        next_row += 1
+    if rows:
+        session["dirty"] = True
+        EXCEL_SESSIONS.enforce_limit(keep=alias)
+    return written
 
 class OpenExcelAction(ActionBase):
     @property
@@ -23,7 +365,7 @@ class OpenExcelAction(ActionBase):
             {"name": "file_path", "label": "文件路径", "type": "string", "ui_options": {"browse_type": "file"}},
             {"name": "alias", "label": "会话别名", "type": "string", "default": "default", "variable_type": "Excel对象"},
             {"name": "data_only", "label": "只读取数值(忽略公式)", "type": "bool", "default": True},
-            {"name": "read_only", "label": "只读模式", "type": "bool", "default": False}
+            {"name": "read_only", "label": "只读模式", "type": "bool", "default": False, "description": "只读会话在内存超限时可被临时释放，下次使用时从文件重新打开；可写会话始终保留在内存中"}
         ]
     
     def execute(self, context: Dict[str, Any]) -> bool:
@@ -38,14 +380,36 @@ class OpenExcelAction(ActionBase):
         except:
             pass
             
+        if file_path:
+            # A background save (possibly from an already closed session) may still be writing this file
+            error = _wait_path_save(file_path)
+            if error is not None:
+                print(f"[OpenExcel] Background save to {file_path} failed, the file does not contain those changes: {error}")
+                return False
+
         if not file_path or not os.path.exists(file_path):
             print(f"[OpenExcel] File not found: {file_path}")
             return False
             
+        previous = EXCEL_SESSIONS.peek(alias)
+        if previous is not None:
+            _wait_pending_save(previous)
+            if previous.get("dirty"):
+                print(f"[OpenExcel] Warning: session '{alias}' has unsaved changes and is being replaced.")
+            if previous.get("wb") is not None:
+                try:
+                    previous["wb"].close()
+                except Exception:
+                    pass
+
         try:
             print(f"[OpenExcel] Opening {file_path} (Alias: {alias})...")
-            wb = openpyxl.load_workbook(filename=file_path, data_only=data_only, read_only=read_only)
-            EXCEL_SESSIONS[alias] = {"wb": wb, "path": file_path, "read_only": read_only}
+            options = {"data_only": data_only, "read_only": read_only}
+            wb = openpyxl.load_workbook(filename=file_path, **options)
+            EXCEL_SESSIONS[alias] = {"wb": wb, "path": file_path, "read_only": read_only, "options": options,
+                                     "sheet_meta": {}, "dirty": False, "pending_save": None, "run_id": id(context)}
+            EXCEL_SESSIONS.move_to_end(alias)
+            EXCEL_SESSIONS.enforce_limit(keep=alias)
             return True
         except Exception as e:
             print(f"[OpenExcel] Error: {e}")
@@ -81,6 +445,7 @@ class ReadExcelAction(ActionBase):
             return False
             
         session = EXCEL_SESSIONS[alias]
+        _wait_pending_save(session)
         wb = session["wb"]
         
         try:
@@ -168,7 +533,9 @@ class GetExcelRowCountAction(ActionBase):
             print(f"[GetExcelRowCount] Session '{alias}' not found.")
             return False
             
-        wb = EXCEL_SESSIONS[alias]["wb"]
+        session = EXCEL_SESSIONS[alias]
+        _wait_pending_save(session)
+        wb = session["wb"]
         
         try:
             if sheet_name:
@@ -180,7 +547,9 @@ class GetExcelRowCountAction(ActionBase):
             else:
                 ws = wb.active
                 
-            count = ws.max_row
+            # ws.max_row counts formatted-but-empty rows and forces a dimension scan in read-only mode;
+            # use the cached true last non-empty row instead.
+            count = _get_sheet_meta(session, ws)["last_row"]
             context[output_var] = count
             print(f"[GetExcelRowCount] Count: {count}")
             return True
@@ -188,6 +557,62 @@ class GetExcelRowCountAction(ActionBase):
             print(f"[GetExcelRowCount] Error: {e}")
             return False
 
+class GetExcelUsedRangeAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "获取 Excel 已用范围"
+    
+    @property
+    def description(self) -> str:
+        return "获取指定 Sheet 实际有数据的范围（最后一行/列、表头行）。"
+    
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "alias", "label": "会话别名", "type": "string", "default": "default", "variable_type": "Excel对象"},
+            {"name": "sheet_name", "label": "Sheet 名称 (空则使用当前)", "type": "string", "default": ""},
+            {"name": "output_variable", "label": "保存到变量", "type": "string", "default": "used_range", "variable_type": "一般变量"}
+        ]
+    
+    def execute(self, context: Dict[str, Any]) -> bool:
+        alias = self.params.get("alias", "default")
+        sheet_name = self.params.get("sheet_name")
+        output_var = self.params.get("output_variable", "used_range")
+        
+        if alias not in EXCEL_SESSIONS:
+            print(f"[GetExcelUsedRange] Session '{alias}' not found.")
+            return False
+            
+        session = EXCEL_SESSIONS[alias]
+        _wait_pending_save(session)
+        wb = session["wb"]
+        
+        try:
+            if sheet_name:
+                if sheet_name in wb.sheetnames:
+                    ws = wb[sheet_name]
+                else:
+                    print(f"[GetExcelUsedRange] Sheet '{sheet_name}' not found.")
+                    return False
+            else:
+                ws = wb.active
+                
+            meta = _get_sheet_meta(session, ws)
+            last_row = meta["last_row"]
+            last_col = meta["last_col"]
+            result = {
+                "last_row": last_row,
+                "last_column": last_col,
+                "last_column_letter": get_column_letter(last_col) if last_col else "",
+                "header_row": meta["header_row"],
+                "address": f"A1:{get_column_letter(last_col)}{last_row}" if last_row and last_col else "",
+            }
+            context[output_var] = result
+            print(f"[GetExcelUsedRange] {result['address'] or '(empty)'}")
+            return True
+        except Exception as e:
+            print(f"[GetExcelUsedRange] Error: {e}")
+            return False
+
 class WriteExcelAction(ActionBase):
     @property
     def name(self) -> str:
@@ -222,6 +647,7 @@ class WriteExcelAction(ActionBase):
              print(f"[WriteExcel] Session '{alias}' is read-only.")
              return False
              
+        _wait_pending_save(session)
         wb = session["wb"]
         
         try:
@@ -271,7 +697,9 @@ class WriteExcelAction(ActionBase):
                             pass
             
             if write_type == "Cell":
-                ws[address] = value_to_write
+                cell = ws[address]
+                cell.value = value_to_write
+                _update_sheet_meta(session, ws, cell.row, cell.column, value_to_write)
                 print(f"[WriteExcel] Wrote to {address}")
                 
             elif write_type == "Range":
@@ -285,14 +713,18 @@ class WriteExcelAction(ActionBase):
                         if isinstance(row_data, list):
                             for c_idx, val in enumerate(row_data):
                                 ws.cell(row=start_row + r_idx, column=start_col + c_idx, value=val)
+                                _update_sheet_meta(session, ws, start_row + r_idx, start_col + c_idx, val)
                         else:
                             # Single list (one row)
                              ws.cell(row=start_row, column=start_col + r_idx, value=row_data)
+                             _update_sheet_meta(session, ws, start_row, start_col + r_idx, row_data)
                     print(f"[WriteExcel] Wrote range starting at {address}")
                 else:
                     print("[WriteExcel] Value for Range must be a list.")
                     return False
                     
+            session["dirty"] = True
+            EXCEL_SESSIONS.enforce_limit(keep=alias)
             return True
         except Exception as e:
             print(f"[WriteExcel] Error: {e}")
@@ -310,12 +742,14 @@ class SaveExcelAction(ActionBase):
     def get_param_schema(self) -> List[Dict[str, Any]]:
         return [
             {"name": "alias", "label": "会话别名", "type": "string", "default": "default", "variable_type": "Excel对象"},
-            {"name": "file_path", "label": "另存为路径 (空则覆盖原文件)", "type": "string", "default": "", "ui_options": {"browse_type": "file", "file_filter": "Excel Files (*.xlsx *.xls)"}}
+            {"name": "file_path", "label": "另存为路径 (空则覆盖原文件)", "type": "string", "default": "", "ui_options": {"browse_type": "file", "file_filter": "Excel Files (*.xlsx *.xls)"}},
+            {"name": "async_save", "label": "后台异步保存", "type": "bool", "default": False, "advanced": True, "description": "在后台线程写入临时文件后原子替换，流程继续执行；后续操作该会话时会自动等待保存完成"}
         ]
     
     def execute(self, context: Dict[str, Any]) -> bool:
         alias = self.params.get("alias", "default")
         new_path = self.params.get("file_path")
+        async_save = self.params.get("async_save", False)
         
         if alias not in EXCEL_SESSIONS:
             print(f"[SaveExcel] Session '{alias}' not found.")
@@ -327,8 +761,26 @@ class SaveExcelAction(ActionBase):
         
         save_path = new_path if new_path else original_path
         
+        pending = session.get("pending_save")
+        if async_save and pending and os.path.abspath(pending["path"]) == os.path.abspath(save_path):
+            # Any write would have waited for the pending save, so it already covers the current state.
+            print(f"[SaveExcel] Save to {save_path} already in progress, skipped.")
+            return True
+        if not _wait_pending_save(session):
+            print("[SaveExcel] Previous background save failed, saving again.")
+        error = _wait_path_save(save_path)
+        if error is not None:
+            print(f"[SaveExcel] Background save of another session to {save_path} failed: {error}")
+            return False
+        
         try:
+            if async_save:
+                _start_background_save(alias, session, save_path)
+                print(f"[SaveExcel] Saving to {save_path} in background...")
+                return True
             wb.save(save_path)
+            if os.path.abspath(save_path) == os.path.abspath(original_path):
+                session["dirty"] = False
             print(f"[SaveExcel] Saved to {save_path}")
             return True
         except Exception as e:
@@ -347,22 +799,43 @@ class CloseExcelAction(ActionBase):
     def get_param_schema(self) -> List[Dict[str, Any]]:
         return [
             {"name": "alias", "label": "会话别名", "type": "string", "default": "default", "variable_type": "Excel对象"},
-            {"name": "save", "label": "是否保存", "type": "bool", "default": True}
+            {"name": "save", "label": "是否保存", "type": "bool", "default": True},
+            {"name": "async_save", "label": "后台异步保存", "type": "bool", "default": False, "advanced": True, "enable_if": {"save": True}, "description": "关闭后在后台写入文件；之后打开或保存同一文件时会先等待写入完成，写入失败时该动作失败"}
         ]
     
     def execute(self, context: Dict[str, Any]) -> bool:
         alias = self.params.get("alias", "default")
         save = self.params.get("save", True)
+        async_save = self.params.get("async_save", False)
         
         if alias not in EXCEL_SESSIONS:
             return True
             
-        session = EXCEL_SESSIONS[alias]
+        session = EXCEL_SESSIONS.peek(alias)
         wb = session["wb"]
         path = session["path"]
         
+        if wb is None:
+            # Only read-only sessions are evicted: nothing to save or close
+            del EXCEL_SESSIONS[alias]
+            print(f"[CloseExcel] Closed session '{alias}'")
+            return True
+        
         try:
+            _wait_pending_save(session)
             if save and not session.get("read_only"):
+                error = _wait_path_save(path)
+                if error is not None:
+                    print(f"[CloseExcel] Background save of another session to {path} failed: {error}")
+                    return False
+                if async_save:
+                    # The worker closes the workbook once it is written. OpenExcel/SaveExcel on this path
+                    # join it first; wait_all_saves joins it at engine end and reports a failure.
+                    print(f"[CloseExcel] Saving {path} in background...")
+                    _start_background_save(alias, session, path, close_after=True)
+                    del EXCEL_SESSIONS[alias]
+                    print(f"[CloseExcel] Closed session '{alias}'")
+                    return True
                 print(f"[CloseExcel] Saving {path}...")
                 wb.save(path)
             
@@ -373,3 +846,217 @@ class CloseExcelAction(ActionBase):
         except Exception as e:
             print(f"[CloseExcel] Error: {e}")
             return False
+
+
+def _rows_from_values(values, source: str = "", source_column: str = "") -> List[Dict[str, Any]]:
+    """Turns an iterator of row tuples (first row = header) into dicts, like ReadExcel's Sheet mode."""
+    data = []
+    headers = None
+    for row in values:
+        if headers is None:
+            headers = list(row)
+            continue
+        if all(_is_empty_cell(v) for v in row):
+            # Formatting-only rows at the end of a sheet
+            continue
+        item = {}
+        for i, val in enumerate(row):
+            if i < len(headers) and headers[i] is not None:
+                item[str(headers[i])] = val
+        if source_column:
+            item[source_column] = source
+        data.append(item)
+    return data
+
+
+def _load_workbook_rows(path: str, sheet_name: str = "", engine: str = "openpyxl",
+                        source_column: str = "") -> Dict[str, Any]:
+    """
+    Parses one workbook into a list of row dicts. Runs inside worker processes, so it only
+    takes/returns picklable values and reports failures instead of raising.
+    """
+    try:
+        if engine == "pandas" and pd is not None:
+            df = pd.read_excel(path, sheet_name=sheet_name or 0, engine="openpyxl")
+            df = df.astype(object).where(df.notna(), None)
+            values = [tuple(df.columns)] + list(df.itertuples(index=False, name=None))
+            return {"path": path, "rows": _rows_from_values(values, path, source_column), "error": None}
+
+        wb = openpyxl.load_workbook(filename=path, read_only=True, data_only=True)
+        try:
+            if sheet_name:
+                if sheet_name not in wb.sheetnames:
+                    return {"path": path, "rows": [], "error": f"Sheet '{sheet_name}' not found."}
+                ws = wb[sheet_name]
+            else:
+                ws = wb.active
+            rows = _rows_from_values(ws.iter_rows(values_only=True), path, source_column)
+        finally:
+            wb.close()
+        return {"path": path, "rows": rows, "error": None}
+    except Exception as e:
+        return {"path": path, "rows": [], "error": f"{type(e).__name__}: {e}"}
+
+
+def iter_workbook_rows(paths: List[str], sheet_name: str = "", engine: str = "openpyxl",
+                       workers: int = 0, source_column: str = ""):
+    """
+    Yields one result dict {"path", "rows", "error"} per file, in input order.
+    Files are parsed in a process pool; a single file (or workers=1) is parsed inline.
+    At most workers * 2 files are parsed ahead of the consumer, so memory stays bounded
+    however many files there are; the next file is submitted as each result is taken.
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield _load_workbook_rows(path, sheet_name, engine, source_column)
+        return
+
+    window = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        next_index = 0
+        try:
+            while in_flight or next_index < len(paths):
+                while next_index < len(paths) and len(in_flight) < window:
+                    path = paths[next_index]
+                    in_flight.append((path, pool.submit(_load_workbook_rows, path, sheet_name, engine, source_column)))
+                    next_index += 1
+                path, future = in_flight.popleft()
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # e.g. BrokenProcessPool when a worker dies
+                    result = {"path": path, "rows": [], "error": f"{type(e).__name__}: {e}"}
+                yield result
+        finally:
+            # Consumer stopped early (break / failure): don't parse the remaining files
+            for _, future in in_flight:
+                future.cancel()
+
+
+class BatchReadExcelAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "批量读取 Excel"
+
+    @property
+    def description(self) -> str:
+        return "多进程并行读取多个 Excel 文件（通配符或路径列表），合并为一个行列表。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        engines = ["openpyxl"] + (["pandas"] if pd is not None else [])
+        return [
+            {"name": "paths", "label": "文件路径 (通配符/列表变量，多个用 ; 分隔)", "type": "string", "default": "C:\\data\\*.xlsx"},
+            {"name": "sheet_name", "label": "Sheet 名称 (空则当前)", "type": "string", "default": "", "advanced": True},
+            {"name": "engine", "label": "解析引擎", "type": "string", "default": "openpyxl", "options": engines, "advanced": True},
+            {"name": "workers", "label": "并行进程数 (0=CPU核数)", "type": "int", "default": 0, "advanced": True},
+            {"name": "source_column", "label": "来源文件列名 (空则不添加)", "type": "string", "default": "", "advanced": True},
+            {"name": "output_variable", "label": "保存到变量", "type": "string", "default": "excel_rows", "variable_type": "一般变量"},
+            {"name": "errors_variable", "label": "错误列表变量", "type": "string", "default": "excel_errors", "variable_type": "一般变量", "advanced": True},
+        ]
+
+    def _prepare(self, context: Dict[str, Any]):
+        paths = FileTools.resolve_paths(self.params.get("paths", ""), context)
+        sheet_name = self.params.get("sheet_name", "") or ""
+        engine = self.params.get("engine", "openpyxl")
+        try:
+            workers = int(self.params.get("workers", 0) or 0)
+        except (TypeError, ValueError):
+            workers = 0
+        source_column = self.params.get("source_column", "") or ""
+        return paths, iter_workbook_rows(paths, sheet_name, engine, workers, source_column)
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        output_var = self.params.get("output_variable", "excel_rows")
+        errors_var = self.params.get("errors_variable", "excel_errors")
+
+        paths, results = self._prepare(context)
+        if not paths:
+            print(f"[BatchReadExcel] No files matched '{self.params.get('paths')}'.")
+            context[output_var] = []
+            context[errors_var] = []
+            return True
+
+        print(f"[BatchReadExcel] Reading {len(paths)} files...")
+        rows, errors = [], []
+        for result in results:
+            if result["error"]:
+                print(f"[BatchReadExcel] Failed {result['path']}: {result['error']}")
+                errors.append({"path": result["path"], "error": result["error"]})
+                continue
+            rows.extend(result["rows"])
+
+        context[output_var] = rows
+        context[errors_var] = errors
+        print(f"[BatchReadExcel] Read {len(rows)} rows from {len(paths) - len(errors)} files, {len(errors)} failed.")
+        return True
+
+
+class BatchReadExcelLoopAction(BatchReadExcelAction):
+    @property
+    def name(self) -> str:
+        return "Excel 分块循环"
+
+    @property
+    def description(self) -> str:
+        return "多进程并行读取多个 Excel 文件，按块逐个执行循环体，无需一次性加载全部数据。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        schema = [p for p in super().get_param_schema() if p["name"] != "output_variable"]
+        return schema + [
+            {"name": "chunk_size", "label": "每块行数 (0=每个文件一块)", "type": "int", "default": 0},
+            {"name": "item_variable", "label": "当前块变量名", "type": "string", "default": "excel_chunk", "variable_type": "循环项", "is_variable": True},
+            {"name": "file_variable", "label": "当前文件变量名", "type": "string", "default": "excel_file", "variable_type": "循环项", "is_variable": True, "advanced": True},
+            {"name": "index_variable", "label": "索引变量名", "type": "string", "default": "loop_index", "variable_type": "循环变量", "is_variable": True, "advanced": True},
+        ]
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        children = self.params.get("children", [])
+        runner = context.get("__runner__")
+        if not runner:
+            return False
+
+        item_name = self.params.get("item_variable", "excel_chunk")
+        file_name = self.params.get("file_variable", "excel_file")
+        index_name = self.params.get("index_variable", "loop_index")
+        errors_var = self.params.get("errors_variable", "excel_errors")
+        try:
+            chunk_size = int(self.params.get("chunk_size", 0) or 0)
+        except (TypeError, ValueError):
+            chunk_size = 0
+
+        paths, results = self._prepare(context)
+        errors = []
+        context[errors_var] = errors
+        print(f"[ExcelChunkLoop] Streaming {len(paths)} files.")
+
+        index = 0
+        try:
+            for result in results:
+                if result["error"]:
+                    print(f"[ExcelChunkLoop] Failed {result['path']}: {result['error']}")
+                    errors.append({"path": result["path"], "error": result["error"]})
+                    continue
+                rows = result["rows"]
+                step = chunk_size if chunk_size > 0 else max(len(rows), 1)
+                for start in range(0, len(rows), step):
+                    context[item_name] = rows[start:start + step]
+                    context[file_name] = result["path"]
+                    context[index_name] = index
+                    index += 1
+                    try:
+                        if not runner(children, context):
+                            return False
+                    except ContinueLoopException:
+                        print(f"[ExcelChunkLoop] Continue triggered at chunk {index - 1}")
+                        continue
+        except BreakLoopException:
+            print(f"[ExcelChunkLoop] Break triggered at chunk {index - 1}")
+        finally:
+            results.close()
+
+        print(f"[ExcelChunkLoop] Processed {index} chunks, {len(errors)} files failed.")
+        return True
@@ -31,6 +31,10 @@ def _resolve_operand(val: Any, context: Dict[str, Any]) -> Any:
 def _evaluate_relation(left: Any, op: str, right: Any, context: Dict[str, Any]) -> bool:
     lv = _resolve_operand(left, context)
     rv = _resolve_operand(right, context)
+    return _apply_relation(lv, op, rv)
+
+
+def _apply_relation(lv: Any, op: str, rv: Any) -> bool:
     try:
         if op == "等于":
             return lv == rv
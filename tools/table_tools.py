@@ -0,0 +1,588 @@
+from typing import Dict, Any, List
+
+from core.action_base import ActionBase
+from tools.logic_tools import _resolve_operand, _apply_relation
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+RELATIONS = [
+    "等于", "不等于",
+    "大于", "大于等于",
+    "小于", "小于等于",
+    "包含", "不包含",
+    "等于True", "等于False",
+    "是空值", "不是空值",
+]
+
+AGG_FUNCS = ("sum", "mean", "min", "max", "count", "first", "last")
+
+
+def _resolve_list(context: Dict[str, Any], var_name: Any):
+    name = var_name
+    if isinstance(name, str) and name.startswith("{") and name.endswith("}"):
+        name = name[1:-1]
+    data = context.get(name)
+    if not isinstance(data, list):
+        return None
+    return data
+
+
+def _split_columns(raw: Any) -> List[str]:
+    if isinstance(raw, (list, tuple)):
+        return [str(c).strip() for c in raw if str(c).strip()]
+    if not isinstance(raw, str):
+        return []
+    return [c.strip() for c in raw.replace("，", ",").split(",") if c.strip()]
+
+
+def _cell(row: Any, column: str) -> Any:
+    if isinstance(row, dict):
+        return row.get(column)
+    return None
+
+
+def _to_python(value: Any) -> Any:
+    """Converts numpy scalars / NaN produced by pandas back to plain Python values."""
+    if value is None:
+        return None
+    if hasattr(value, "item") and not isinstance(value, (list, dict, str, bytes)):
+        try:
+            value = value.item()
+        except Exception:
+            pass
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _hashable(value: Any) -> Any:
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+# ---------------------------------------------------------------------------
+# Filter
+# ---------------------------------------------------------------------------
+
+def _vectorized_mask(values: List[Any], op: str, rv: Any):
+    """
+    Evaluates a relation over a whole column with pandas.
+    Returns None when the column/operand combination cannot be vectorized with
+    the same semantics as _apply_relation, so the caller falls back to per-row evaluation.
+    """
+    if pd is None or not values:
+        return None
+    try:
+        s = pd.Series(values)
+        is_numeric = pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s)
+        is_text = (not is_numeric) and pd.api.types.is_string_dtype(s) and all(
+            v is None or isinstance(v, str) for v in values
+        )
+        if not is_numeric and not is_text:
+            return None
+
+        null = s.isna()
+        if op in ("是空值", "不是空值"):
+            empty = null | (s == "") if is_text else null
+            return (empty if op == "是空值" else ~empty).to_numpy(dtype=bool)
+        if op in ("等于True", "等于False"):
+            truthy = (s.fillna("") != "") if is_text else (s.fillna(0) != 0)
+            return (truthy if op == "等于True" else ~truthy).to_numpy(dtype=bool)
+        if rv is None:
+            return None
+
+        if op in ("等于", "不等于"):
+            eq = (s == rv) & ~null
+            return (eq if op == "等于" else ~eq).to_numpy(dtype=bool)
+
+        if op in ("大于", "大于等于", "小于", "小于等于"):
+            if is_numeric and not _is_number(rv):
+                return None
+            if is_text and not isinstance(rv, str):
+                return None
+            if op == "大于":
+                result = s > rv
+            elif op == "大于等于":
+                result = s >= rv
+            elif op == "小于":
+                result = s < rv
+            else:
+                result = s <= rv
+            return (result & ~null).to_numpy(dtype=bool)
+
+        if op in ("包含", "不包含") and is_text:
+            needle = str(rv)
+            # _apply_relation falls back to str(lv) for None, i.e. "None"
+            # Set missing cells explicitly: with the pandas 3 string dtype str.contains
+            # already yields False for them, so fillna would not apply na_hit
+            na_hit = needle in "None"
+            hit = s.str.contains(needle, regex=False).fillna(False).astype(bool)
+            hit = hit.mask(null, na_hit)
+            return (hit if op == "包含" else ~hit).to_numpy(dtype=bool)
+    except Exception:
+        return None
+    return None
+
+
+def filter_rows(rows: List[Any], column: str, op: str, rv: Any) -> List[Any]:
+    values = [_cell(row, column) for row in rows]
+    mask = _vectorized_mask(values, op, rv)
+    if mask is None:
+        mask = [_apply_relation(v, op, rv) for v in values]
+    return [row for row, keep in zip(rows, mask) if keep]
+
+
+# ---------------------------------------------------------------------------
+# Sort
+# ---------------------------------------------------------------------------
+
+def _python_sort(rows: List[Any], columns: List[str], ascending: bool) -> List[Any]:
+    result = list(rows)
+    # Stable multi-key sort: sort by the least significant key first
+    for column in reversed(columns):
+        present = [r for r in result if _cell(r, column) is not None]
+        missing = [r for r in result if _cell(r, column) is None]
+        try:
+            present.sort(key=lambda r: _cell(r, column), reverse=not ascending)
+        except TypeError:
+            present.sort(key=lambda r: str(_cell(r, column)), reverse=not ascending)
+        result = present + missing
+    return result
+
+
+def sort_rows(rows: List[Any], columns: List[str], ascending: bool = True) -> List[Any]:
+    if not rows or not columns:
+        return list(rows)
+    if pd is not None:
+        try:
+            frame = pd.DataFrame({c: [_cell(r, c) for r in rows] for c in columns})
+            ordered = frame.sort_values(by=columns, ascending=ascending, na_position="last", kind="mergesort")
+            return [rows[i] for i in ordered.index.tolist()]
+        except Exception:
+            pass
+    return _python_sort(rows, columns, ascending)
+
+
+# ---------------------------------------------------------------------------
+# Dedupe
+# ---------------------------------------------------------------------------
+
+def dedupe_rows(rows: List[Any], columns: List[str], keep: str = "first") -> List[Any]:
+    if not rows:
+        return []
+    if not columns:
+        seen_cols: Dict[str, None] = {}
+        for r in rows:
+            if isinstance(r, dict):
+                for k in r.keys():
+                    seen_cols.setdefault(k, None)
+        columns = list(seen_cols.keys())
+    keep = "last" if keep == "last" else "first"
+
+    if pd is not None and columns:
+        try:
+            frame = pd.DataFrame({c: [_cell(r, c) for r in rows] for c in columns})
+            dup = frame.duplicated(subset=columns, keep=keep).to_numpy(dtype=bool)
+            return [row for row, is_dup in zip(rows, dup) if not is_dup]
+        except Exception:
+            pass
+
+    keys = [tuple(_hashable(_cell(r, c)) for c in columns) for r in rows]
+    order = range(len(rows)) if keep == "first" else range(len(rows) - 1, -1, -1)
+    seen = set()
+    kept = []
+    for i in order:
+        if keys[i] in seen:
+            continue
+        seen.add(keys[i])
+        kept.append(i)
+    kept.sort()
+    return [rows[i] for i in kept]
+
+
+# ---------------------------------------------------------------------------
+# Group by
+# ---------------------------------------------------------------------------
+
+def parse_aggregates(raw: Any) -> List[tuple]:
+    """
+    Parses "金额:sum, 数量:mean, *:count" into [(column, func, output_name), ...].
+    """
+    specs = []
+    if isinstance(raw, dict):
+        items = [f"{k}:{v}" for k, v in raw.items()]
+    else:
+        items = _split_columns(raw)
+    for item in items:
+        if ":" not in item:
+            column, func = item, "count"
+        else:
+            column, func = item.rsplit(":", 1)
+        column = column.strip() or "*"
+        func = func.strip().lower()
+        if func not in AGG_FUNCS:
+            raise ValueError(f"不支持的聚合函数: {func}")
+        output = "count" if column == "*" else f"{column}_{func}"
+        specs.append((column, func, output))
+    return specs
+
+
+def _aggregate_python(values: List[Any], func: str) -> Any:
+    if func == "first":
+        return values[0] if values else None
+    if func == "last":
+        return values[-1] if values else None
+    present = [v for v in values if v is not None]
+    if func == "count":
+        return len(present)
+    if func == "sum":
+        return sum(present) if present else 0
+    if func == "mean":
+        return sum(present) / len(present) if present else None
+    if func == "min":
+        return min(present) if present else None
+    if func == "max":
+        return max(present) if present else None
+    return None
+
+
+def group_rows(rows: List[Any], keys: List[str], aggregates: List[tuple]) -> List[Dict[str, Any]]:
+    if not rows:
+        return []
+
+    # Group membership (first-appearance order)
+    group_index: Dict[tuple, int] = {}
+    group_keys: List[tuple] = []
+    labels: List[int] = []
+    for r in rows:
+        key = tuple(_hashable(_cell(r, k)) for k in keys)
+        idx = group_index.get(key)
+        if idx is None:
+            idx = len(group_keys)
+            group_index[key] = idx
+            group_keys.append(tuple(_cell(r, k) for k in keys))
+        labels.append(idx)
+
+    results: List[Dict[str, Any]] = [dict(zip(keys, gk)) for gk in group_keys]
+    for column, func, output in aggregates:
+        if column == "*":
+            counts = [0] * len(group_keys)
+            for label in labels:
+                counts[label] += 1
+            for res, c in zip(results, counts):
+                res[output] = c
+            continue
+
+        values = [_cell(r, column) for r in rows]
+        aggregated = None
+        if pd is not None and func in ("sum", "mean", "min", "max", "count"):
+            try:
+                series = pd.Series(values)
+                if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+                    grouped = series.groupby(pd.Series(labels)).agg(func)
+                    aggregated = [_to_python(v) for v in grouped.reindex(range(len(group_keys))).tolist()]
+                    if func == "sum":
+                        aggregated = [0 if v is None else v for v in aggregated]
+                    # None forces an int column to float64; restore ints for sum/min/max
+                    if func in ("sum", "min", "max") and all(isinstance(v, int) for v in values if v is not None):
+                        aggregated = [int(v) if isinstance(v, float) and v.is_integer() else v for v in aggregated]
+            except Exception:
+                aggregated = None
+        if aggregated is None:
+            buckets: List[List[Any]] = [[] for _ in group_keys]
+            for label, v in zip(labels, values):
+                buckets[label].append(v)
+            aggregated = [_aggregate_python(b, func) for b in buckets]
+        for res, v in zip(results, aggregated):
+            res[output] = v
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Join
+# ---------------------------------------------------------------------------
+
+def _join_pairs(left: List[Any], right: List[Any], left_on: List[str], right_on: List[str], how: str):
+    """Returns (left_index | None, right_index | None) pairs in pandas merge order."""
+    if pd is not None:
+        try:
+            lf = pd.DataFrame({f"k{i}": [_hashable(_cell(r, c)) for r in left] for i, c in enumerate(left_on)})
+            rf = pd.DataFrame({f"k{i}": [_hashable(_cell(r, c)) for r in right] for i, c in enumerate(right_on)})
+            lf["__li"] = range(len(left))
+            rf["__ri"] = range(len(right))
+            on = [f"k{i}" for i in range(len(left_on))]
+            merged = lf.merge(rf, on=on, how=how, sort=False)
+            li = merged["__li"].tolist()
+            ri = merged["__ri"].tolist()
+            return [(_to_python(a), _to_python(b)) for a, b in zip(li, ri)]
+        except Exception:
+            pass
+
+    if how == "right":
+        return [(i, j) for j, i in _join_pairs(right, left, right_on, left_on, "left")]
+
+    index: Dict[tuple, List[int]] = {}
+    for j, r in enumerate(right):
+        index.setdefault(tuple(_hashable(_cell(r, c)) for c in right_on), []).append(j)
+    pairs = []
+    matched_right = set()
+    for i, r in enumerate(left):
+        hits = index.get(tuple(_hashable(_cell(r, c)) for c in left_on), [])
+        for j in hits:
+            pairs.append((i, j))
+            matched_right.add(j)
+        if not hits and how in ("left", "outer"):
+            pairs.append((i, None))
+    if how == "outer":
+        pairs.extend((None, j) for j in range(len(right)) if j not in matched_right)
+    return pairs
+
+
+def join_rows(left: List[Any], right: List[Any], left_on: List[str], right_on: List[str],
+              how: str = "inner", suffix: str = "_right") -> List[Dict[str, Any]]:
+    if how not in ("inner", "left", "right", "outer"):
+        raise ValueError(f"不支持的关联方式: {how}")
+    shared = set(zip(left_on, right_on))
+    result = []
+    for li, ri in _join_pairs(left, right, left_on, right_on, how):
+        lrow = left[int(li)] if li is not None else {}
+        rrow = right[int(ri)] if ri is not None else {}
+        merged = dict(lrow) if isinstance(lrow, dict) else {}
+        if isinstance(rrow, dict):
+            for k, v in rrow.items():
+                if (k, k) in shared:
+                    if k not in merged or merged[k] is None:
+                        merged[k] = v
+                    continue
+                merged[f"{k}{suffix}" if k in merged else k] = v
+        result.append(merged)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Actions
+# ---------------------------------------------------------------------------
+
+class TableFilterAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "表格筛选"
+
+    @property
+    def description(self) -> str:
+        return "按条件一次性筛选表格数据（字典列表）的所有行。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "list_variable", "type": "str", "label": "表格数据变量", "default": "excel_data", "variable_type": "一般变量", "is_variable": True},
+            {"name": "column", "type": "str", "label": "列名", "default": ""},
+            {"name": "relation", "type": "str", "label": "关系", "default": "等于", "options": RELATIONS},
+            {
+                "name": "value",
+                "type": "str",
+                "label": "比较值",
+                "default": "",
+                "variable_type": "一般变量",
+                "is_variable": True,
+                "enable_if": {"relation": RELATIONS[:8]}
+            },
+            {"name": "output_variable", "type": "str", "label": "保存到变量", "default": "filtered_data", "variable_type": "一般变量", "is_variable": True},
+        ]
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        var_name = self.params.get("list_variable", "")
+        column = self.params.get("column", "")
+        relation = self.params.get("relation", "等于")
+        output_var = self.params.get("output_variable", "filtered_data")
+
+        rows = _resolve_list(context, var_name)
+        if rows is None:
+            print(f"[Table] Variable '{var_name}' is not a list or not found.")
+            return False
+        try:
+            if isinstance(column, str):
+                column = column.format(**context)
+        except Exception:
+            pass
+
+        rv = _resolve_operand(self.params.get("value", ""), context)
+        try:
+            result = filter_rows(rows, column, relation, rv)
+        except Exception as e:
+            print(f"[Table] Filter error: {e}")
+            return False
+        context[output_var] = result
+        print(f"[Table] Filter '{column} {relation} {rv}': {len(rows)} -> {len(result)} rows.")
+        return True
+
+
+class TableSortAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "表格排序"
+
+    @property
+    def description(self) -> str:
+        return "按一列或多列对表格数据（字典列表）排序，空值排在最后。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "list_variable", "type": "str", "label": "表格数据变量", "default": "excel_data", "variable_type": "一般变量", "is_variable": True},
+            {"name": "columns", "type": "str", "label": "排序列(逗号分隔)", "default": ""},
+            {"name": "order", "type": "str", "label": "排序方式", "default": "升序", "options": ["升序", "降序"]},
+            {"name": "output_variable", "type": "str", "label": "保存到变量", "default": "sorted_data", "variable_type": "一般变量", "is_variable": True},
+        ]
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        var_name = self.params.get("list_variable", "")
+        columns = _split_columns(self.params.get("columns", ""))
+        ascending = self.params.get("order", "升序") != "降序"
+        output_var = self.params.get("output_variable", "sorted_data")
+
+        rows = _resolve_list(context, var_name)
+        if rows is None:
+            print(f"[Table] Variable '{var_name}' is not a list or not found.")
+            return False
+        if not columns:
+            print("[Table] Sort columns are required.")
+            return False
+        try:
+            result = sort_rows(rows, columns, ascending)
+        except Exception as e:
+            print(f"[Table] Sort error: {e}")
+            return False
+        context[output_var] = result
+        print(f"[Table] Sorted {len(result)} rows by {columns} ({'asc' if ascending else 'desc'}).")
+        return True
+
+
+class TableDedupeAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "表格去重"
+
+    @property
+    def description(self) -> str:
+        return "按指定列（空则全部列）去除表格数据中的重复行。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "list_variable", "type": "str", "label": "表格数据变量", "default": "excel_data", "variable_type": "一般变量", "is_variable": True},
+            {"name": "columns", "type": "str", "label": "判重列(逗号分隔, 空则全部)", "default": ""},
+            {"name": "keep", "type": "str", "label": "保留", "default": "first", "options": ["first", "last"], "advanced": True},
+            {"name": "output_variable", "type": "str", "label": "保存到变量", "default": "deduped_data", "variable_type": "一般变量", "is_variable": True},
+        ]
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        var_name = self.params.get("list_variable", "")
+        columns = _split_columns(self.params.get("columns", ""))
+        keep = self.params.get("keep", "first")
+        output_var = self.params.get("output_variable", "deduped_data")
+
+        rows = _resolve_list(context, var_name)
+        if rows is None:
+            print(f"[Table] Variable '{var_name}' is not a list or not found.")
+            return False
+        try:
+            result = dedupe_rows(rows, columns, keep)
+        except Exception as e:
+            print(f"[Table] Dedupe error: {e}")
+            return False
+        context[output_var] = result
+        print(f"[Table] Dedupe: {len(rows)} -> {len(result)} rows.")
+        return True
+
+
+class TableGroupAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "表格分组汇总"
+
+    @property
+    def description(self) -> str:
+        return "按列分组并计算汇总值（sum/mean/min/max/count/first/last）。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "list_variable", "type": "str", "label": "表格数据变量", "default": "excel_data", "variable_type": "一般变量", "is_variable": True},
+            {"name": "group_by", "type": "str", "label": "分组列(逗号分隔)", "default": ""},
+            {"name": "aggregates", "type": "str", "label": "汇总(列:函数, 如 金额:sum, *:count)", "default": "*:count"},
+            {"name": "output_variable", "type": "str", "label": "保存到变量", "default": "grouped_data", "variable_type": "一般变量", "is_variable": True},
+        ]
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        var_name = self.params.get("list_variable", "")
+        keys = _split_columns(self.params.get("group_by", ""))
+        output_var = self.params.get("output_variable", "grouped_data")
+
+        rows = _resolve_list(context, var_name)
+        if rows is None:
+            print(f"[Table] Variable '{var_name}' is not a list or not found.")
+            return False
+        try:
+            aggregates = parse_aggregates(self.params.get("aggregates", "*:count"))
+            result = group_rows(rows, keys, aggregates)
+        except Exception as e:
+            print(f"[Table] Group error: {e}")
+            return False
+        context[output_var] = result
+        print(f"[Table] Grouped {len(rows)} rows by {keys} into {len(result)} groups.")
+        return True
+
+
+class TableJoinAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "表格关联"
+
+    @property
+    def description(self) -> str:
+        return "按关联列合并两个表格数据（inner/left/right/outer）。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "left_variable", "type": "str", "label": "左表变量", "default": "", "variable_type": "一般变量", "is_variable": True},
+            {"name": "right_variable", "type": "str", "label": "右表变量", "default": "", "variable_type": "一般变量", "is_variable": True},
+            {"name": "left_on", "type": "str", "label": "左表关联列(逗号分隔)", "default": ""},
+            {"name": "right_on", "type": "str", "label": "右表关联列(空则同左表)", "default": ""},
+            {"name": "how", "type": "str", "label": "关联方式", "default": "inner", "options": ["inner", "left", "right", "outer"]},
+            {"name": "suffix", "type": "str", "label": "右表重名列后缀", "default": "_right", "advanced": True},
+            {"name": "output_variable", "type": "str", "label": "保存到变量", "default": "joined_data", "variable_type": "一般变量", "is_variable": True},
+        ]
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        left_var = self.params.get("left_variable", "")
+        right_var = self.params.get("right_variable", "")
+        left_on = _split_columns(self.params.get("left_on", ""))
+        right_on = _split_columns(self.params.get("right_on", "")) or left_on
+        how = self.params.get("how", "inner")
+        suffix = self.params.get("suffix", "_right") or "_right"
+        output_var = self.params.get("output_variable", "joined_data")
+
+        left = _resolve_list(context, left_var)
+        right = _resolve_list(context, right_var)
+        if left is None or right is None:
+            print(f"[Table] Join inputs '{left_var}' / '{right_var}' must both be lists.")
+            return False
+        if not left_on or len(left_on) != len(right_on):
+            print("[Table] Join columns are required and must have the same count on both sides.")
+            return False
+        try:
+            result = join_rows(left, right, left_on, right_on, how, suffix)
+        except Exception as e:
+            print(f"[Table] Join error: {e}")
+            return False
+        context[output_var] = result
+        print(f"[Table] Join ({how}): {len(left)} x {len(right)} -> {len(result)} rows.")
+        return True
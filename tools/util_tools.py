@@ -1,12 +1,11 @@
 import os
 import re
 from typing import Dict, Any, List
-from PIL import Image
 
 from core.action_base import ActionBase
+from core.run_metrics import get_metrics
 from utils.file_tools import FileTools
 from utils.img_ocr import ImgOcr
-from utils.img_tools import ImgTools
 from utils.notice import WeChatNotification
 
 class WaitForFileAndCopyAction(ActionBase):
@@ -21,7 +20,10 @@ class WaitForFileAndCopyAction(ActionBase):
     def get_param_schema(self) -> List[Dict[str, Any]]:
         return [
             {"name": "source_dir", "label": "Source Directory (Watch)", "type": "string", "ui_options": {"browse_type": "directory"}},
-            {"name": "dest_path", "label": "Destination File Path", "type": "string", "ui_options": {"browse_type": "file_save"}}
+            {"name": "dest_path", "label": "Destination File Path", "type": "string", "ui_options": {"browse_type": "file_save"}},
+            {"name": "file_count", "label": "File Count (>1: destination is a directory)", "type": "int", "default": 1, "advanced": True},
+            {"name": "timeout", "label": "Timeout (s)", "type": "int", "default": 60, "advanced": True},
+            {"name": "stable_seconds", "label": "Size Stable For (s)", "type": "float", "default": 1.0, "advanced": True}
         ]
     
     def execute(self, context: Dict[str, Any]) -> bool:
@@ -29,7 +31,18 @@ class WaitForFileAndCopyAction(ActionBase):
         dst = self.params.get("dest_path")
         if not src or not dst:
             return False
-        return FileTools.copy_file(src, dst)
+        try:
+            src = src.format(**context)
+            dst = dst.format(**context)
+        except Exception:
+            pass
+        try:
+            count = max(1, int(self.params.get("file_count", 1) or 1))
+            timeout = float(self.params.get("timeout", 60) or 60)
+            stable_seconds = float(self.params.get("stable_seconds", 1.0))
+        except (TypeError, ValueError):
+            count, timeout, stable_seconds = 1, 60, 1.0
+        return FileTools.copy_file(src, dst, timeout=timeout, count=count, stable_seconds=stable_seconds)
 
 class ClearDirectoryAction(ActionBase):
     @property
@@ -53,6 +66,65 @@ class ClearDirectoryAction(ActionBase):
         return True
 
 
+class BulkCopyFilesAction(ActionBase):
+    move = False
+
+    @property
+    def name(self) -> str:
+        return "批量复制文件"
+    
+    @property
+    def description(self) -> str:
+        return "并行复制多个文件（通配符或路径列表）到目标目录，大文件使用零拷贝/reflink，可选硬链接。"
+    
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        schema = [
+            {"name": "sources", "label": "源文件 (通配符/列表变量，多个用 ; 分隔)", "type": "string", "default": ""},
+            {"name": "dest_dir", "label": "目标目录", "type": "string", "default": "", "ui_options": {"browse_type": "directory"}},
+            {"name": "overwrite", "label": "覆盖已存在文件", "type": "bool", "default": True},
+            {"name": "workers", "label": "并行数", "type": "int", "default": 4, "advanced": True},
+            {"name": "output_variable", "label": "保存结果路径到变量", "type": "string", "default": "", "variable_type": "一般变量", "advanced": True}
+        ]
+        if not self.move:
+            schema.insert(3, {"name": "link_mode", "label": "复制方式", "type": "string", "default": "auto", "options": ["auto", "hardlink", "copy"], "advanced": True})
+        return schema
+    
+    def execute(self, context: Dict[str, Any]) -> bool:
+        dest_dir = self.params.get("dest_dir", "")
+        output_var = self.params.get("output_variable", "")
+        try:
+            dest_dir = dest_dir.format(**context)
+        except Exception:
+            pass
+        sources = FileTools.resolve_paths(self.params.get("sources", ""), context)
+        if not dest_dir:
+            print("[File] 未指定目标目录")
+            return False
+        try:
+            workers = int(self.params.get("workers", 4) or 4)
+        except (TypeError, ValueError):
+            workers = 4
+        
+        result = FileTools.bulk_transfer(sources, dest_dir, move=self.move,
+                                         link_mode=self.params.get("link_mode", "auto"),
+                                         overwrite=bool(self.params.get("overwrite", True)), workers=workers)
+        if output_var:
+            context[output_var] = result["done"]
+        return not result["errors"]
+
+
+class BulkMoveFilesAction(BulkCopyFilesAction):
+    move = True
+
+    @property
+    def name(self) -> str:
+        return "批量移动文件"
+    
+    @property
+    def description(self) -> str:
+        return "并行移动多个文件到目标目录，同一磁盘直接重命名，跨磁盘零拷贝复制后删除源文件。"
+
+
 class PathExistsAction(ActionBase):
     @property
     def name(self) -> str:
@@ -80,6 +152,21 @@ class PathExistsAction(ActionBase):
         context[output_var] = exists
         return True
 
+def _is_base64_source(source: str) -> bool:
+    # 判断是否为 Base64 (包含 data URI 前缀或长度较长且不包含路径分隔符)
+    return "base64," in source or (len(source) > 200 and not os.path.exists(source))
+
+
+def _record_cache_metrics(context: Dict[str, Any], results: List[Dict[str, Any]], use_cache: bool) -> None:
+    if not use_cache or ImgOcr.shared().cache is None:
+        return
+    metrics = get_metrics(context)
+    for result in results:
+        if result.get("error"):
+            continue
+        metrics.incr("ocr_cache_hits" if result.get("cached") else "ocr_cache_misses")
+
+
 class OCRImageAction(ActionBase):
     @property
     def name(self) -> str:
@@ -93,6 +180,7 @@ class OCRImageAction(ActionBase):
         return [
             {"name": "image_path", "label": "图片路径 (可选)", "type": "string", "default": "", "ui_options": {"browse_type": "file"}},
             {"name": "base64_str", "label": "Base64 字符串 (可选)", "type": "string", "default": ""},
+            {"name": "use_cache", "label": "使用识别缓存", "type": "bool", "default": True, "advanced": True},
             {"name": "output_variable", "label": "保存到变量", "type": "string", "default": "ocr_text", "variable_type": "一般变量"}
         ]
     
@@ -118,12 +206,11 @@ class OCRImageAction(ActionBase):
                 print("[OCR] 未提供图片路径或 Base64 字符串")
                 return False
 
-            # 判断是否为 Base64 (包含 data URI 前缀或长度较长且不包含路径分隔符)
-            is_base64 = "base64," in source or (len(source) > 200 and not os.path.exists(source))
-            
-            if is_base64:
-                img = ImgTools.base64_to_png(source)
-                if not img:
+            # 直接传原始字节/路径，PNG/JPEG 无需解码再编码
+            if _is_base64_source(source):
+                try:
+                    img = ImgOcr.decode_base64(source)
+                except ValueError:
                     msg = f"[OCR] Base64 转换图片失败: {source}"
                     if len(msg) > 100: msg = msg[:100] + "...(数据过长已截断)"
                     print(msg)
@@ -132,11 +219,14 @@ class OCRImageAction(ActionBase):
                 if not os.path.exists(source):
                     print(f"[OCR] 图片文件不存在: {source}")
                     return False
-                img = Image.open(source)
+                img = source
                 
-            # 调用 img_ocr 中的 recognize
-            ocr = ImgOcr()
-            text = ocr.recognize(img)
+            # 调用 img_ocr 中的 recognize（复用共享模型，避免每次重新加载）
+            ocr = ImgOcr.shared()
+            use_cache = bool(self.params.get("use_cache", True))
+            result = ocr.recognize_with_info(img, use_cache=use_cache)
+            text = result["text"]
+            _record_cache_metrics(context, [result], use_cache)
             
             # 最终输出验证码字符串
             context[output_var] = text
@@ -155,6 +245,74 @@ class OCRImageAction(ActionBase):
             print(error_msg)
             return False
 
+class BatchOCRAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "批量 OCR 识别"
+    
+    @property
+    def description(self) -> str:
+        return "并发识别列表中的多张图片（本地路径或 Base64 字符串），结果按原顺序保存为列表。"
+    
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "list_variable", "label": "图片列表变量", "type": "string", "default": "image_list", "variable_type": "一般变量", "is_variable": True},
+            {"name": "max_workers", "label": "最大并发数", "type": "int", "default": 4, "advanced": True},
+            {"name": "use_cache", "label": "使用识别缓存", "type": "bool", "default": True, "advanced": True},
+            {"name": "output_variable", "label": "保存到变量", "type": "string", "default": "ocr_texts", "variable_type": "一般变量"},
+            {"name": "errors_variable", "label": "错误列表变量", "type": "string", "default": "ocr_errors", "variable_type": "一般变量", "advanced": True}
+        ]
+    
+    def execute(self, context: Dict[str, Any]) -> bool:
+        var_name = self.params.get("list_variable", "image_list")
+        output_var = self.params.get("output_variable", "ocr_texts")
+        errors_var = self.params.get("errors_variable", "ocr_errors")
+        try:
+            max_workers = int(self.params.get("max_workers", 4) or 4)
+        except (TypeError, ValueError):
+            max_workers = 4
+        
+        if isinstance(var_name, str) and var_name.startswith("{") and var_name.endswith("}"):
+            var_name = var_name[1:-1]
+        sources = context.get(var_name)
+        if not isinstance(sources, list):
+            print(f"[OCR] 变量 '{var_name}' 不是列表或不存在")
+            return False
+        
+        items = []
+        for source in sources:
+            if isinstance(source, str) and _is_base64_source(source):
+                try:
+                    items.append(ImgOcr.decode_base64(source))
+                except ValueError:
+                    items.append(None)
+            else:
+                items.append(source)
+        
+        try:
+            ocr = ImgOcr.shared()
+        except Exception as e:
+            print(f"[OCR] 识别出错: {e}")
+            return False
+        
+        valid = [(i, item) for i, item in enumerate(items) if item is not None]
+        use_cache = bool(self.params.get("use_cache", True))
+        results = ocr.recognize_batch([item for _, item in valid], max_workers=max_workers, use_cache=use_cache)
+        _record_cache_metrics(context, results, use_cache)
+        
+        texts: List[Any] = [None] * len(items)
+        errors = [{"index": i, "error": "Base64 转换图片失败"} for i, item in enumerate(items) if item is None]
+        for (i, _), result in zip(valid, results):
+            texts[i] = result["text"]
+            if result["error"]:
+                errors.append({"index": i, "error": result["error"]})
+        errors.sort(key=lambda e: e["index"])
+        
+        context[output_var] = texts
+        context[errors_var] = errors
+        print(f"[OCR] 批量识别完成: 共 {len(items)} 张, 失败 {len(errors)} 张")
+        return True
+
 class WeChatNotifyAction(ActionBase):
     @property
     def name(self) -> str:
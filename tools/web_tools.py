@@ -1,3 +1,4 @@
+import functools
 import json
 from typing import Dict, Any, List
 from core.action_base import ActionBase
@@ -11,11 +12,12 @@ from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException
 import sys
 import os
 import shutil
+import time
 
 # Add project root to path to import web.py
 sys.path.append(os.getcwd())
@@ -25,6 +27,20 @@ try:
 except ImportError:
     browser_config = None
 
+from core.run_metrics import get_metrics
+from tools.util_tools import _record_cache_metrics
+from utils.img_ocr import ImgOcr
+from utils.page_wait import PageWait
+from utils.tab_pool import TabPool, switch_window
+from utils.session_snapshot import SessionSnapshot
+from utils.profile_manager import ProfileManager
+from utils.driver_instrument import DriverInstrument
+from utils.element_cache import ElementCache
+from utils.frame_path import FramePath
+from utils.adaptive_wait import AdaptiveWait, WAIT_POLICIES
+from core.engine import register_shutdown_hook
+from core.flow_control import BreakLoopException, ContinueLoopException
+
 try:
     from utils.web import Web
 except ImportError:
@@ -34,6 +50,14 @@ except ImportError:
         pass
 
 
+def _release_run_profiles(context: Dict[str, Any]) -> None:
+    """流程结束时删除本次运行克隆、且浏览器已关闭的用户数据目录"""
+    ProfileManager.release_run(id(context))
+
+
+register_shutdown_hook(_release_run_profiles)
+
+
 def _map_by(by: str):
     s = (by or "").strip().lower()
     mapping = {
@@ -52,39 +76,102 @@ def _map_by(by: str):
     return mapping.get(s, By.XPATH)
 
 
-def _resolve_locator_from_element_library(context: Dict[str, Any], element_key: str):
+def _lookup_element_library(context: Dict[str, Any], element_key: str):
+    """
+    从元素库查找元素，不切换 frame
+    :return: (定位, 所在 iframe 路径)，未记录路径时路径为 None；元素不存在时返回 None
+    """
     try:
         if isinstance(element_key, str):
             element_key = element_key.format(**context)
     except Exception:
         pass
 
-    # 1. Try private manager from context
-    private_mgr = context.get("element_manager_private")
-    if private_mgr:
-        locator = private_mgr.get_locator(element_key)
-        if locator:
-            return locator
-
-    # 2. Try global manager from context
-    global_mgr = context.get("element_manager_global")
-    if global_mgr:
-        locator = global_mgr.get_locator(element_key)
-        if locator:
-            return locator
-
-    # 3. Fallback to default ElementManager (legacy)
+    managers = [context.get("element_manager_private"), context.get("element_manager_global")]
     try:
+        # Fallback to default ElementManager (legacy)
         from core.element_manager import ElementManager
-        mgr = ElementManager()
-        locator = mgr.get_locator(element_key)
-        if locator:
-            return locator
+        managers.append(ElementManager())
     except Exception:
         pass
 
+    for mgr in managers:
+        if not mgr:
+            continue
+        locator = mgr.get_locator(element_key)
+        if locator:
+            return locator, (mgr.get_frames(element_key) if hasattr(mgr, "get_frames") else None)
     return None
 
+
+def _resolve_locator_from_element_library(context: Dict[str, Any], element_key: str, driver=None, timeout: float = 20):
+    """
+    从元素库解析定位
+    给出 driver 且元素记录了所在 iframe 路径（frames）时，先切换到该路径（已在该路径时不发送命令）；
+    未记录 frames 的元素保持当前 frame 不变
+    """
+    found = _lookup_element_library(context, element_key)
+    if not found:
+        return None
+    locator, frames = found
+    if driver is not None and frames is not None:
+        try:
+            FramePath.enter(driver, frames, timeout=timeout)
+        except Exception as e:
+            print(f"[WEB]: Failed to enter frame path {frames} for element '{element_key}': {e}")
+            return None
+    return locator
+
+WAIT_POLICY_PARAM = {"name": "wait_policy", "type": "str", "label": "等待轮询策略", "default": "默认",
+                     "options": ["默认"] + list(WAIT_POLICIES), "advanced": True}
+
+
+def _with_wait_policy(action_cls):
+    """
+    为等待元素的动作增加“等待轮询策略”高级参数，执行期间该动作内的所有等待使用此策略
+    “默认”沿用全局策略（环境变量 WEB_WAIT_POLICY，未设置时为自适应）
+    """
+    execute = action_cls.execute
+    get_param_schema = action_cls.get_param_schema
+
+    @functools.wraps(execute)
+    def _execute(self, context: Dict[str, Any]) -> bool:
+        with AdaptiveWait.policy_scope(self.params.get("wait_policy")):
+            return execute(self, context)
+
+    @functools.wraps(get_param_schema)
+    def _get_param_schema(self) -> List[Dict[str, Any]]:
+        return get_param_schema(self) + [dict(WAIT_POLICY_PARAM)]
+
+    action_cls.execute = _execute
+    action_cls.get_param_schema = _get_param_schema
+    return action_cls
+
+
+def _find_element_cached(context: Dict[str, Any], driver, locator: tuple, timeout: int,
+                         condition: str = "visible", refresh: bool = False):
+    """
+    等待并返回元素；同一定位在 DOM 未变化时直接复用上次找到的元素（见 ElementCache）
+    :param condition: present / visible / clickable
+    :param refresh: 元素已失效（StaleElementReferenceException）时忽略缓存重新查找
+    """
+    def _finder():
+        if 'Web' in globals():
+            if condition == "clickable":
+                return Web.wait_element_clickable(driver, locator, timeout)
+            if condition == "visible":
+                return Web.wait_element_visible(driver, locator, timeout)
+            return Web.wait_element_located(driver, locator, timeout)
+        expected = {"clickable": EC.element_to_be_clickable, "visible": EC.visibility_of_element_located}
+        return AdaptiveWait(driver, timeout).until(expected.get(condition, EC.presence_of_element_located)(locator))
+
+    cache = ElementCache.for_driver(driver)
+    hits = cache.hits
+    element = cache.find(driver, locator, _finder, condition=condition, refresh=refresh)
+    get_metrics(context).incr("element_cache_hits" if cache.hits > hits else "element_cache_misses")
+    return element
+
+
 class OpenBrowserAction(ActionBase):
     @property
     def name(self) -> str:
@@ -108,13 +195,25 @@ class OpenBrowserAction(ActionBase):
         user_data_dir = self.params.get("user_data_dir", "")
         use_local_profile = self.params.get("use_local_profile", False)
         debug_port = int(self.params.get("debug_port", 0))
+        performance_profile = self.params.get("performance_profile", "标准")
+        page_load_strategy = self.params.get("page_load_strategy", "")
+        disk_cache_dir = self.params.get("disk_cache_dir", "")
+        profile_template = self.params.get("profile_template", "")
+        profile_clone_dir = self.params.get("profile_clone_dir", "")
         
         try:
-            from utils.driver_helper import DriverHelper
+            from utils.driver_helper import DriverHelper, DEFAULT_DISK_CACHE_DIR
         except ImportError:
             print("[WEB]: DriverHelper not found. Please ensure utils/driver_helper.py exists.")
             return False
 
+        profile = DriverHelper.resolve_performance_profile(performance_profile, page_load_strategy)
+        if disk_cache_dir:
+            try:
+                disk_cache_dir = disk_cache_dir.format(**context)
+            except Exception:
+                pass
+
         # Use browser_config to resolve paths if not provided
         if browser_config:
             if not chrome_path:
@@ -122,11 +221,26 @@ class OpenBrowserAction(ActionBase):
             if not user_data_dir and use_local_profile:
                 user_data_dir = browser_config.data_dir.get(browser_type, "")
 
+        # 从模板克隆独立的用户数据目录，多个会话互不加锁
+        clone_dir = None
+        if profile_template:
+            try:
+                clone_dir = ProfileManager.clone(profile_template.format(**context), profile_clone_dir or None, run_id=id(context))
+                user_data_dir = clone_dir
+            except Exception as e:
+                print(f"[WEB]: Failed to clone profile template: {e}")
+                return False
+
         # Kill existing process if requested
         if kill_process:
             print(f"[WEB]: Killing existing {browser_type} processes...")
             DriverHelper.kill_processes(browser_type)
 
+        cache_slot = None
+        if performance_profile and performance_profile != "标准" and not disk_cache_dir:
+            # 独占一个缓存槽位：并行的浏览器不会共用同一缓存目录
+            cache_slot = disk_cache_dir = DriverHelper.claim_disk_cache_dir(DEFAULT_DISK_CACHE_DIR)
+
         drivers_dir = os.path.join(os.getcwd(), "drivers")
         chromedriver_name = "chromedriver.exe" if sys.platform == "win32" else "chromedriver"
         local_driver_path = os.path.join(drivers_dir, chromedriver_name)
@@ -156,6 +270,9 @@ class OpenBrowserAction(ActionBase):
                     window_size=window_size,
                     private=incognito
                 )
+                if disk_cache_dir:
+                    os.makedirs(disk_cache_dir, exist_ok=True)
+                    args.insert(0, f"--disk-cache-dir={disk_cache_dir}")
                 
                 print(f"[WEB]: Launching subprocess: {chrome_path}")
                 DriverHelper.subprocess_launch_browser(chrome_path, args)
@@ -163,9 +280,12 @@ class OpenBrowserAction(ActionBase):
                 # Connect via Selenium
                 options = webdriver.ChromeOptions()
                 options.add_experimental_option("debuggerAddress", f"127.0.0.1:{debug_port}")
+                options.page_load_strategy = profile["page_load_strategy"]
                 
                 service = get_service()
                 driver = webdriver.Chrome(service=service, options=options)
+                DriverInstrument.install(driver)
+                DriverHelper.apply_network_blocking(driver, profile)
                 
             else:
                 if browser_type.lower() in ["chrome", "browser360"]:
@@ -177,12 +297,15 @@ class OpenBrowserAction(ActionBase):
                         window_size=window_size
                     )
                     options.add_experimental_option("detach", True)
+                    DriverHelper.apply_performance_options(options, profile, disk_cache_dir)
                     
                     driver = DriverHelper.selenium_launch_browser(
                         local_driver_path=local_driver_path,
                         drivers_dir=drivers_dir,
                         options=options
                     )
+                    DriverInstrument.install(driver)
+                    DriverHelper.apply_network_blocking(driver, profile)
                     
                     if url:
                         driver.get(url)
@@ -194,8 +317,11 @@ class OpenBrowserAction(ActionBase):
                         opts.add_argument("--inprivate")
                     if user_data_dir:
                         opts.add_argument(f"--user-data-dir={user_data_dir}")
+                    DriverHelper.apply_performance_options(opts, profile, disk_cache_dir)
                     service = EdgeService(EdgeChromiumDriverManager().install())
                     driver = webdriver.Edge(service=service, options=opts)
+                    DriverInstrument.install(driver)
+                    DriverHelper.apply_network_blocking(driver, profile)
                     if window_size:
                         try:
                             w, h = window_size.split(",")
@@ -213,8 +339,10 @@ class OpenBrowserAction(ActionBase):
                     if user_data_dir:
                         opts.add_argument(f"-profile")
                         opts.add_argument(user_data_dir)
+                    DriverHelper.apply_performance_options(opts, profile, firefox=True)
                     service = FirefoxService(GeckoDriverManager().install())
                     driver = webdriver.Firefox(service=service, options=opts)
+                    DriverInstrument.install(driver)
                     if window_size:
                         try:
                             w, h = window_size.split(",")
@@ -225,15 +353,25 @@ class OpenBrowserAction(ActionBase):
                         driver.get(url)
                 else:
                     print(f"[WEB]: Unsupported browser_type for selenium: {browser_type}")
+                    if cache_slot:
+                        DriverHelper.release_disk_cache_dir(cache_slot)
                     return False
 
+            if clone_dir:
+                ProfileManager.attach(clone_dir, driver)
+            if cache_slot:
+                DriverHelper.attach_disk_cache_dir(cache_slot, driver)
             context["driver"] = driver
             context[output_var] = driver
-            print(f"[WEB]: Browser opened in {launch_mode} mode.")
+            print(f"[WEB]: Browser opened in {launch_mode} mode (profile: {performance_profile}, page load: {profile['page_load_strategy']}).")
             return True
             
         except Exception as e:
             print(f"[WEB]: Failed to open browser: {e}")
+            if clone_dir:
+                ProfileManager.release(clone_dir)
+            if cache_slot:
+                DriverHelper.release_disk_cache_dir(cache_slot)
             import traceback
             traceback.print_exc()
             return False
@@ -259,6 +397,11 @@ class OpenBrowserAction(ActionBase):
             {"name": "chrome_path", "type": "str", "label": "浏览器路径", "default": default_exe, "advanced": True, "ui_options": {"browse_type": "file", "file_filter": "Executables (*.exe)"}},
             {"name": "use_local_profile", "type": "bool", "label": "默认用户数据", "default": False, "advanced": True, "description": "勾选后将尝试使用本机安装的浏览器配置文件（需先关闭浏览器）"},
             {"name": "user_data_dir", "type": "str", "label": "用户数据目录", "default": default_data, "advanced": True, "placeholder": "留空则使用临时目录", "ui_options": {"browse_type": "directory"}},
+            {"name": "profile_template", "type": "str", "label": "模板用户数据目录", "default": "", "advanced": True, "placeholder": "每次启动克隆一份独立目录，关闭浏览器后删除", "ui_options": {"browse_type": "directory"}},
+            {"name": "profile_clone_dir", "type": "str", "label": "克隆存放目录", "default": "", "advanced": True, "placeholder": "留空则使用系统临时目录（与模板同盘可硬链接/写时复制）", "ui_options": {"browse_type": "directory"}},
+            {"name": "performance_profile", "type": "str", "label": "性能档位", "default": "标准", "options": ["标准", "快速", "纯文本"], "advanced": True, "description": "快速：DOM 就绪即返回并拦截媒体/统计脚本；纯文本：另外拦截图片和字体"},
+            {"name": "page_load_strategy", "type": "str", "label": "页面加载策略", "default": "", "options": ["", "normal", "eager", "none"], "advanced": True, "description": "留空则使用性能档位的设置"},
+            {"name": "disk_cache_dir", "type": "str", "label": "磁盘缓存目录", "default": "", "advanced": True, "placeholder": "留空时非标准档位各自占用共享缓存下的一个槽位", "description": "指定目录时不要让同时运行的多个浏览器使用同一目录", "ui_options": {"browse_type": "directory"}},
         ]
 
 class CloseBrowserAction(ActionBase):
@@ -284,6 +427,16 @@ class CloseBrowserAction(ActionBase):
         if driver:
             try:
                 driver.quit()
+                ProfileManager.release_driver(driver)
+                ElementCache.drop(driver)
+                FramePath.forget(driver)
+                from utils.download_manager import DownloadManager
+                from utils.driver_helper import DriverHelper
+                from utils.network_capture import NetworkCapture
+                DriverHelper.release_disk_cache_dir(driver=driver)
+                DownloadManager.close_driver_sessions(driver)
+                PageWait.forget(driver)
+                NetworkCapture.forget(driver)
                 if d_var_name in context:
                     del context[d_var_name]
                 if "driver" in context and context["driver"] is driver:
@@ -309,6 +462,7 @@ class CloseBrowserAction(ActionBase):
             {"name": "kill_process", "type": "bool", "label": "终止浏览器进程", "default": False, "advanced": True}
         ]
 
+@_with_wait_policy
 class ClickElementAction(ActionBase):
     @property
     def name(self) -> str:
@@ -374,7 +528,7 @@ class ClickElementAction(ActionBase):
         value = self.params.get("value")
 
         if locator_source == "元素库" and element_key:
-            resolved = _resolve_locator_from_element_library(context, element_key)
+            resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
             if not resolved:
                 print(f"[WEB]: Element not found in library: {element_key}")
                 return False
@@ -390,11 +544,12 @@ class ClickElementAction(ActionBase):
         locator_type = _map_by(by)
         
         try:
-            if 'Web' in globals():
-                Web.wait_element_clickable(driver, (locator_type, value), timeout).click()
-            else:
-                WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((locator_type, value))).click()
-                
+            element = _find_element_cached(context, driver, (locator_type, value), timeout, "clickable")
+            try:
+                element.click()
+            except StaleElementReferenceException:
+                _find_element_cached(context, driver, (locator_type, value), timeout, "clickable", refresh=True).click()
+
             print(f"[WEB]: Clicked element {by}={value}")
             return True
         except Exception as e:
@@ -412,6 +567,7 @@ class ClickElementAction(ActionBase):
             {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True, "enable_if": {"locator_source": ["手动", "元素库"]}}
         ]
 
+@_with_wait_policy
 class InputTextAction(ActionBase):
     @property
     def name(self) -> str:
@@ -432,6 +588,7 @@ class InputTextAction(ActionBase):
             pass
 
         element = None
+        refind = None
         
         # 1. 直接处理网页元素变量
         if locator_source == "网页元素":
@@ -463,7 +620,7 @@ class InputTextAction(ActionBase):
             value = self.params.get("value")
 
             if locator_source == "元素库" and element_key:
-                resolved = _resolve_locator_from_element_library(context, element_key)
+                resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
                 if not resolved:
                     print(f"[WEB]: Element not found in library: {element_key}")
                     return False
@@ -478,20 +635,29 @@ class InputTextAction(ActionBase):
             timeout = int(self.params.get("timeout", 20))
             locator_type = _map_by(by)
             
+            def refind():
+                return _find_element_cached(context, driver, (locator_type, value), timeout, "visible", refresh=True)
+
             try:
-                if 'Web' in globals():
-                    element = Web.wait_element_visible(driver, (locator_type, value), timeout)
-                else:
-                    element = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located((locator_type, value)))
+                element = _find_element_cached(context, driver, (locator_type, value), timeout, "visible")
             except Exception as e:
                 print(f"[WEB]: Failed to find element: {e}")
                 return False
 
         # 3. 执行输入操作
-        try:
+        def _input(el):
             if clear_first:
-                element.clear()
-            element.send_keys(text)
+                el.clear()
+            el.send_keys(text)
+
+        try:
+            try:
+                _input(element)
+            except StaleElementReferenceException:
+                if refind is None:
+                    raise
+                # 缓存的元素已被页面替换，重新查找后重试一次
+                _input(refind())
             print(f"[WEB]: Inputted text into element")
             return True
         except Exception as e:
@@ -512,6 +678,273 @@ class InputTextAction(ActionBase):
         ]
 
 
+# 一次脚本调用完成：定位全部字段 -> 全部就绪后统一赋值并派发 input/change 事件
+# 返回 {"missing": [下标]} 表示仍有字段未就绪（此时不做任何赋值）；
+# 否则返回 {"results": [{"status": "ok" | "keys" | "error", "element": 元素, "message": ...}]}
+_FILL_FORM_JS = r"""
+var fields = arguments[0], requireVisible = arguments[1];
+function locate(f) {
+  var v = f.value;
+  try {
+    switch (f.by) {
+      case 'xpath': return document.evaluate(v, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+      case 'css selector': return document.querySelector(v);
+      case 'id': return document.getElementById(v);
+      case 'name': return document.getElementsByName(v)[0] || null;
+      case 'class name': return document.getElementsByClassName(v)[0] || null;
+      case 'tag name': return document.getElementsByTagName(v)[0] || null;
+      case 'link text': return Array.prototype.find.call(document.links, function (a) { return a.textContent.trim() === v; }) || null;
+      case 'partial link text': return Array.prototype.find.call(document.links, function (a) { return a.textContent.indexOf(v) >= 0; }) || null;
+    }
+  } catch (e) {}
+  return null;
+}
+function visible(el) { return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length); }
+function fire(el, name) { el.dispatchEvent(new Event(name, {bubbles: true})); }
+function truthy(v) { return /^(1|true|yes|on|y|是|勾选|选中)$/i.test(String(v).trim()); }
+function fill(el, f) {
+  var tag = el.tagName.toLowerCase(), type = (el.type || '').toLowerCase(), val = f.text;
+  if (f.keys || (tag === 'input' && type === 'file')) { return {status: 'keys', element: el}; }
+  if (el.disabled || el.readOnly) { return {status: 'keys', element: el}; }
+  if (tag === 'input' && (type === 'checkbox' || type === 'radio')) {
+    if (el.checked !== truthy(val)) { el.click(); }
+    return {status: 'ok'};
+  }
+  if (tag === 'select') {
+    var hit = Array.prototype.find.call(el.options, function (o) { return o.value === val; }) ||
+              Array.prototype.find.call(el.options, function (o) { return o.text.trim() === val; });
+    if (!hit) { return {status: 'error', message: 'option not found: ' + val}; }
+    el.value = hit.value; fire(el, 'input'); fire(el, 'change');
+    return {status: 'ok'};
+  }
+  if (tag === 'input' || tag === 'textarea') {
+    // 用原型上的 setter 赋值，React 等框架才能感知到变化
+    var proto = tag === 'input' ? HTMLInputElement.prototype : HTMLTextAreaElement.prototype;
+    var expected = f.clear ? val : el.value + val;
+    el.focus();
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, expected);
+    fire(el, 'input'); fire(el, 'change'); el.blur();
+    // 数字/日期等输入框可能拒绝该值，交给逐字输入
+    return el.value === expected ? {status: 'ok'} : {status: 'keys', element: el};
+  }
+  if (el.isContentEditable) {
+    el.focus();
+    el.textContent = f.clear ? val : el.textContent + val;
+    fire(el, 'input'); el.blur();
+    return {status: 'ok'};
+  }
+  return {status: 'keys', element: el};
+}
+var elements = [], missing = [];
+for (var i = 0; i < fields.length; i++) {
+  var el = fields[i].by ? locate(fields[i]) : null;
+  if (!el || (requireVisible && !visible(el))) { missing.push(i); }
+  elements.push(el);
+}
+if (missing.length) { return {missing: missing}; }
+return {results: fields.map(function (f, i) { return fill(elements[i], f); })};
+"""
+
+_SUPPORTED_BYS = ("xpath", "css", "css_selector", "id", "name", "class", "class_name", "tag", "tag_name",
+                  "link_text", "partial_link_text")
+
+
+def _split_form_locator(context: Dict[str, Any], raw: str):
+    """
+    解析表单字段定位：元素库:key / xpath:... / css:... / id:... 等；
+    未写前缀时以 / 或 ( 开头视为 xpath，否则视为 css
+    :return: (selenium By, value, 所在 iframe 路径 | None)，元素库中不存在时返回 None
+    """
+    raw = str(raw).strip()
+    prefix, sep, rest = raw.partition(":")
+    prefix = prefix.strip()
+    if sep and prefix == "元素库":
+        found = _lookup_element_library(context, rest.strip())
+        if not found:
+            return None
+        (by, value), frames = found
+        return _map_by(by), value, frames
+    if sep and prefix.lower() in _SUPPORTED_BYS:
+        return _map_by(prefix), rest.strip(), None
+    if raw.startswith("/") or raw.startswith("("):
+        return By.XPATH, raw, None
+    return By.CSS_SELECTOR, raw, None
+
+
+def _parse_form_locator(context: Dict[str, Any], raw: str, driver=None, timeout: float = 20):
+    """
+    解析定位（写法见 _split_form_locator），返回 (selenium By, value)，元素库中不存在时返回 None
+    给出 driver 且元素库元素记录了 iframe 路径时先切换到该路径
+    """
+    parsed = _split_form_locator(context, raw)
+    if not parsed:
+        return None
+    by, value, frames = parsed
+    if driver is not None and frames is not None:
+        try:
+            FramePath.enter(driver, frames, timeout=timeout)
+        except Exception as e:
+            print(f"[WEB]: Failed to enter frame path {frames} for '{raw}': {e}")
+            return None
+    return by, value
+
+
+def _parse_form_fields(context: Dict[str, Any], spec: Any) -> List[Dict[str, Any]]:
+    """
+    表单字段配置 -> [{"locator": 原始定位, "text": 值, "keys": 是否逐字输入}]
+    支持：
+      - 文本，每行 `定位 => 值`，末尾追加 `=> keys` 表示该字段用 send_keys 逐字输入；不含 => 的行忽略
+      - {变量}，变量为 {定位: 值} 字典，或 [{"locator", "value", "keys"}] 列表
+    """
+    if isinstance(spec, str):
+        stripped = spec.strip()
+        if stripped.startswith("{") and stripped.endswith("}") and stripped[1:-1] in context:
+            spec = context[stripped[1:-1]]
+
+    fields = []
+    if isinstance(spec, dict):
+        for locator, text in spec.items():
+            fields.append({"locator": locator, "text": "" if text is None else str(text), "keys": False})
+        return fields
+    if isinstance(spec, list):
+        for item in spec:
+            if isinstance(item, dict):
+                fields.append({"locator": item.get("locator", ""), "text": "" if item.get("value") is None else str(item.get("value")),
+                               "keys": bool(item.get("keys", False))})
+        return fields
+
+    for line in str(spec or "").splitlines():
+        line = line.strip()
+        if "=>" not in line:
+            continue
+        parts = [p.strip() for p in line.split("=>")]
+        locator, text = parts[0], parts[1]
+        keys = len(parts) > 2 and parts[2].lower() in ("keys", "逐字")
+        try:
+            text = text.format(**context)
+        except Exception:
+            pass
+        fields.append({"locator": locator, "text": text, "keys": keys})
+    return fields
+
+
+class FillFormAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "批量填写表单"
+
+    @property
+    def description(self) -> str:
+        return "一次脚本调用定位并填写多个表单字段（派发 input/change 事件），需要真实按键的字段自动退回 send_keys。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        driver_var = self.params.get("driver_variable", "")
+        # 处理驱动变量名
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        clear_first = self.params.get("clear_first", True)
+        require_visible = self.params.get("wait_visible", True)
+        timeout = int(self.params.get("timeout", 20))
+        poll = float(self.params.get("poll_interval", 0.1))
+
+        fields = _parse_form_fields(context, self.params.get("fields", ""))
+        if not fields:
+            print("[WEB]: No form fields configured.")
+            return False
+
+        # 按所在 iframe 分组：未记录路径的字段在当前 frame 中先填写，其余每组切换一次
+        groups: Dict[Any, List[int]] = {None: []}
+        payload = []
+        for i, field in enumerate(fields):
+            parsed = _split_form_locator(context, field["locator"])
+            if not parsed:
+                print(f"[WEB]: Element not found in library: {field['locator']}")
+                return False
+            by, value, frames = parsed
+            payload.append({"by": by, "value": value, "text": field["text"],
+                            "keys": field["keys"], "clear": bool(clear_first)})
+            groups.setdefault(None if frames is None else FramePath.parse(frames)[0], []).append(i)
+
+        end_time = time.time() + timeout
+        fallback = 0
+        for frame_path, indexes in groups.items():
+            if not indexes:
+                continue
+            if frame_path is not None:
+                try:
+                    FramePath.enter(driver, frame_path, timeout=max(0.0, end_time - time.time()))
+                except Exception as e:
+                    print(f"[WEB]: Failed to enter frame {FramePath.format(frame_path)}: {e}")
+                    return False
+            filled = self._fill(driver, [fields[i] for i in indexes], [payload[i] for i in indexes],
+                                require_visible, clear_first, end_time, timeout, poll)
+            if filled is None:
+                return False
+            fallback += filled
+
+        metrics = get_metrics(context)
+        metrics.incr("form_fields_script", len(fields) - fallback)
+        metrics.incr("form_fields_keys", fallback)
+        print(f"[WEB]: Filled {len(fields)} form fields ({fallback} via send_keys)")
+        return True
+
+    @staticmethod
+    def _fill(driver, fields, payload, require_visible, clear_first, end_time, timeout, poll):
+        """在当前 frame 中填写一组字段，返回退回逐字输入的字段数，失败返回 None"""
+        while True:
+            try:
+                result = driver.execute_script(_FILL_FORM_JS, payload, bool(require_visible))
+            except Exception as e:
+                print(f"[WEB]: Fill form script failed: {e}")
+                return None
+            if not result.get("missing"):
+                break
+            if time.time() >= end_time:
+                names = ", ".join(fields[i]["locator"] for i in result["missing"])
+                print(f"[WEB]: Form fields not ready after {timeout}s: {names}")
+                return None
+            time.sleep(poll)
+
+        # 退回逐字输入
+        fallback = 0
+        for field, outcome in zip(fields, result["results"]):
+            status = outcome.get("status")
+            if status == "error":
+                print(f"[WEB]: Failed to fill '{field['locator']}': {outcome.get('message')}")
+                return None
+            if status == "keys":
+                fallback += 1
+                try:
+                    element = outcome["element"]
+                    if clear_first and (element.get_attribute("type") or "").lower() != "file":
+                        element.clear()
+                    element.send_keys(field["text"])
+                except Exception as e:
+                    print(f"[WEB]: Failed to send keys to '{field['locator']}': {e}")
+                    return None
+        return fallback
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
+            {"name": "fields", "type": "text", "label": "字段(每行: 定位 => 值)", "default": "",
+             "placeholder": "css:#username => {user}\n元素库:登录页.密码 => {password} => keys\n//select[@name='city'] => 北京",
+             "description": "定位可写 元素库:Key、xpath:/css:/id:/name: 前缀；行末加 => keys 表示逐字输入；也可填写 {变量}（字典或列表）。元素库元素记录了所在 iframe 时自动切换，同一 iframe 的字段一次填写"},
+            {"name": "clear_first", "type": "bool", "label": "输入前清空", "default": True, "advanced": True},
+            {"name": "wait_visible", "type": "bool", "label": "等待字段可见", "default": True, "advanced": True},
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True},
+            {"name": "poll_interval", "type": "float", "label": "轮询间隔(秒)", "default": 0.1, "advanced": True}
+        ]
+
+
+@_with_wait_policy
 class SendKeysAction(ActionBase):
     @property
     def name(self) -> str:
@@ -560,7 +993,7 @@ class SendKeysAction(ActionBase):
             value = self.params.get("value")
 
             if locator_source == "元素库" and element_key:
-                resolved = _resolve_locator_from_element_library(context, element_key)
+                resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
                 if not resolved:
                     print(f"[WEB]: Element not found in library: {element_key}")
                     return False
@@ -579,7 +1012,7 @@ class SendKeysAction(ActionBase):
                 if 'Web' in globals():
                     element = Web.wait_element_visible(driver, (locator_type, value), timeout)
                 else:
-                    element = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located((locator_type, value)))
+                    element = AdaptiveWait(driver, timeout).until(EC.visibility_of_element_located((locator_type, value)))
             except Exception as e:
                 print(f"[WEB]: Failed to find element for send_keys: {e}")
                 return False
@@ -604,6 +1037,7 @@ class SendKeysAction(ActionBase):
             {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True, "enable_if": {"locator_source": ["手动", "元素库"]}}
         ]
 
+@_with_wait_policy
 class GoToUrlAction(ActionBase):
     @property
     def name(self) -> str:
@@ -633,19 +1067,41 @@ class GoToUrlAction(ActionBase):
             
         if not url:
             return False
+
+        wait_condition = self.params.get("wait_condition", "无")
+        idle_ms = int(self.params.get("idle_ms", 500))
+        timeout = int(self.params.get("timeout", 20))
+        network_ms = idle_ms if wait_condition in ("网络空闲", "网络空闲且DOM稳定") else 0
+        dom_ms = idle_ms if wait_condition in ("DOM稳定", "网络空闲且DOM稳定") else 0
             
         try:
+            if network_ms:
+                # 导航前注入，统计页面自身发起的请求
+                PageWait.install(driver)
             driver.get(url)
+            # driver.get 总是回到顶层文档，旧页面的 iframe 与元素句柄全部作废
+            FramePath.invalidate(driver)
+            ElementCache.for_driver(driver).invalidate()
             print(f"[WEB]: Navigated to {url}")
-            return True
         except Exception as e:
             print(f"[WEB]: Navigation failed: {e}")
             return False
 
+        if wait_condition == "页面加载完成":
+            return Web.wait_page_loaded(driver, timeout=timeout)
+        if network_ms or dom_ms:
+            ok = PageWait.wait_quiet(driver, network_idle_ms=network_ms, dom_stable_ms=dom_ms, timeout=timeout)
+            print(f"[WEB]: Wait for {wait_condition} {'done' if ok else 'timed out'}")
+            return ok
+        return True
+
     def get_param_schema(self) -> List[Dict[str, Any]]:
         return [
             {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
-            {"name": "url", "type": "str", "label": "链接地址", "default": "https://"}
+            {"name": "url", "type": "str", "label": "链接地址", "default": "https://"},
+            {"name": "wait_condition", "type": "str", "label": "等待条件", "default": "无", "options": ["无", "页面加载完成", "网络空闲", "DOM稳定", "网络空闲且DOM稳定"], "advanced": True},
+            {"name": "idle_ms", "type": "int", "label": "空闲时长(毫秒)", "default": 500, "advanced": True, "enable_if": {"wait_condition": ["网络空闲", "DOM稳定", "网络空闲且DOM稳定"]}},
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True, "enable_if": {"wait_condition": ["页面加载完成", "网络空闲", "DOM稳定", "网络空闲且DOM稳定"]}}
         ]
 
 class HttpDownloadAction(ActionBase):
@@ -678,7 +1134,10 @@ class HttpDownloadAction(ActionBase):
                 d_var_name = d_var_name[1:-1]
                 
             driver = (context.get(d_var_name) or context.get("driver")) if use_browser_cookies else None
-            return Web.http_download(url, save_path, driver=driver, timeout=timeout)
+            return Web.http_download(url, save_path, driver=driver, timeout=timeout,
+                                     chunk_size=max(1, int(self.params.get("chunk_size_kb", 1024))) * 1024,
+                                     segments=max(1, int(self.params.get("segments", 4))),
+                                     resume=bool(self.params.get("resume", True)))
         except Exception as e:
             print(f"[WEB]: Download failed: {e}")
             return False
@@ -689,9 +1148,323 @@ class HttpDownloadAction(ActionBase):
             {"name": "save_path", "type": "str", "label": "保存路径", "default": "downloaded_file.ext"},
             {"name": "use_browser_cookies", "type": "bool", "label": "使用浏览器 Cookies", "default": True, "advanced": True},
             {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True, "advanced": True, "enable_if": {"use_browser_cookies": True}},
-            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 120, "advanced": True}
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 120, "advanced": True},
+            {"name": "segments", "type": "int", "label": "分段并行数 (大文件)", "default": 4, "advanced": True},
+            {"name": "chunk_size_kb", "type": "int", "label": "读写块大小(KB)", "default": 1024, "advanced": True},
+            {"name": "resume", "type": "bool", "label": "断点续传", "default": True, "advanced": True}
         ]
 
+class BatchHttpDownloadAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "批量 HTTP 下载"
+
+    @property
+    def description(self) -> str:
+        return "并发下载列表中的多个链接到目录，文件名取自响应头或链接。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        list_var = self.params.get("list_variable", "")
+        save_dir = self.params.get("save_dir", "")
+        use_browser_cookies = self.params.get("use_browser_cookies", True)
+        driver_var = self.params.get("driver_variable", "")
+        output_var = self.params.get("output_variable", "downloaded_files")
+        errors_var = self.params.get("errors_variable", "download_errors")
+
+        var_name = list_var
+        if isinstance(var_name, str) and var_name.startswith("{") and var_name.endswith("}"):
+            var_name = var_name[1:-1]
+        urls = context.get(var_name)
+        if not isinstance(urls, list):
+            print(f"[WEB]: {list_var} (resolved as '{var_name}') is not a list or not found.")
+            return False
+        try:
+            save_dir = save_dir.format(**context)
+        except:
+            pass
+
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+        driver = (context.get(d_var_name) or context.get("driver")) if use_browser_cookies else None
+
+        try:
+            from utils.download_manager import DownloadManager
+            results = DownloadManager.download_many(
+                [str(u) for u in urls], save_dir, driver=driver,
+                max_concurrency=int(self.params.get("max_concurrency", 4)),
+                timeout=int(self.params.get("timeout", 120)),
+                chunk_size=max(1, int(self.params.get("chunk_size_kb", 1024))) * 1024,
+                segments=max(1, int(self.params.get("segments", 1))),
+                resume=bool(self.params.get("resume", True)))
+        except Exception as e:
+            print(f"[WEB]: Batch download failed: {e}")
+            return False
+
+        context[output_var] = [r["path"] for r in results]
+        context[errors_var] = [{"url": r["url"], "error": r["error"]} for r in results if r["error"]]
+        print(f"[WEB]: Downloaded {len(results) - len(context[errors_var])}/{len(results)} files to {save_dir}")
+        return True
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "list_variable", "type": "str", "label": "链接列表变量", "default": "", "variable_type": "一般变量", "is_variable": True},
+            {"name": "save_dir", "type": "str", "label": "保存目录", "default": "", "ui_options": {"browse_type": "directory"}},
+            {"name": "max_concurrency", "type": "int", "label": "最大并发数", "default": 4},
+            {"name": "output_variable", "type": "str", "label": "保存文件路径列表到变量", "default": "downloaded_files", "variable_type": "一般变量", "is_variable": True},
+            {"name": "errors_variable", "type": "str", "label": "错误列表变量", "default": "download_errors", "variable_type": "一般变量", "is_variable": True, "advanced": True},
+            {"name": "use_browser_cookies", "type": "bool", "label": "使用浏览器 Cookies", "default": True, "advanced": True},
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True, "advanced": True, "enable_if": {"use_browser_cookies": True}},
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 120, "advanced": True},
+            {"name": "segments", "type": "int", "label": "单文件分段并行数", "default": 1, "advanced": True},
+            {"name": "chunk_size_kb", "type": "int", "label": "读写块大小(KB)", "default": 1024, "advanced": True},
+            {"name": "resume", "type": "bool", "label": "断点续传", "default": True, "advanced": True}
+        ]
+
+class StartNetworkCaptureAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "开始监听网络"
+
+    @property
+    def description(self) -> str:
+        return "在触发下载前注入网络监听（fetch/XHR 钩子），配合“捕获下载链接”使用。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        driver_var = self.params.get("driver_variable", "")
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        from utils.network_capture import NetworkCapture
+        if not NetworkCapture.install(driver):
+            return False
+        print("[WEB]: Network capture installed.")
+        return True
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True}
+        ]
+
+class CaptureDownloadUrlAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "捕获下载链接"
+
+    @property
+    def description(self) -> str:
+        return "等待页面产生下载响应（按 Content-Disposition / Content-Type 匹配），匹配到立即返回链接。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        driver_var = self.params.get("driver_variable", "")
+        output_var = self.params.get("output_variable", "download_url")
+        mode = {"自动": "auto", "脚本钩子": "hook", "性能日志": "log"}.get(self.params.get("mode", "自动"), "auto")
+        timeout = float(self.params.get("timeout", 20))
+        content_types = self.params.get("content_types", "")
+        url_contains = self.params.get("url_contains", "")
+        try:
+            url_contains = url_contains.format(**context)
+        except:
+            pass
+
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        types = [t for t in str(content_types).replace("，", ",").split(",") if t.strip()] or None
+        try:
+            from utils.network_capture import NetworkCapture
+            url = NetworkCapture.wait_for_download_url(driver, timeout=timeout, mode=mode,
+                                                       content_types=types, url_contains=url_contains)
+        except Exception as e:
+            print(f"[WEB]: Capture download url failed: {e}")
+            return False
+        if not url:
+            print(f"[WEB]: No download response captured within {timeout}s.")
+            return False
+        context[output_var] = url
+        print(f"[WEB]: Captured download url, saved to {output_var}")
+        return True
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
+            {"name": "mode", "type": "str", "label": "监听方式", "default": "自动", "options": ["自动", "脚本钩子", "性能日志"]},
+            {"name": "url_contains", "type": "str", "label": "链接包含 (可选)", "default": ""},
+            {"name": "content_types", "type": "str", "label": "Content-Type 规则 (逗号分隔，空则默认)", "default": "", "advanced": True},
+            {"name": "output_variable", "type": "str", "label": "输出变量名", "default": "download_url", "variable_type": "一般变量", "is_variable": True},
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True}
+        ]
+
+def _session_snapshot_path(context: Dict[str, Any], params: Dict[str, Any], driver) -> tuple:
+    """解析快照的 (域名, 文件路径)；域名留空时取当前页面"""
+    domain = params.get("domain", "") or ""
+    file_path = params.get("file_path", "") or ""
+    try:
+        domain = domain.format(**context)
+        file_path = file_path.format(**context)
+    except Exception:
+        pass
+    if not domain:
+        try:
+            from urllib.parse import urlparse
+            domain = urlparse(driver.current_url).hostname or ""
+        except Exception:
+            domain = ""
+    return domain, file_path or SessionSnapshot.default_path(domain)
+
+
+def _session_password(context: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """
+    快照口令来源：口令变量 > 口令环境变量名；都未设置时返回空串（使用 WEB_SESSION_KEY 或本机密钥）
+    旧工作流里的明文 password 参数仍可读取，但会提示迁移
+    """
+    var_name = str(params.get("password_variable", "") or "").strip()
+    if var_name.startswith("{") and var_name.endswith("}"):
+        var_name = var_name[1:-1]
+    if var_name:
+        return str(context.get(var_name) or "")
+    env_name = str(params.get("password_env", "") or "").strip()
+    if env_name:
+        value = os.environ.get(env_name, "")
+        if not value:
+            print(f"[WEB]: Environment variable '{env_name}' for session password is empty.")
+        return value
+    legacy = params.get("password", "")
+    if legacy:
+        print("[WEB]: Plain-text session password in workflow is deprecated, use a password variable or environment variable.")
+    return legacy or ""
+
+
+_SESSION_PASSWORD_PARAMS = [
+    {"name": "password_variable", "type": "str", "label": "加密口令变量", "default": "", "advanced": True, "is_variable": True,
+     "description": "从变量读取口令，口令不会写入工作流文件"},
+    {"name": "password_env", "type": "str", "label": "加密口令环境变量", "default": "", "advanced": True,
+     "description": "从该环境变量读取口令；口令变量与此项都留空时使用环境变量 WEB_SESSION_KEY 或本机密钥"},
+]
+
+
+class SaveSessionAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "保存登录状态"
+
+    @property
+    def description(self) -> str:
+        return "把当前站点的 Cookies、localStorage、sessionStorage 加密保存到本地文件，供后续运行或其他浏览器恢复。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        driver_var = self.params.get("driver_variable", "")
+        # 处理驱动变量名
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        domain, file_path = _session_snapshot_path(context, self.params, driver)
+        max_age = float(self.params.get("max_age_hours", 12) or 0)
+        required = [n.strip() for n in str(self.params.get("required_cookies", "") or "").split(",") if n.strip()]
+        try:
+            snapshot = SessionSnapshot.capture(driver, domain, max_age_hours=max_age, required_cookies=required)
+            SessionSnapshot.save(file_path, snapshot, _session_password(context, self.params))
+        except Exception as e:
+            print(f"[WEB]: Failed to save session: {e}")
+            return False
+
+        output_var = self.params.get("output_variable", "")
+        if output_var:
+            context[output_var] = file_path
+        print(f"[WEB]: Saved session for {domain} ({len(snapshot['cookies'])} cookies) to {file_path}")
+        return True
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
+            {"name": "domain", "type": "str", "label": "域名", "default": "", "placeholder": "留空则使用当前页面的域名"},
+            {"name": "file_path", "type": "str", "label": "保存文件", "default": "", "placeholder": "留空则保存到 sessions/<域名>.session", "ui_options": {"browse_type": "file"}},
+            {"name": "max_age_hours", "type": "float", "label": "有效期(小时)", "default": 12},
+            {"name": "required_cookies", "type": "str", "label": "关键 Cookie", "default": "", "advanced": True, "description": "逗号分隔；这些 Cookie 过期或缺失时快照视为失效"},
+            *_SESSION_PASSWORD_PARAMS,
+            {"name": "output_variable", "type": "str", "label": "输出文件路径变量", "default": "", "advanced": True}
+        ]
+
+
+class RestoreSessionAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "恢复登录状态"
+
+    @property
+    def description(self) -> str:
+        return "从加密快照恢复 Cookies 与存储；快照有效时输出 True，可据此跳过登录流程。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        driver_var = self.params.get("driver_variable", "")
+        # 处理驱动变量名
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        output_var = self.params.get("output_variable", "session_restored") or "session_restored"
+        domain, file_path = _session_snapshot_path(context, self.params, driver)
+        context[output_var] = False
+
+        try:
+            snapshot = SessionSnapshot.load(file_path, _session_password(context, self.params))
+        except Exception as e:
+            print(f"[WEB]: Failed to read session snapshot: {e}")
+            return False
+        if snapshot is None:
+            print(f"[WEB]: No valid session snapshot for {domain}, login required.")
+            return True
+        try:
+            SessionSnapshot.apply(driver, snapshot)
+        except Exception as e:
+            print(f"[WEB]: Failed to restore session: {e}")
+            return True
+
+        url = self.params.get("url", "")
+        try:
+            url = url.format(**context)
+        except Exception:
+            pass
+        if url:
+            driver.get(url)
+            FramePath.invalidate(driver)
+            ElementCache.for_driver(driver).invalidate()
+        context[output_var] = True
+        print(f"[WEB]: Restored session for {snapshot.get('domain')} ({len(snapshot.get('cookies', []))} cookies)")
+        return True
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
+            {"name": "domain", "type": "str", "label": "域名", "default": "", "placeholder": "留空则使用当前页面的域名"},
+            {"name": "file_path", "type": "str", "label": "快照文件", "default": "", "placeholder": "留空则读取 sessions/<域名>.session", "ui_options": {"browse_type": "file"}},
+            {"name": "url", "type": "str", "label": "恢复后打开", "default": "", "placeholder": "留空则停留在当前页面"},
+            *_SESSION_PASSWORD_PARAMS,
+            {"name": "output_variable", "type": "str", "label": "是否恢复成功变量", "default": "session_restored", "is_variable": True}
+        ]
+
+@_with_wait_policy
 class GetElementInfoAction(ActionBase):
     @property
     def name(self) -> str:
@@ -707,6 +1480,7 @@ class GetElementInfoAction(ActionBase):
         output_var = self.params.get("output_variable", "text_output")
         
         element = None
+        refind = None
         
         # 1. 直接处理网页元素变量
         if locator_source == "网页元素":
@@ -738,7 +1512,7 @@ class GetElementInfoAction(ActionBase):
             value = self.params.get("value")
 
             if locator_source == "元素库" and element_key:
-                resolved = _resolve_locator_from_element_library(context, element_key)
+                resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
                 if not resolved:
                     print(f"[WEB]: Element not found in library: {element_key}")
                     return False
@@ -753,21 +1527,26 @@ class GetElementInfoAction(ActionBase):
             timeout = int(self.params.get("timeout", 20))
             locator_type = _map_by(by)
             
+            def refind():
+                return _find_element_cached(context, driver, (locator_type, value), timeout, "visible", refresh=True)
+
             try:
-                if 'Web' in globals():
-                    element = Web.wait_element_visible(driver, (locator_type, value), timeout)
-                else:
-                    element = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located((locator_type, value)))
+                element = _find_element_cached(context, driver, (locator_type, value), timeout, "visible")
             except Exception as e:
                 print(f"[WEB]: Failed to find element: {e}")
                 return False
 
         # 3. 执行获取信息操作
+        def _read(el):
+            return el.text if attr_name == "text" else el.get_attribute(attr_name)
+
         try:
-            if attr_name == "text":
-                result = element.text
-            else:
-                result = element.get_attribute(attr_name)
+            try:
+                result = _read(element)
+            except StaleElementReferenceException:
+                if refind is None:
+                    raise
+                result = _read(refind())
 
             context[output_var] = result
             logging_info = f"[WEB]: Got {attr_name} '{result}', saved to {output_var}"
@@ -792,6 +1571,7 @@ class GetElementInfoAction(ActionBase):
             {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True, "enable_if": {"locator_source": ["手动", "元素库"]}}
         ]
 
+@_with_wait_policy
 class SetCheckboxAction(ActionBase):
     @property
     def name(self) -> str:
@@ -873,7 +1653,7 @@ class SetCheckboxAction(ActionBase):
         value = self.params.get("value")
 
         if locator_source == "元素库" and element_key:
-            resolved = _resolve_locator_from_element_library(context, element_key)
+            resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
             if not resolved:
                 print(f"[WEB]: Element not found in library: {element_key}")
                 return False
@@ -893,9 +1673,8 @@ class SetCheckboxAction(ActionBase):
                 # 因为 Ant Design 等框架的 checkbox input 往往是隐藏 (opacity: 0)
                 element = Web.wait_element_located(driver, (locator_type, value), timeout)
             else:
-                from selenium.webdriver.support.ui import WebDriverWait
                 from selenium.webdriver.support import expected_conditions as EC
-                element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((locator_type, value)))
+                element = AdaptiveWait(driver, timeout).until(EC.presence_of_element_located((locator_type, value)))
             
             is_selected = element.is_selected()
             target_state = is_selected
@@ -952,6 +1731,8 @@ class SaveElementAction(ActionBase):
             {"name": "name", "type": "str", "label": "元素名称", "default": ""},
             {"name": "by", "type": "str", "label": "定位方式", "default": "xpath", "options": ["xpath", "css", "id", "name", "class_name", "tag_name", "link_text", "partial_link_text"]},
             {"name": "value", "type": "str", "label": "定位值", "default": "", "ui_options": {"element_picker": True}},
+            {"name": "frames", "type": "str", "label": "所在 iframe 路径", "default": "", "advanced": True,
+             "description": "多级用 >> 分隔，如 outer >> inner；使用该元素时自动切换到此路径，留空则不切换"},
             {"name": "description", "type": "str", "label": "备注", "default": "", "advanced": True},
             {"name": "overwrite", "type": "bool", "label": "允许覆盖同名元素", "default": True, "advanced": True},
         ]
@@ -962,6 +1743,7 @@ class SaveElementAction(ActionBase):
         by = self.params.get("by", "xpath")
         value = self.params.get("value", "")
         description = self.params.get("description", "")
+        frames = self.params.get("frames", "")
         overwrite = bool(self.params.get("overwrite", True))
 
         try:
@@ -975,6 +1757,8 @@ class SaveElementAction(ActionBase):
                 value = value.format(**context)
             if isinstance(description, str):
                 description = description.format(**context)
+            if isinstance(frames, str):
+                frames = frames.format(**context)
         except Exception:
             pass
 
@@ -1007,7 +1791,11 @@ class SaveElementAction(ActionBase):
                     print(f"[WEB]: Element already exists: {group}/{name}")
                     return False
 
-            meta = {"description": description} if description else None
+            meta = {"description": description} if description else {}
+            if isinstance(frames, str):
+                frames = [part.strip() for part in frames.split(">>") if part.strip()]
+            if frames:
+                meta["frames"] = list(frames)
             ok = mgr.save_element(group=group, name=name, by=by, value=value, meta=meta)
             if ok:
                 print(f"[WEB]: Element saved: {group}/{name}")
@@ -1018,6 +1806,7 @@ class SaveElementAction(ActionBase):
             print(f"[WEB]: Save element failed: {e}")
             return False
 
+@_with_wait_policy
 class HoverElementAction(ActionBase):
     @property
     def name(self) -> str:
@@ -1085,7 +1874,7 @@ class HoverElementAction(ActionBase):
         value = self.params.get("value")
         
         if locator_source == "元素库" and element_key:
-            resolved = _resolve_locator_from_element_library(context, element_key)
+            resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
             if not resolved:
                 print(f"[WEB]: Element not found in library: {element_key}")
                 return False
@@ -1125,6 +1914,7 @@ class HoverElementAction(ActionBase):
             {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True, "enable_if": {"locator_source": ["手动", "元素库"]}}
         ]
 
+@_with_wait_policy
 class SwitchFrameAction(ActionBase):
     @property
     def name(self) -> str:
@@ -1132,7 +1922,7 @@ class SwitchFrameAction(ActionBase):
         
     @property
     def description(self) -> str:
-        return "Switch to an iframe by ID (or default content if empty)."
+        return "Switch to an iframe by ID or frame path (or default content if empty)."
         
     def execute(self, context: Dict[str, Any]) -> bool:
         driver_var = self.params.get("driver_variable", "")
@@ -1169,14 +1959,21 @@ class SwitchFrameAction(ActionBase):
                 return False
 
         try:
-            if 'Web' in globals():
-                # Web.switch_frame should handle both str (ID/Name) and WebElement
-                Web.switch_frame(driver, target if target else None)
+            timeout = int(self.params.get("timeout", 20))
+        except (TypeError, ValueError):
+            timeout = 20
+
+        try:
+            if switch_type == "上一级":
+                path = FramePath.parent(driver)
+            elif not target:
+                FramePath.reset(driver)
+                path = ()
+            elif switch_type == "网页元素":
+                path = FramePath.enter_child(driver, target, timeout=timeout)
             else:
-                if not target:
-                    driver.switch_to.default_content()
-                else:
-                    driver.switch_to.frame(target)
+                path = FramePath.enter(driver, target, timeout=timeout)
+            print(f"[WEB]: Switched to frame: {FramePath.format(path)}")
             return True
         except Exception as e:
             print(f"[WEB]: Failed to switch frame: {e}")
@@ -1185,11 +1982,14 @@ class SwitchFrameAction(ActionBase):
     def get_param_schema(self) -> List[Dict[str, Any]]:
         return [
             {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
-            {"name": "switch_type", "type": "str", "label": "切换方式", "default": "ID/Name", "options": ["ID/Name", "网页元素"]},
-            {"name": "iframe_id", "type": "str", "label": "IFrame ID/Name(空则默认)", "default": "", "enable_if": {"switch_type": "ID/Name"}},
-            {"name": "target_element_variable", "type": "str", "label": "网页元素变量名", "default": "", "variable_type": "网页元素", "is_variable": True, "enable_if": {"switch_type": "网页元素"}}
+            {"name": "switch_type", "type": "str", "label": "切换方式", "default": "ID/Name", "options": ["ID/Name", "网页元素", "上一级"]},
+            {"name": "iframe_id", "type": "str", "label": "IFrame ID/Name(空则默认)", "default": "", "enable_if": {"switch_type": "ID/Name"},
+             "description": "多级 iframe 用 >> 分隔，如 outer >> inner，总是从顶层文档算起；也可写 css:/xpath:/index: 前缀"},
+            {"name": "target_element_variable", "type": "str", "label": "网页元素变量名", "default": "", "variable_type": "网页元素", "is_variable": True, "enable_if": {"switch_type": "网页元素"}},
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True}
         ]
 
+@_with_wait_policy
 class ScrollToElementAction(ActionBase):
     @property
     def name(self) -> str:
@@ -1255,7 +2055,7 @@ class ScrollToElementAction(ActionBase):
         value = self.params.get("value")
         
         if locator_source == "元素库" and element_key:
-            resolved = _resolve_locator_from_element_library(context, element_key)
+            resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
             if not resolved:
                 print(f"[WEB]: Element not found in library: {element_key}")
                 return False
@@ -1325,7 +2125,7 @@ class SwitchWindowAction(ActionBase):
             else:
                 # Basic implementation fallback
                 for handle in driver.window_handles:
-                    driver.switch_to.window(handle)
+                    switch_window(driver, handle)
                     if url_substr in driver.current_url:
                         return True
                 return False
@@ -1339,6 +2139,102 @@ class SwitchWindowAction(ActionBase):
             {"name": "url_substring", "type": "str", "label": "URL 子串匹配", "default": ""}
         ]
 
+class TabPoolLoopAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "多标签页循环"
+
+    @property
+    def description(self) -> str:
+        return "在同一浏览器中打开多个标签页并行加载 URL 列表，每个页面就绪后切换过去执行循环体。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        children = self.params.get("children", [])
+        runner = context.get("__runner__")
+        if not runner:
+            return False
+
+        driver_var = self.params.get("driver_variable", "")
+        # 处理驱动变量名
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        list_var = self.params.get("list_variable", "")
+        if isinstance(list_var, str) and list_var.startswith("{") and list_var.endswith("}"):
+            list_var = list_var[1:-1]
+        urls = context.get(list_var)
+        if not isinstance(urls, list):
+            print(f"[TabPool] Error: Variable '{list_var}' is not a list or not found.")
+            return False
+
+        item_name = self.params.get("item_variable", "tab_url")
+        index_name = self.params.get("index_variable", "loop_index")
+        errors_var = self.params.get("errors_variable", "tab_errors")
+        tab_count = max(1, min(int(self.params.get("tab_count", 4) or 1), max(len(urls), 1)))
+        ready_state = self.params.get("ready_state", "complete")
+        timeout = float(self.params.get("timeout", 30))
+
+        errors = []
+        context[errors_var] = errors
+        pending = list(enumerate(str(u) for u in urls))
+        print(f"[TabPool] Loading {len(pending)} URLs in {tab_count} tabs.")
+
+        pool = TabPool(driver, size=tab_count, ready_state=ready_state)
+        processed = 0
+        try:
+            for handle in pool.idle_handles:
+                if pending:
+                    index, url = pending.pop(0)
+                    pool.navigate(handle, index, url)
+
+            while pool.busy:
+                handle, index, url, ready = pool.next_ready(timeout)
+                if handle is None:
+                    break
+                if not ready:
+                    print(f"[TabPool] Timed out loading {url}")
+                    errors.append({"url": url, "error": "timeout"})
+                else:
+                    context[item_name] = url
+                    context[index_name] = index
+                    processed += 1
+                    try:
+                        if not runner(children, context):
+                            return False
+                    except ContinueLoopException:
+                        print(f"[TabPool] Continue triggered at index {index}")
+                    except BreakLoopException:
+                        print(f"[TabPool] Break triggered at index {index}")
+                        break
+                if pending:
+                    next_index, next_url = pending.pop(0)
+                    pool.navigate(handle, next_index, next_url)
+        finally:
+            if self.params.get("close_tabs", True):
+                pool.close()
+
+        print(f"[TabPool] Processed {processed} pages, {len(errors)} failed.")
+        return True
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
+            {"name": "list_variable", "type": "str", "label": "URL 列表", "default": "", "variable_type": "一般变量", "is_variable": True},
+            {"name": "tab_count", "type": "int", "label": "标签页数量", "default": 4},
+            {"name": "item_variable", "type": "str", "label": "当前 URL 变量名", "default": "tab_url", "variable_type": "循环项", "is_variable": True},
+            {"name": "index_variable", "type": "str", "label": "索引变量名", "default": "loop_index", "variable_type": "循环变量", "is_variable": True, "advanced": True},
+            {"name": "ready_state", "type": "str", "label": "就绪状态", "default": "complete", "options": ["complete", "interactive"], "advanced": True},
+            {"name": "timeout", "type": "int", "label": "单页超时(秒)", "default": 30, "advanced": True},
+            {"name": "errors_variable", "type": "str", "label": "失败列表变量名", "default": "tab_errors", "advanced": True},
+            {"name": "close_tabs", "type": "bool", "label": "结束后关闭标签页", "default": True, "advanced": True}
+        ]
+
 class DrawMousePathAction(ActionBase):
     @property
     def name(self) -> str:
@@ -1401,6 +2297,7 @@ class DrawMousePathAction(ActionBase):
             {"name": "duration", "type": "int", "label": "持续时间(ms)", "default": 3000, "advanced": True}
         ]
 
+@_with_wait_policy
 class WaitElementAction(ActionBase):
     @property
     def name(self) -> str:
@@ -1417,7 +2314,8 @@ class WaitElementAction(ActionBase):
             {"name": "by", "type": "str", "label": "定位方式", "default": "xpath", "options": ["xpath", "css", "id", "name", "class_name", "tag_name", "link_text", "partial_link_text"], "enable_if": {"locator_source": "手动"}},
             {"name": "value", "type": "str", "label": "定位值", "default": "", "enable_if": {"locator_source": "手动"}},
             {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20},
-            {"name": "wait_type", "type": "str", "label": "等待方式", "default": "visible", "options": ["visible", "present", "hidden"]},
+            {"name": "wait_type", "type": "str", "label": "等待方式", "default": "visible", "options": ["visible", "present", "hidden", "network_idle", "dom_stable"]},
+            {"name": "idle_ms", "type": "int", "label": "空闲时长(毫秒)", "default": 500, "enable_if": {"wait_type": ["network_idle", "dom_stable"]}},
             {"name": "output_variable", "type": "str", "label": "输出变量名", "default": "element", "variable_type": "网页元素", "is_variable": True, "enable_if": {"wait_type": ["visible", "present"]}}
         ]
     def execute(self, context: Dict[str, Any]) -> bool:
@@ -1437,6 +2335,13 @@ class WaitElementAction(ActionBase):
         wait_type = self.params.get("wait_type", "visible")
         output_var = self.params.get("output_variable", "element")
 
+        # 0. 页面级等待，不需要定位元素
+        if wait_type in ("network_idle", "dom_stable"):
+            idle_ms = int(self.params.get("idle_ms", 500))
+            if wait_type == "network_idle":
+                return PageWait.wait_network_idle(driver, idle_ms=idle_ms, timeout=timeout)
+            return PageWait.wait_dom_stable(driver, idle_ms=idle_ms, timeout=timeout)
+
         # 1. 直接处理网页元素变量
         if locator_source == "网页元素":
             element_var = self.params.get("target_element_variable", "")
@@ -1451,11 +2356,10 @@ class WaitElementAction(ActionBase):
                 return False
             
             try:
-                from selenium.webdriver.support.ui import WebDriverWait
                 from selenium.webdriver.support import expected_conditions as EC
                 
                 if wait_type == "visible":
-                    element = WebDriverWait(driver, timeout).until(EC.visibility_of(element))
+                    element = AdaptiveWait(driver, timeout).until(EC.visibility_of(element))
                     context[output_var] = element
                 elif wait_type == "present":
                     try:
@@ -1468,7 +2372,7 @@ class WaitElementAction(ActionBase):
                     if 'Web' in globals():
                         Web.wait_element_hide(driver, element=element, timeout=timeout)
                     else:
-                        WebDriverWait(driver, timeout).until(lambda d: not element.is_displayed())
+                        AdaptiveWait(driver, timeout).until(lambda d: not element.is_displayed())
                 
                 print(f"[WEB]: Waited for dynamic element '{element_var}' to be {wait_type}")
                 return True
@@ -1482,7 +2386,7 @@ class WaitElementAction(ActionBase):
         value = self.params.get("value")
         
         if locator_source == "元素库" and element_key:
-            resolved = _resolve_locator_from_element_library(context, element_key)
+            resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
             if not resolved:
                 print(f"[WEB]: Element not found in library: {element_key}")
                 return False
@@ -1512,6 +2416,7 @@ class WaitElementAction(ActionBase):
             print(f"[WEB]: Wait element ({wait_type}) failed: {e}")
             return False
 
+@_with_wait_policy
 class WaitAllElementsAction(ActionBase):
     @property
     def name(self) -> str:
@@ -1565,7 +2470,6 @@ class WaitAllElementsAction(ActionBase):
             elements = target if isinstance(target, list) else [target]
             
             try:
-                from selenium.webdriver.support.ui import WebDriverWait
                 from selenium.webdriver.support import expected_conditions as EC
                 
                 valid_elements = []
@@ -1598,7 +2502,7 @@ class WaitAllElementsAction(ActionBase):
         value = self.params.get("value")
         
         if locator_source == "元素库" and element_key:
-            resolved = _resolve_locator_from_element_library(context, element_key)
+            resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
             if not resolved:
                 print(f"[WEB]: Element not found in library: {element_key}")
                 return False
@@ -1758,3 +2662,456 @@ class FindChildrenAction(ActionBase):
         except Exception as e:
             print(f"[WEB]: Find children failed: {e}")
             return False
+
+
+# Shared helpers for the table scraping scripts: locate rows/cells relative to a root, read a value, page signature
+_TABLE_JS_HELPERS = r"""
+function locateAll(by, value, root) {
+  try {
+    if (by === 'xpath') {
+      var snap = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), out = [];
+      for (var i = 0; i < snap.snapshotLength; i++) { out.push(snap.snapshotItem(i)); }
+      return out;
+    }
+    if (by === 'css selector') { return Array.prototype.slice.call(root.querySelectorAll(value)); }
+    if (by === 'id') { return Array.prototype.slice.call(root.querySelectorAll('[id="' + value + '"]')); }
+    if (by === 'name') { return Array.prototype.slice.call(root.querySelectorAll('[name="' + value + '"]')); }
+    if (by === 'class name') { return Array.prototype.slice.call(root.getElementsByClassName(value)); }
+    if (by === 'tag name') { return Array.prototype.slice.call(root.getElementsByTagName(value)); }
+    var links = Array.prototype.slice.call(root.querySelectorAll('a'));
+    if (by === 'link text') { return links.filter(function (a) { return a.textContent.trim() === value; }); }
+    if (by === 'partial link text') { return links.filter(function (a) { return a.textContent.indexOf(value) >= 0; }); }
+  } catch (e) {}
+  return [];
+}
+function locateOne(by, value, root) { return locateAll(by, value, root)[0] || null; }
+function read(el, attr) {
+  if (!attr || attr === 'text') { return (el.innerText || el.textContent || '').trim(); }
+  if (attr === 'html') { return el.innerHTML; }
+  var v = el[attr];
+  if (typeof v === 'string' || typeof v === 'number' || typeof v === 'boolean') { return v; }
+  return el.getAttribute(attr);
+}
+function signature(rows) {
+  if (!rows.length) { return '0'; }
+  var first = (rows[0].textContent || '').slice(0, 200), last = (rows[rows.length - 1].textContent || '').slice(0, 200);
+  return rows.length + '|' + first + '|' + last;
+}
+"""
+
+# 抓取当前页：提取 offset 之后的行；需要时（未触发停止条件）点击下一页或滚动到底部，一次脚本调用完成
+_SCRAPE_PAGE_JS = _TABLE_JS_HELPERS + r"""
+var opts = arguments[0];
+document.__waScrapeMark = 1;
+var rows = locateAll(opts.rows.by, opts.rows.value, document);
+var out = [], stopped = false;
+for (var i = opts.offset; i < rows.length; i++) {
+  var row = rows[i], values;
+  if (opts.columns.length) {
+    values = opts.columns.map(function (c) {
+      var el = c.value ? locateOne(c.by, c.value, row) : row;
+      return el ? read(el, c.attr) : null;
+    });
+  } else {
+    var cells = row.querySelectorAll('td, th');
+    values = cells.length ? Array.prototype.map.call(cells, function (td) { return read(td, 'text'); }) : [read(row, 'text')];
+  }
+  if (opts.stop_text && values.some(function (v) { return v !== null && String(v).indexOf(opts.stop_text) >= 0; })) {
+    stopped = true;
+    break;
+  }
+  out.push(values);
+  if (opts.limit && out.length >= opts.limit) { stopped = true; break; }
+}
+var headers = [];
+if (!opts.columns.length && rows.length) {
+  var table = rows[0].closest('table');
+  var ths = table ? table.querySelectorAll('thead th') : [];
+  headers = Array.prototype.map.call(ths, function (th) { return read(th, 'text'); });
+}
+var result = {rows: out, total: rows.length, signature: signature(rows), headers: headers, stopped: stopped, advanced: false};
+if (!stopped && opts.advance) {
+  if (opts.mode === 'next') {
+    var next = locateOne(opts.next.by, opts.next.value, document);
+    var disabled = !next || next.disabled || next.getAttribute('aria-disabled') === 'true' ||
+                   /(^|\s)disabled(\s|$)/.test(next.className || '');
+    if (!disabled) { next.click(); result.advanced = true; }
+  } else if (opts.mode === 'scroll') {
+    if (rows.length) { rows[rows.length - 1].scrollIntoView({block: 'end'}); }
+    window.scrollTo(0, document.documentElement.scrollHeight);
+    result.advanced = true;
+  }
+}
+return result;
+"""
+
+_COUNT_ROWS_JS = _TABLE_JS_HELPERS + r"""
+var rows = arguments[0];
+return document.readyState === 'complete' && locateAll(rows.by, rows.value, document).length > 0;
+"""
+
+# 等待翻页：MutationObserver 发现行签名变化后，再等 DOM 安静 settle_ms；发生导航时直接返回
+_WAIT_TABLE_CHANGE_JS = _TABLE_JS_HELPERS + r"""
+var opts = arguments[0], done = arguments[arguments.length - 1];
+if (!document.__waScrapeMark) { done({changed: true, navigated: true}); return; }
+var start = Date.now(), lastMutation = start, changedAt = 0, finished = false;
+function check() {
+  if (!changedAt && signature(locateAll(opts.rows.by, opts.rows.value, document)) !== opts.signature) { changedAt = Date.now(); }
+}
+var observer = new MutationObserver(function () { lastMutation = Date.now(); check(); });
+var timer = setInterval(function () {
+  var now = Date.now();
+  if (changedAt && now - lastMutation >= opts.settle_ms) { finish(true); }
+  else if (now - start >= opts.timeout_ms) { finish(false); }
+}, Math.max(10, Math.min(50, opts.settle_ms)));
+function finish(changed) {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  clearInterval(timer);
+  done({changed: changed, navigated: false});
+}
+observer.observe(document, {childList: true, subtree: true, characterData: true});
+check();
+"""
+
+
+def _parse_table_columns(context: Dict[str, Any], spec: Any) -> List[Dict[str, Any]]:
+    """
+    列配置 -> [{"name", "by", "value", "attr"}]，定位相对于行元素
+    支持：
+      - 文本，每行 `列名 => 定位 [=> 属性]`，属性默认 text（另有 html 及任意属性如 href）；
+        定位为 . 表示行本身，以 ./ 或 .. 开头视为相对 xpath；不含 => 的行忽略
+      - {变量}，变量为 {列名: 定位} 字典，或 [{"name", "locator", "attr"}] 列表
+    """
+    if isinstance(spec, str):
+        stripped = spec.strip()
+        if stripped.startswith("{") and stripped.endswith("}") and stripped[1:-1] in context:
+            spec = context[stripped[1:-1]]
+
+    items = []
+    if isinstance(spec, dict):
+        items = [(str(k), v, "text") for k, v in spec.items()]
+    elif isinstance(spec, list):
+        items = [(str(c.get("name", "")), c.get("locator", ""), c.get("attr") or "text") for c in spec if isinstance(c, dict)]
+    elif isinstance(spec, str):
+        for line in spec.splitlines():
+            if "=>" not in line:
+                continue
+            parts = [p.strip() for p in line.split("=>")]
+            items.append((parts[0], parts[1], parts[2] if len(parts) > 2 and parts[2] else "text"))
+
+    columns = []
+    for name, locator, attr in items:
+        locator = str(locator or "").strip()
+        if locator in ("", "."):
+            by, value = By.XPATH, ""
+        elif locator.startswith("./") or locator.startswith(".."):
+            by, value = By.XPATH, locator
+        else:
+            resolved = _parse_form_locator(context, locator)
+            if not resolved:
+                raise ValueError(f"元素库中不存在: {locator}")
+            by, value = resolved
+            if by == By.XPATH and value.startswith("/"):
+                # 列定位相对于行
+                value = "." + value
+        columns.append({"name": name or f"列{len(columns) + 1}", "by": by, "value": value, "attr": attr})
+    return columns
+
+
+class ScrapeTableAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "表格批量抓取"
+
+    @property
+    def description(self) -> str:
+        return "逐页抓取表格/列表数据（每页一次脚本调用），支持下一页按钮翻页或无限滚动，结果写入列表变量或 Excel 会话。"
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True},
+            {"name": "rows_locator", "type": "str", "label": "行定位", "default": "table tbody tr",
+             "placeholder": "css / xpath:... / 元素库:key"},
+            {"name": "columns", "type": "text", "label": "列配置 (每行 列名 => 相对定位 [=> 属性])", "default": "",
+             "placeholder": "名称 => td.name\n链接 => a => href\n（留空抓取所有单元格文本）"},
+            {"name": "paging_mode", "type": "str", "label": "翻页方式", "default": "下一页按钮", "options": ["不翻页", "下一页按钮", "无限滚动"]},
+            {"name": "next_locator", "type": "str", "label": "下一页按钮定位", "default": "", "enable_if": {"paging_mode": "下一页按钮"}},
+            {"name": "max_pages", "type": "int", "label": "最大页数", "default": 10, "enable_if": {"paging_mode": ["下一页按钮", "无限滚动"]}},
+            {"name": "max_rows", "type": "int", "label": "最大行数 (0 不限)", "default": 0, "advanced": True},
+            {"name": "stop_text", "type": "str", "label": "遇到包含此文本的行时停止", "default": "", "advanced": True},
+            {"name": "page_timeout", "type": "int", "label": "翻页等待超时(秒)", "default": 10, "advanced": True, "enable_if": {"paging_mode": ["下一页按钮", "无限滚动"]}},
+            {"name": "settle_ms", "type": "int", "label": "翻页后 DOM 安静时长(毫秒)", "default": 150, "advanced": True, "enable_if": {"paging_mode": ["下一页按钮", "无限滚动"]}},
+            {"name": "output_target", "type": "str", "label": "输出到", "default": "列表变量", "options": ["列表变量", "Excel 会话"]},
+            {"name": "output_variable", "type": "str", "label": "输出变量名", "default": "table_rows", "variable_type": "一般变量", "is_variable": True, "enable_if": {"output_target": "列表变量"}},
+            {"name": "excel_alias", "type": "str", "label": "Excel 会话别名", "default": "default", "variable_type": "Excel对象", "enable_if": {"output_target": "Excel 会话"}},
+            {"name": "sheet_name", "type": "str", "label": "Sheet 名称 (空则当前)", "default": "", "enable_if": {"output_target": "Excel 会话"}},
+            {"name": "write_header", "type": "bool", "label": "空表时写入表头", "default": True, "enable_if": {"output_target": "Excel 会话"}},
+            {"name": "count_variable", "type": "str", "label": "行数输出变量", "default": "table_row_count", "variable_type": "一般变量", "is_variable": True, "advanced": True}
+        ]
+
+    @staticmethod
+    def _wait_rows(driver, rows: Dict[str, str], timeout: float) -> bool:
+        """等待页面加载完成且出现行（首页尚未渲染或翻页发生了导航时）"""
+        try:
+            AdaptiveWait(driver, timeout).until(lambda d: d.execute_script(_COUNT_ROWS_JS, rows))
+            return True
+        except Exception:
+            return False
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        driver_var = self.params.get("driver_variable", "")
+        # 处理驱动变量名
+        d_var_name = driver_var
+        if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+            d_var_name = d_var_name[1:-1]
+
+        driver = context.get(d_var_name) or context.get("driver")
+        if not driver:
+            print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+            return False
+
+        mode = {"下一页按钮": "next", "无限滚动": "scroll"}.get(self.params.get("paging_mode", "下一页按钮"), "none")
+        max_pages = max(1, int(self.params.get("max_pages", 10) or 1)) if mode != "none" else 1
+        max_rows = max(0, int(self.params.get("max_rows", 0) or 0))
+        page_timeout = float(self.params.get("page_timeout", 10))
+        settle_ms = max(0, int(self.params.get("settle_ms", 150)))
+        stop_text = self.params.get("stop_text", "") or ""
+        output_target = self.params.get("output_target", "列表变量")
+        output_var = self.params.get("output_variable", "table_rows")
+        excel_alias = self.params.get("excel_alias", "default")
+        sheet_name = self.params.get("sheet_name", "") or ""
+        try:
+            stop_text = stop_text.format(**context)
+            sheet_name = sheet_name.format(**context)
+        except Exception:
+            pass
+
+        try:
+            rows_locator = _parse_form_locator(context, self.params.get("rows_locator", ""), driver=driver)
+            if not rows_locator or not rows_locator[1]:
+                print(f"[WEB]: Invalid rows locator: {self.params.get('rows_locator')}")
+                return False
+            columns = _parse_table_columns(context, self.params.get("columns", ""))
+            next_locator = None
+            if mode == "next":
+                next_locator = _parse_form_locator(context, self.params.get("next_locator", ""))
+                if not next_locator or not next_locator[1]:
+                    print(f"[WEB]: Next page locator is required: {self.params.get('next_locator')}")
+                    return False
+        except ValueError as e:
+            print(f"[WEB]: {e}")
+            return False
+
+        excel_append = None
+        if output_target == "Excel 会话":
+            from tools.excel_tools import append_rows as excel_append
+        else:
+            context[output_var] = []
+
+        payload = {"rows": {"by": rows_locator[0], "value": rows_locator[1]}, "columns": columns, "mode": mode,
+                   "next": {"by": next_locator[0], "value": next_locator[1]} if next_locator else None,
+                   "stop_text": stop_text}
+        metrics = get_metrics(context)
+        names = [c["name"] for c in columns]
+        total_rows = 0
+        offset = 0
+        pages = 0
+
+        previous_timeout = None
+        try:
+            previous_timeout = driver.timeouts.script
+        except Exception:
+            pass
+
+        try:
+            navigated = False
+            while True:
+                pages += 1
+                page_payload = dict(payload, offset=offset, advance=mode != "none" and pages < max_pages,
+                                    limit=max_rows - total_rows if max_rows else 0)
+                if navigated:
+                    self._wait_rows(driver, payload["rows"], page_timeout)
+                result = driver.execute_script(_SCRAPE_PAGE_JS, page_payload)
+                if pages == 1 and not result.get("total"):
+                    # 首页的行可能尚未渲染
+                    if self._wait_rows(driver, payload["rows"], page_timeout):
+                        result = driver.execute_script(_SCRAPE_PAGE_JS, page_payload)
+
+                rows = result.get("rows", [])
+                if not names:
+                    headers = result.get("headers") or []
+                    width = max((len(r) for r in rows), default=0)
+                    names = headers if width and len(headers) == width else [f"列{i + 1}" for i in range(width)]
+                if rows:
+                    if excel_append is not None:
+                        excel_append(excel_alias, rows, sheet_name,
+                                     header=names if self.params.get("write_header", True) else None)
+                    else:
+                        context[output_var].extend(dict(zip(names, r)) for r in rows)
+                total_rows += len(rows)
+                metrics.incr("table_pages")
+                metrics.incr("table_rows", len(rows))
+                print(f"[WEB]: Scraped page {pages}: {len(rows)} rows (total {total_rows})")
+
+                if result.get("stopped") or not result.get("advanced"):
+                    break
+
+                # 等待翻页 / 新数据加载（DOM 变化），而不是固定延时
+                try:
+                    driver.set_script_timeout(page_timeout + 5)
+                    change = driver.execute_async_script(_WAIT_TABLE_CHANGE_JS, {
+                        "rows": payload["rows"], "signature": result.get("signature", ""),
+                        "timeout_ms": int(page_timeout * 1000), "settle_ms": settle_ms})
+                    changed, navigated = bool(change.get("changed")), bool(change.get("navigated"))
+                except Exception:
+                    # 点击链接导致页面卸载，脚本随之中断
+                    changed = navigated = True
+                if not changed:
+                    if mode == "next":
+                        print(f"[WEB]: Table did not change within {page_timeout}s after paging, stopping.")
+                    break
+                # 无限滚动只提取新追加的行；导航到新页面后从头提取
+                offset = 0 if navigated or mode != "scroll" else result.get("total", 0)
+        except Exception as e:
+            print(f"[WEB]: Scrape table failed on page {pages}: {e}")
+            return False
+        finally:
+            if previous_timeout is not None:
+                try:
+                    driver.set_script_timeout(previous_timeout)
+                except Exception:
+                    pass
+
+        context[self.params.get("count_variable", "table_row_count") or "table_row_count"] = total_rows
+        target = f"Excel '{excel_alias}'" if excel_append is not None else f"variable '{output_var}'"
+        print(f"[WEB]: Scraped {total_rows} rows from {pages} page(s) into {target}")
+        return True
+
+
+# Draws a loaded <img> onto a canvas and returns a PNG data URL (null if not loaded or canvas is tainted)
+_IMG_TO_DATA_URL_JS = """
+var img = arguments[0];
+if (!img || img.tagName !== 'IMG' || !img.complete || !img.naturalWidth) { return null; }
+var canvas = document.createElement('canvas');
+canvas.width = img.naturalWidth;
+canvas.height = img.naturalHeight;
+canvas.getContext('2d').drawImage(img, 0, 0);
+try { return canvas.toDataURL('image/png'); } catch (e) { return null; }
+"""
+
+
+@_with_wait_policy
+class ElementOCRAction(ActionBase):
+    @property
+    def name(self) -> str:
+        return "元素 OCR 识别"
+
+    @property
+    def description(self) -> str:
+        return "截取网页元素（如验证码图片）并直接在内存中识别文字，不产生临时文件。"
+
+    def execute(self, context: Dict[str, Any]) -> bool:
+        locator_source = self.params.get("locator_source", "手动")
+        capture_mode = self.params.get("capture_mode", "元素截图")
+        output_var = self.params.get("output_variable", "ocr_text")
+        use_cache = bool(self.params.get("use_cache", True))
+
+        element = None
+        driver = None
+
+        # 1. 直接处理网页元素变量
+        if locator_source == "网页元素":
+            element_var = self.params.get("target_element_variable", "")
+            # 处理可能带大括号的变量名
+            var_name = element_var
+            if isinstance(var_name, str) and var_name.startswith("{") and var_name.endswith("}"):
+                var_name = var_name[1:-1]
+
+            element = context.get(var_name)
+            if not element:
+                print(f"[WEB]: Web element variable '{element_var}' (resolved as '{var_name}') not found.")
+                return False
+            driver = getattr(element, "parent", None)
+        else:
+            # 2. 原有的定位逻辑
+            driver_var = self.params.get("driver_variable", "")
+            # 处理驱动变量名
+            d_var_name = driver_var
+            if isinstance(d_var_name, str) and d_var_name.startswith("{") and d_var_name.endswith("}"):
+                d_var_name = d_var_name[1:-1]
+
+            driver = context.get(d_var_name) or context.get("driver")
+            if not driver:
+                print(f"[WEB]: Driver '{driver_var}' (resolved as '{d_var_name}') not found.")
+                return False
+
+            element_key = self.params.get("element_key", "")
+            by = self.params.get("by", "xpath")
+            value = self.params.get("value")
+
+            if locator_source == "元素库" and element_key:
+                resolved = _resolve_locator_from_element_library(context, element_key, driver=driver)
+                if not resolved:
+                    print(f"[WEB]: Element not found in library: {element_key}")
+                    return False
+                by, value = resolved
+            else:
+                try:
+                    if isinstance(value, str):
+                        value = value.format(**context)
+                except:
+                    pass
+
+            timeout = int(self.params.get("timeout", 20))
+            locator_type = _map_by(by)
+
+            try:
+                if 'Web' in globals():
+                    element = Web.wait_element_visible(driver, (locator_type, value), timeout)
+                else:
+                    element = AdaptiveWait(driver, timeout).until(EC.visibility_of_element_located((locator_type, value)))
+            except Exception as e:
+                print(f"[WEB]: Failed to find element: {e}")
+                return False
+
+        # 3. 获取图片字节（仅在内存中流转）
+        try:
+            png_bytes = None
+            if capture_mode == "图片绘制" and driver is not None:
+                data_url = driver.execute_script(_IMG_TO_DATA_URL_JS, element)
+                if data_url:
+                    png_bytes = ImgOcr.decode_base64(data_url)
+                else:
+                    print("[WEB]: Canvas capture unavailable (image not loaded or cross-origin), using element screenshot.")
+            if png_bytes is None:
+                png_bytes = element.screenshot_as_png
+        except Exception as e:
+            print(f"[WEB]: Failed to capture element image: {e}")
+            return False
+
+        # 4. 识别
+        try:
+            result = ImgOcr.shared().recognize_with_info(png_bytes, use_cache=use_cache)
+            _record_cache_metrics(context, [result], use_cache)
+            context[output_var] = result["text"]
+            print(f"[WEB]: OCR result '{result['text']}', saved to {output_var}")
+            return True
+        except Exception as e:
+            print(f"[WEB]: OCR failed: {e}")
+            return False
+
+    def get_param_schema(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": "driver_variable", "type": "str", "label": "网页对象变量名", "default": "", "variable_type": "网页对象", "is_variable": True, "enable_if": {"locator_source": ["手动", "元素库", "网页元素"]}},
+            {"name": "locator_source", "type": "str", "label": "定位来源", "default": "手动", "options": ["手动", "元素库", "网页元素"]},
+            {"name": "target_element_variable", "type": "str", "label": "网页元素变量名", "default": "", "variable_type": "网页元素", "is_variable": True, "enable_if": {"locator_source": "网页元素"}},
+            {"name": "element_key", "type": "str", "label": "元素库 Key", "default": "", "enable_if": {"locator_source": "元素库"}, "ui_options": {"element_picker": True}},
+            {"name": "by", "type": "str", "label": "定位方式", "default": "xpath", "options": ["xpath", "css", "id", "name", "class_name", "tag_name", "link_text", "partial_link_text"], "enable_if": {"locator_source": "手动"}},
+            {"name": "value", "type": "str", "label": "定位值", "default": "", "enable_if": {"locator_source": "手动"}},
+            {"name": "capture_mode", "type": "str", "label": "取图方式", "default": "元素截图", "options": ["元素截图", "图片绘制"]},
+            {"name": "output_variable", "type": "str", "label": "输出变量名", "default": "ocr_text", "variable_type": "一般变量", "is_variable": True},
+            {"name": "use_cache", "type": "bool", "label": "使用识别缓存", "default": True, "advanced": True},
+            {"name": "timeout", "type": "int", "label": "超时时间(秒)", "default": 20, "advanced": True, "enable_if": {"locator_source": ["手动", "元素库"]}}
+        ]
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 轮询策略：(首次间隔秒, 退避倍数, 最大间隔秒)
+WAIT_POLICIES = {
+    "自适应": (0.025, 1.5, 0.5),
+    "快速": (0.01, 1.5, 0.1),
+    "省资源": (0.1, 2.0, 2.0),
+    "固定": (0.5, 1.0, 0.5),
+}
+DEFAULT_POLICY_NAME = "自适应"
+POLICY_ENV = "WEB_WAIT_POLICY"
+
+_local = threading.local()
+
+
+class WaitPolicy:
+    """
+    等待轮询间隔：从 initial 开始每次乘以 factor，直到 max_interval 封顶
+    短等待能很快发现元素，长等待不会频繁打扰浏览器
+    """
+
+    def __init__(self, initial: float = 0.025, factor: float = 1.5, max_interval: float = 0.5):
+        self.initial = max(0.001, float(initial))
+        self.factor = max(1.0, float(factor))
+        self.max_interval = max(self.initial, float(max_interval))
+
+    def intervals(self) -> Iterator[float]:
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(self.max_interval, interval * self.factor)
+
+    def __repr__(self) -> str:
+        return f"WaitPolicy({self.initial}, {self.factor}, {self.max_interval})"
+
+    @classmethod
+    def parse(cls, spec) -> Optional["WaitPolicy"]:
+        """
+        解析策略：WaitPolicy / 预设名称（自适应、快速、省资源、固定）/ "首次,倍数,最大" / dict
+        空值或“默认”返回 None
+        """
+        if spec is None or isinstance(spec, WaitPolicy):
+            return spec
+        if isinstance(spec, dict):
+            return cls(**spec)
+        spec = str(spec).strip()
+        if not spec or spec == "默认":
+            return None
+        if spec in WAIT_POLICIES:
+            return cls(*WAIT_POLICIES[spec])
+        try:
+            return cls(*[float(p) for p in spec.split(",")])
+        except (TypeError, ValueError):
+            print(f"无法识别的等待轮询策略: {spec}，使用默认策略")
+            return None
+
+
+def _env_policy() -> WaitPolicy:
+    return WaitPolicy.parse(os.environ.get(POLICY_ENV, "")) or WaitPolicy(*WAIT_POLICIES[DEFAULT_POLICY_NAME])
+
+
+class AdaptiveWait(WebDriverWait):
+    """
+    WebDriverWait 的替代：用法相同，轮询间隔按策略指数退避
+
+    策略优先级：构造参数 > 当前线程的 policy_scope（单个动作的设置）> 全局默认（环境变量 WEB_WAIT_POLICY）
+    """
+
+    default_policy: WaitPolicy = _env_policy()
+
+    def __init__(self, driver, timeout: float, policy=None, ignored_exceptions=None):
+        self.policy = WaitPolicy.parse(policy) or self.current_policy()
+        super().__init__(driver, timeout, poll_frequency=self.policy.max_interval,
+                         ignored_exceptions=ignored_exceptions)
+
+    @classmethod
+    def set_default_policy(cls, policy) -> None:
+        cls.default_policy = WaitPolicy.parse(policy) or WaitPolicy(*WAIT_POLICIES[DEFAULT_POLICY_NAME])
+
+    @classmethod
+    def current_policy(cls) -> WaitPolicy:
+        return getattr(_local, "policy", None) or cls.default_policy
+
+    @staticmethod
+    @contextmanager
+    def policy_scope(policy):
+        """在当前线程内临时使用指定策略（None/“默认”表示不改变）"""
+        parsed = WaitPolicy.parse(policy)
+        previous = getattr(_local, "policy", None)
+        if parsed is not None:
+            _local.policy = parsed
+        try:
+            yield parsed
+        finally:
+            _local.policy = previous
+
+    def _sleep(self, intervals: Iterator[float], end_time: float) -> None:
+        # 不越过截止时间，保证超时前最后再检查一次
+        time.sleep(max(0.0, min(next(intervals), end_time - time.monotonic())))
+
+    def until(self, method, message: str = ""):
+        screen = None
+        stacktrace = None
+        intervals = self.policy.intervals()
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            if time.monotonic() >= end_time:
+                break
+            self._sleep(intervals, end_time)
+        raise TimeoutException(message, screen, stacktrace)
+
+    def until_not(self, method, message: str = ""):
+        intervals = self.policy.intervals()
+        end_time = time.monotonic() + self._timeout
+        while True:
+            try:
+                value = method(self._driver)
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+            if time.monotonic() >= end_time:
+                break
+            self._sleep(intervals, end_time)
+        raise TimeoutException(message)
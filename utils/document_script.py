@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import Dict, Optional
+
+
+class DocumentScript:
+    """
+    在每个新文档加载前执行的页面脚本（Chromium 内核通过 CDP Page.addScriptToEvaluateOnNewDocument）
+
+    每个 WebDriver 会话只注册一次并记录返回的脚本标识，重复 install 不会在浏览器里堆积同样的脚本；
+    install 同时在当前页面执行一次（脚本自身需防止重复执行）
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        # WebDriver 会话 -> 脚本标识
+        self._registered: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(driver) -> str:
+        return getattr(driver, "session_id", None) or str(id(driver))
+
+    def install(self, driver) -> None:
+        """注册（每个会话一次）并在当前页面执行；当前页面执行失败时抛出异常"""
+        if hasattr(driver, "execute_cdp_cmd"):
+            key = self._key(driver)
+            with self._lock:
+                if key not in self._registered:
+                    try:
+                        result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": self.source})
+                        self._registered[key] = (result or {}).get("identifier", "")
+                    except Exception:
+                        pass
+        driver.execute_script(self.source)
+
+    def identifier(self, driver) -> Optional[str]:
+        with self._lock:
+            return self._registered.get(self._key(driver))
+
+    def forget(self, driver) -> None:
+        """浏览器关闭后清除注册记录"""
+        with self._lock:
+            self._registered.pop(self._key(driver), None)
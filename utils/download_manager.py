@@ -0,0 +1,344 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# 小于该大小的文件不分段（分段的额外请求不划算）
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+# 浏览器 Cookies 缓存时间（秒），避免每次下载都读取 driver
+COOKIE_TTL = 30
+
+
+class DownloadManager:
+    """
+    HTTP 下载管理
+    - 按 (浏览器会话, 域名) 复用 requests.Session（连接池，免去重复 TCP/TLS 握手）；
+      不同浏览器的 Cookies 各自独立，并行流程使用不同账号时不会串用
+    - 支持 Range 的大文件多段并行下载
+    - 断点续传：未完成的数据保存在 <文件>.part，进度保存在 <文件>.part.json
+    """
+
+    _sessions: Dict[tuple, requests.Session] = {}
+    _cookie_cache: Dict[tuple, tuple] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _domain(url: str) -> str:
+        return (urlparse(url).hostname or "").lower()
+
+    @staticmethod
+    def _owner(driver):
+        if driver is None:
+            return None
+        return getattr(driver, "session_id", None) or id(driver)
+
+    @classmethod
+    def get_session(cls, url: str, driver=None, pool_size: int = 16) -> requests.Session:
+        """获取该浏览器在该域名下的 Session（无浏览器时按域名共享，线程安全地创建）"""
+        key = (cls._owner(driver), cls._domain(url))
+        with cls._lock:
+            session = cls._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=2)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers["User-Agent"] = DEFAULT_USER_AGENT
+                cls._sessions[key] = session
+            return session
+
+    @classmethod
+    def sync_driver_cookies(cls, session: requests.Session, url: str, driver, ttl: float = COOKIE_TTL) -> None:
+        """
+        把浏览器 Cookies 与 User-Agent 同步到 Session，ttl 秒内同一浏览器同一域名不重复读取
+
+        与浏览器内的作用域无关，全部 Cookies 都发往下载域名（登录在 portal.example.com、
+        文件在 download.example.com 时同样带上登录态）；同名时与下载域名匹配的优先
+        """
+        host = cls._domain(url)
+        key = (cls._owner(driver), host)
+        now = time.time()
+        with cls._lock:
+            cached = cls._cookie_cache.get(key)
+        if cached and now - cached[0] < ttl:
+            return
+
+        def _matches(cookie):
+            domain = (cookie.get("domain") or "").lstrip(".").lower()
+            return host == domain or host.endswith("." + domain)
+
+        try:
+            # 浏览器中已删除的 Cookie 不再发送
+            session.cookies.clear(domain=host)
+        except KeyError:
+            pass
+        for cookie in sorted(driver.get_cookies(), key=_matches):
+            session.cookies.set(cookie["name"], cookie["value"], domain=host, path="/")
+        try:
+            ua = driver.execute_script("return navigator.userAgent")
+            if ua:
+                session.headers["User-Agent"] = ua
+        except Exception:
+            pass
+        with cls._lock:
+            cls._cookie_cache[key] = (now,)
+
+    @classmethod
+    def close_driver_sessions(cls, driver) -> None:
+        """浏览器关闭后释放其 Session 与 Cookies 缓存"""
+        owner = cls._owner(driver)
+        with cls._lock:
+            for key in [k for k in cls._sessions if k[0] == owner]:
+                cls._sessions.pop(key).close()
+            for key in [k for k in cls._cookie_cache if k[0] == owner]:
+                del cls._cookie_cache[key]
+
+    @classmethod
+    def close_all(cls) -> None:
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions.clear()
+            cls._cookie_cache.clear()
+
+    @staticmethod
+    def filename_from_response(url: str, headers) -> str:
+        """从 Content-Disposition（含 filename*）或 URL 路径推断文件名"""
+        disposition = headers.get("content-disposition", "") if headers else ""
+        match = re.search(r"filename\*\s*=\s*([^']*)'[^']*'([^;]+)", disposition, re.I)
+        if match:
+            return os.path.basename(unquote(match.group(2).strip().strip('"'), encoding=match.group(1) or "utf-8"))
+        match = re.search(r'filename\s*=\s*"?([^";]+)"?', disposition, re.I)
+        if match:
+            return os.path.basename(match.group(1).strip())
+        name = os.path.basename(unquote(urlparse(url).path))
+        return name or "download"
+
+    @staticmethod
+    def _unique_path(path: str, taken: set) -> str:
+        base, ext = os.path.splitext(path)
+        candidate, n = path, 1
+        while candidate in taken:
+            candidate = f"{base} ({n}){ext}"
+            n += 1
+        taken.add(candidate)
+        return candidate
+
+    @staticmethod
+    def _describe(resp):
+        """
+        从第一次 GET 的响应头判断文件大小与是否可分段（不额外发送探测请求，一次性导出链接不会被提前用掉）
+        :return: (total_size | None, accept_ranges, validator)
+        """
+        headers = resp.headers
+        validator = headers.get("etag") or headers.get("last-modified") or ""
+        length = headers.get("content-length")
+        total = int(length) if length and length.isdigit() else None
+        # 压缩传输时 Content-Length 不是文件字节数，不能按字节分段
+        encoded = headers.get("content-encoding", "identity").lower() not in ("", "identity")
+        ranged = resp.status_code == 200 and "bytes" in headers.get("accept-ranges", "").lower() and not encoded
+        return total, ranged, validator
+
+    @staticmethod
+    def _write(resp, path: str, mode: str, offset: int, chunk_size: int, limit: int = None, on_chunk=None) -> None:
+        """把响应体写入文件的 offset 处；limit 为最多写入的字节数（到达后停止读取）"""
+        with open(path, mode) as f:
+            if mode != "ab":
+                f.seek(offset)
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                if limit is not None:
+                    chunk = chunk[:limit]
+                    limit -= len(chunk)
+                f.write(chunk)
+                if on_chunk:
+                    on_chunk(len(chunk))
+                if limit == 0:
+                    break
+
+    @classmethod
+    def download(cls, url: str, save_path: str = None, save_dir: str = None, driver=None, cookies=None,
+                 user_agent=None, timeout: int = 120, chunk_size: int = DEFAULT_CHUNK_SIZE, segments: int = 4,
+                 resume: bool = True, taken_names: set = None, sync_cookies: bool = True) -> Optional[str]:
+        """
+        下载文件：先发一次普通 GET，按其响应头决定直接写入、分段并行（该响应作为第一段）或续传
+
+        :param save_path: 保存路径；为空时在 save_dir 下按响应头/URL 推断文件名
+        :param segments: 服务器声明支持 Range 且文件足够大时的并行分段数（1 表示不分段）
+        :param resume: 是否从已有的 .part 文件续传
+        :param sync_cookies: 是否从 driver 读取 Cookies（False 时只使用该浏览器已同步过的 Session）
+        :return: 保存路径，失败返回 None
+        """
+        session = cls.get_session(url, driver)
+        headers = {}
+        if user_agent:
+            headers["User-Agent"] = user_agent
+        if driver is not None and not cookies and sync_cookies:
+            cls.sync_driver_cookies(session, url, driver)
+
+        resp = session.get(url, headers=headers, cookies=cookies, timeout=timeout, stream=True)
+        try:
+            resp.raise_for_status()
+            total, ranged, validator = cls._describe(resp)
+            if not save_path:
+                name = cls.filename_from_response(url, resp.headers)
+                save_path = os.path.join(save_dir or ".", name)
+                if taken_names is not None:
+                    with cls._lock:
+                        save_path = cls._unique_path(save_path, taken_names)
+            Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+
+            part_path = save_path + ".part"
+            meta_path = part_path + ".json"
+            print(f"开始HTTP下载: {url}")
+            print(f"保存路径: {save_path}")
+
+            meta = None
+            if resume and ranged and os.path.exists(part_path):
+                meta = cls._load_meta(meta_path, validator, total) or cls._load_meta(meta_path, validator, None)
+            if meta is not None:
+                # 续传：已有部分数据，放弃这次完整响应，改用 Range 请求剩余部分
+                resp.close()
+                if meta.get("segments"):
+                    cls._download_segmented(session, url, headers, cookies, timeout, chunk_size, segments,
+                                            total, validator, part_path, meta_path, meta=meta)
+                else:
+                    cls._download_single(session, url, headers, cookies, timeout, chunk_size,
+                                         validator, part_path, meta_path, offset=os.path.getsize(part_path))
+            elif ranged and total and segments > 1 and total >= MIN_SEGMENT_SIZE:
+                cls._download_segmented(session, url, headers, cookies, timeout, chunk_size, segments,
+                                        total, validator, part_path, meta_path, first=resp)
+            else:
+                cls._download_single(session, url, headers, cookies, timeout, chunk_size,
+                                     validator, part_path, meta_path, response=resp)
+        finally:
+            resp.close()
+
+        os.replace(part_path, save_path)
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        print(f"文件下载成功：{save_path}")
+        return save_path
+
+    @staticmethod
+    def _load_meta(meta_path: str, validator: str, total) -> Optional[dict]:
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("validator") == validator and meta.get("total") == total:
+                return meta
+        except (OSError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def _save_meta(meta_path: str, meta: dict) -> None:
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @classmethod
+    def _download_single(cls, session, url, headers, cookies, timeout, chunk_size,
+                         validator, part_path, meta_path, response=None, offset: int = 0):
+        """单连接下载：写入已打开的响应，或从 offset 处续传"""
+        cls._save_meta(meta_path, {"validator": validator, "total": None})
+        if response is not None:
+            cls._write(response, part_path, "wb", 0, chunk_size)
+            return
+
+        req_headers = dict(headers)
+        req_headers["Range"] = f"bytes={offset}-"
+        print(f"断点续传，从 {offset} 字节继续")
+        with session.get(url, headers=req_headers, cookies=cookies, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            cls._write(resp, part_path, "ab" if resp.status_code == 206 else "wb", 0, chunk_size)
+
+    @classmethod
+    def _download_segmented(cls, session, url, headers, cookies, timeout, chunk_size, segments,
+                            total, validator, part_path, meta_path, first=None, meta=None):
+        """
+        多段并行下载；first 为已打开的完整响应，直接用作第一段（读够该段后关闭）
+        meta 为续传时读到的进度
+        """
+        if meta is None:
+            step = -(-total // segments)
+            meta = {"validator": validator, "total": total,
+                    "segments": [[start, min(start + step, total) - 1, 0] for start in range(0, total, step)]}
+            with open(part_path, "wb") as f:
+                f.truncate(total)
+        else:
+            done = sum(s[2] for s in meta["segments"])
+            print(f"断点续传，已完成 {done}/{total} 字节")
+        progress_lock = threading.Lock()
+
+        def _fetch(segment):
+            start, end, done = segment
+
+            def _progress(n):
+                with progress_lock:
+                    segment[2] += n
+
+            if start + done > end:
+                return
+            if first is not None and start == 0 and done == 0:
+                try:
+                    cls._write(first, part_path, "r+b", 0, chunk_size, limit=end + 1, on_chunk=_progress)
+                finally:
+                    first.close()
+                return
+            req_headers = dict(headers)
+            req_headers["Range"] = f"bytes={start + done}-{end}"
+            with session.get(url, headers=req_headers, cookies=cookies, timeout=timeout, stream=True) as resp:
+                if resp.status_code != 206:
+                    raise IOError(f"服务器未按分段返回数据 (HTTP {resp.status_code})")
+                cls._write(resp, part_path, "r+b", start + done, chunk_size, on_chunk=_progress)
+
+        print(f"分段并行下载: {total} 字节, {len(meta['segments'])} 段")
+        try:
+            with ThreadPoolExecutor(max_workers=len(meta["segments"])) as pool:
+                for _ in pool.map(_fetch, meta["segments"]):
+                    pass
+        finally:
+            # 无论成功与否都记录进度，失败后可续传
+            cls._save_meta(meta_path, meta)
+
+        if sum(s[2] for s in meta["segments"]) != total:
+            raise IOError("分段下载不完整")
+
+    @classmethod
+    def download_many(cls, urls: List[str], save_dir: str, driver=None, max_concurrency: int = 4,
+                      **kwargs) -> List[dict]:
+        """
+        并发下载多个 URL（限制同时进行的下载数）
+        :return: 与输入顺序一致的 [{"url", "path", "error"}]
+        """
+        taken = set()
+
+        def _one(url):
+            try:
+                path = cls.download(url, save_dir=save_dir, taken_names=taken, **kwargs)
+                return {"url": url, "path": path, "error": None}
+            except Exception as e:
+                print(f"文件下载失败：{url} {e}")
+                return {"url": url, "path": None, "error": str(e)}
+
+        if not urls:
+            return []
+        if driver is not None:
+            # WebDriver 不是线程安全的，先在当前线程同步好 Cookies
+            for url in urls:
+                cls.sync_driver_cookies(cls.get_session(url, driver), url, driver)
+            kwargs.update(driver=driver, sync_cookies=False)
+        with ThreadPoolExecutor(max_workers=max(1, min(int(max_concurrency or 1), len(urls)))) as pool:
+            return list(pool.map(_one, urls))
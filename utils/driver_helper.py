@@ -2,9 +2,61 @@ import sys
 import subprocess
 import os
 import shutil
+import tempfile
+import threading
 from selenium import webdriver
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 from selenium.webdriver.chrome.service import Service
 
+# 按类别拦截的 URL 通配模式（CDP Network.setBlockedURLs）
+BLOCK_PATTERNS = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp", "*.avif"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg", "*.wav", "*.flv", "*.m3u8", "*.ts?*"],
+    "trackers": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+        "*hm.baidu.com*", "*cnzz.com*", "*51.la*", "*growingio.com*", "*sensorsdata.cn*",
+        "*facebook.net*", "*hotjar.com*", "*clarity.ms*",
+    ],
+}
+
+# 性能档位：页面加载策略 + 拦截的资源类别
+PERFORMANCE_PROFILES = {
+    "标准": {"page_load_strategy": "normal", "block": []},
+    "快速": {"page_load_strategy": "eager", "block": ["media", "trackers"]},
+    "纯文本": {"page_load_strategy": "eager", "block": ["images", "fonts", "media", "trackers"]},
+}
+
+# 磁盘缓存根目录（临时用户目录关闭即删除，缓存放在外面才能跨会话复用）
+# Chrome 不支持多个进程共用一个缓存目录：每个浏览器独占其下的一个槽位 slot-N，
+# 先后运行的会话复用同一槽位，同时运行的会话各用各的
+DEFAULT_DISK_CACHE_DIR = os.path.join(tempfile.gettempdir(), "web_automation_disk_cache")
+MAX_DISK_CACHE_SLOTS = 16
+
+# 槽位目录 -> {"file": 持有锁的文件, "driver": 使用该槽位的浏览器}
+_cache_slots = {}
+_cache_slots_lock = threading.Lock()
+
+
+def _try_lock(f) -> bool:
+    """非阻塞独占锁（跨进程），进程退出时由系统释放"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        elif msvcrt is not None:
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
 class DriverHelper:
 
     @staticmethod
@@ -176,6 +228,107 @@ class DriverHelper:
             options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
         return options
 
+    @staticmethod
+    def resolve_performance_profile(profile: str = "标准", page_load_strategy: str = "") -> dict:
+        """
+        获取性能档位配置
+        :param profile: 档位名称（见 PERFORMANCE_PROFILES），未知名称按标准处理
+        :param page_load_strategy: 非空时覆盖档位的页面加载策略（normal/eager/none）
+        :return: {"page_load_strategy": str, "block": [类别], "patterns": [URL 模式]}
+        """
+        base = PERFORMANCE_PROFILES.get(profile or "标准", PERFORMANCE_PROFILES["标准"])
+        strategy = (page_load_strategy or base["page_load_strategy"]).strip().lower()
+        if strategy not in ("normal", "eager", "none"):
+            strategy = base["page_load_strategy"]
+        patterns = []
+        for category in base["block"]:
+            patterns.extend(BLOCK_PATTERNS.get(category, []))
+        return {"page_load_strategy": strategy, "block": list(base["block"]), "patterns": patterns}
+
+    @staticmethod
+    def apply_performance_options(options, profile: dict, disk_cache_dir: str = None, firefox: bool = False):
+        """
+        把性能档位写入启动参数：页面加载策略、磁盘缓存目录，以及图片的内容设置
+        （内容设置对所有标签页生效，CDP 拦截只作用于当前标签页）
+        """
+        options.page_load_strategy = profile["page_load_strategy"]
+        blocks_images = "images" in profile["block"]
+        if firefox:
+            if blocks_images:
+                options.set_preference("permissions.default.image", 2)
+            return options
+        if disk_cache_dir:
+            os.makedirs(disk_cache_dir, exist_ok=True)
+            options.add_argument(f"--disk-cache-dir={disk_cache_dir}")
+        if blocks_images:
+            prefs = dict(options.experimental_options.get("prefs", {}))
+            prefs["profile.managed_default_content_settings.images"] = 2
+            options.add_experimental_option("prefs", prefs)
+        return options
+
+    @staticmethod
+    def claim_disk_cache_dir(root: str = DEFAULT_DISK_CACHE_DIR):
+        """
+        占用 root 下第一个空闲的缓存槽位（其他进程/浏览器未占用），返回槽位目录；全部占用时返回 None
+        浏览器已关闭但未经“关闭浏览器”释放的槽位在此回收
+        """
+        with _cache_slots_lock:
+            for slot, info in list(_cache_slots.items()):
+                driver = info["driver"]
+                if driver is None:
+                    continue
+                try:
+                    driver.current_window_handle
+                except Exception:
+                    info["file"].close()
+                    del _cache_slots[slot]
+            os.makedirs(root, exist_ok=True)
+            for i in range(MAX_DISK_CACHE_SLOTS):
+                slot = os.path.join(root, f"slot-{i}")
+                if slot in _cache_slots:
+                    continue
+                f = open(slot + ".lock", "a+b")
+                if not _try_lock(f):
+                    f.close()
+                    continue
+                os.makedirs(slot, exist_ok=True)
+                _cache_slots[slot] = {"file": f, "driver": None}
+                return slot
+        print(f"[WEB]: All {MAX_DISK_CACHE_SLOTS} disk cache slots under {root} are in use, browser uses its own cache.")
+        return None
+
+    @staticmethod
+    def attach_disk_cache_dir(slot: str, driver) -> None:
+        with _cache_slots_lock:
+            if slot in _cache_slots:
+                _cache_slots[slot]["driver"] = driver
+
+    @staticmethod
+    def release_disk_cache_dir(slot: str = None, driver=None) -> None:
+        """释放槽位（按目录或按浏览器），之后的会话可以复用其中的缓存"""
+        with _cache_slots_lock:
+            for key, info in list(_cache_slots.items()):
+                if key == slot or (driver is not None and info["driver"] is driver):
+                    info["file"].close()
+                    del _cache_slots[key]
+
+    @staticmethod
+    def apply_network_blocking(driver, profile: dict) -> bool:
+        """
+        通过 CDP Network.setBlockedURLs 拦截档位中的资源（仅 Chromium 内核）
+        :return: 是否已生效
+        """
+        patterns = profile.get("patterns") or []
+        if not patterns or not hasattr(driver, "execute_cdp_cmd"):
+            return False
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            return True
+        except Exception as e:
+            print(f"[WEB]: 设置资源拦截失败: {e}")
+            return False
+
     @staticmethod
     def selenium_launch_browser(
         local_driver_path: str,
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+
+from core.step_profiler import record_command
+
+
+def _payload_size(obj) -> int:
+    """估算请求/响应的 JSON 字节数（字符串直接取长度，避免大页面源码被再序列化一遍）"""
+    if obj is None:
+        return 0
+    if isinstance(obj, str):
+        return len(obj)
+    if isinstance(obj, dict) and isinstance(obj.get("value"), str):
+        return len(obj["value"])
+    try:
+        return len(json.dumps(obj, default=str, ensure_ascii=False))
+    except Exception:
+        return 0
+
+
+class DriverInstrument:
+    """
+    包装 WebDriver 的 command_executor：每条命令（含 execute_script / CDP）统计次数、字节与耗时，
+    计入当前线程正在执行的步骤（见 core.step_profiler）
+    """
+
+    @staticmethod
+    def install(driver) -> bool:
+        """为 driver 安装统计（重复调用无副作用），返回是否新安装"""
+        executor = getattr(driver, "command_executor", None)
+        if executor is None or getattr(executor, "_wa_instrumented", False):
+            return False
+        original = executor.execute
+
+        def execute(command, params):
+            bytes_out = _payload_size(params)
+            start = time.perf_counter()
+            response = None
+            try:
+                response = original(command, params)
+                return response
+            finally:
+                record_command(command, time.perf_counter() - start, bytes_out, _payload_size(response))
+
+        executor.execute = execute
+        executor._wa_instrumented = True
+        return True
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+# 批量校验缓存的元素：仍在当前文档中；文档有变化时在页面内重新定位，结果须仍是同一个元素；满足可见/可点击条件
+# 页面内维护文档标识与 DOM 变化计数（MutationObserver），计数未变时无需重新定位
+_VALIDATE_JS = r"""
+var entries = arguments[0], doc = document;
+if (!doc.__waDocId) { doc.__waDocId = Date.now().toString(36) + Math.random().toString(36).slice(2); }
+if (!doc.__waMutObserver) {
+  doc.__waMut = 0;
+  doc.__waMutObserver = new MutationObserver(function () { doc.__waMut++; });
+  doc.__waMutObserver.observe(doc, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+// 尚未派发的变化记录也计入
+if (doc.__waMutObserver.takeRecords().length) { doc.__waMut++; }
+
+function locate(by, value) {
+  try {
+    if (by === 'xpath') {
+      return doc.evaluate(value, doc, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    if (by === 'css selector') { return doc.querySelector(value); }
+    if (by === 'id') { return doc.querySelector('[id="' + value.replace(/(["\\])/g, '\\$1') + '"]'); }
+    if (by === 'name') { return doc.querySelector('[name="' + value.replace(/(["\\])/g, '\\$1') + '"]'); }
+    if (by === 'class name') { return doc.getElementsByClassName(value)[0] || null; }
+    if (by === 'tag name') { return doc.getElementsByTagName(value)[0] || null; }
+  } catch (e) {}
+  return undefined;
+}
+function visible(el) {
+  if (el.checkVisibility) { return el.checkVisibility({opacityProperty: true, visibilityProperty: true}); }
+  var style = window.getComputedStyle(el);
+  return el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+}
+var ok = entries.map(function (e) {
+  var el = e.element;
+  if (!el || !el.isConnected || el.ownerDocument !== doc) { return false; }
+  if (e.doc !== doc.__waDocId || e.mut !== doc.__waMut) {
+    if (locate(e.by, e.value) !== el) { return false; }
+  }
+  if (e.condition === 'visible' || e.condition === 'clickable') {
+    if (!visible(el)) { return false; }
+  }
+  if (e.condition === 'clickable' && el.disabled) { return false; }
+  return true;
+});
+return {doc: doc.__waDocId, mut: doc.__waMut, ok: ok};
+"""
+
+
+class ElementCache:
+    """
+    元素定位结果缓存（按 WebDriver 会话），键为 (frame 路径, 定位方式, 定位值)
+
+    循环中重复定位同一元素时，先用一次脚本批量校验缓存的元素是否仍然有效，有效则跳过等待与查找：
+    - 导航后文档标识变化、切换 frame 后键不同，旧缓存自然失效
+    - DOM 有变化时在页面内重新定位一次，仍是同一元素才算命中
+    - 使用元素时出现 StaleElementReferenceException 由调用方 refresh 重新查找
+    """
+
+    enabled = True
+    max_entries = 256
+
+    _caches: Dict[str, "ElementCache"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.frame_path: Tuple = ()
+        self.entries: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(driver) -> str:
+        return getattr(driver, "session_id", None) or str(id(driver))
+
+    @classmethod
+    def for_driver(cls, driver) -> "ElementCache":
+        key = cls._key(driver)
+        with cls._lock:
+            cache = cls._caches.get(key)
+            if cache is None:
+                cache = cls._caches[key] = cls()
+            return cache
+
+    @classmethod
+    def drop(cls, driver) -> None:
+        """浏览器关闭时丢弃该会话的缓存"""
+        with cls._lock:
+            cls._caches.pop(cls._key(driver), None)
+
+    def set_frame_path(self, path: Sequence) -> None:
+        """记录当前所在的 frame 路径（空表示顶层文档），之后的查找使用该路径下的缓存"""
+        path = tuple(path or ())
+        if path != self.frame_path:
+            self.frame_path = path
+            # 其他 frame 的句柄在切换后无法校验，直接丢弃
+            self.entries = OrderedDict((k, v) for k, v in self.entries.items() if k[0] == path)
+
+    def invalidate(self, locator: Tuple = None) -> None:
+        """清除全部缓存，或当前 frame 下指定定位的缓存"""
+        if locator is None:
+            self.entries.clear()
+        else:
+            for condition in ("present", "visible", "clickable"):
+                self.entries.pop((self.frame_path, locator[0], locator[1], condition), None)
+
+    def store(self, locator: Tuple, element, condition: str = "present") -> None:
+        key = (self.frame_path, locator[0], locator[1], condition)
+        # 文档标识与变化计数留空，下次校验时在页面内重新定位确认后补上
+        self.entries[key] = {"element": element, "doc": None, "mut": None}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def lookup(self, driver, locators: List[Tuple], condition: str = "present") -> List[Optional[object]]:
+        """
+        批量取出仍然有效的缓存元素（一次脚本调用），无缓存或已失效的位置为 None
+        """
+        keys = [(self.frame_path, loc[0], loc[1], condition) for loc in locators]
+        cached = [(i, key, self.entries[key]) for i, key in enumerate(keys) if key in self.entries]
+        results: List[Optional[object]] = [None] * len(keys)
+        if not cached:
+            self.misses += len(keys)
+            return results
+
+        payload = [{"element": entry["element"], "by": key[1], "value": key[2], "condition": condition,
+                    "doc": entry["doc"], "mut": entry["mut"]} for _, key, entry in cached]
+        try:
+            state = driver.execute_script(_VALIDATE_JS, payload)
+        except (StaleElementReferenceException, WebDriverException):
+            # 句柄属于已经卸载的文档或其他 frame
+            for _, key, _ in cached:
+                self.entries.pop(key, None)
+            self.misses += len(keys)
+            return results
+
+        for (i, key, entry), ok in zip(cached, state.get("ok", [])):
+            if ok:
+                entry["doc"], entry["mut"] = state.get("doc"), state.get("mut")
+                results[i] = entry["element"]
+            else:
+                self.entries.pop(key, None)
+        found = sum(1 for r in results if r is not None)
+        self.hits += found
+        self.misses += len(keys) - found
+        return results
+
+    def find(self, driver, locator: Tuple, finder: Callable[[], object], condition: str = "present",
+             refresh: bool = False):
+        """
+        取缓存元素，未命中时调用 finder() 查找并缓存
+        :param refresh: 忽略缓存重新查找（元素已失效时使用）
+        """
+        if not self.enabled:
+            return finder()
+        if refresh:
+            self.invalidate(locator)
+        else:
+            element = self.lookup(driver, [locator], condition)[0]
+            if element is not None:
+                return element
+        element = finder()
+        if element is not None:
+            self.store(locator, element, condition)
+        return element
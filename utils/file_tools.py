@@ -1,66 +1,418 @@
 # -*- coding: utf-8 -*-
+import ctypes
+import ctypes.util
+import glob
 import os
+import select
+import struct
+import sys
+import threading
 import time
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 下载中的临时文件后缀（Chrome/Edge .crdownload，Firefox .part）
+TEMP_SUFFIXES = ('.tmp', '.crdownload', '.part', '.partial', '.download')
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_EVENT_HEADER = struct.Struct("iIII")
+
+# ioctl FICLONE：btrfs/XFS 等支持写时复制的文件系统上秒级“复制”
+_FICLONE = 0x40049409
+# 小文件直接 shutil 复制，内核零拷贝的收益只在大文件上明显
+_ZERO_COPY_MIN_SIZE = 1024 * 1024
+_COPY_CHUNK = 64 * 1024 * 1024
+
+
+class _InotifyWatcher:
+    """
+    基于 inotify 的目录监听（仅 Linux，通过 ctypes 调用 libc，无额外依赖）
+    """
+
+    def __init__(self, directory):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_CREATE | _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed: {directory}")
+
+    def read_events(self, timeout):
+        """
+        等待事件，返回 [(mask, name)]，超时返回空列表
+        """
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].split(b"\0", 1)[0]
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _open_watcher(directory):
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _InotifyWatcher(directory)
+    except (OSError, AttributeError):
+        # 无 inotify（容器限制、watch 数量耗尽等）时退回轮询
+        return None
+
 
 class FileTools:
     @staticmethod
-    def copy_file(temp_file_dir, save_full_path):
+    def wait_for_files(directory, count=1, timeout=60, stable_seconds=1.0, poll_interval=0.5):
         """
-        等待临时目录中出现文件，并将其复制到指定路径
+        等待目录中出现 count 个新文件并确认写入完成
+
+        - 只考虑等待开始后新建（或被覆盖）的文件
+        - 完成判定：由临时文件重命名而来 / 写入后关闭（inotify），或大小连续 stable_seconds 秒不变
+        - Linux 使用 inotify 即时响应，其他平台或不可用时轮询
+
+        :return: 已完成的文件路径列表（按修改时间排序），超时返回 None
         """
-        print(f"正在等待文件下载至: {temp_file_dir}")
-        max_wait = 60
+        def _snapshot():
+            entries = {}
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_file():
+                                st = entry.stat()
+                                entries[entry.name] = (st.st_size, st.st_mtime_ns)
+                        except OSError:
+                            continue
+            except FileNotFoundError:
+                pass
+            return entries
+
         start_time = time.time()
-        
-        while time.time() - start_time < max_wait:
-            if not os.path.exists(temp_file_dir):
-                time.sleep(1)
+        baseline = _snapshot()
+        watcher = _open_watcher(directory) if os.path.isdir(directory) else None
+        mode = "inotify" if watcher else "轮询"
+        print(f"正在等待文件下载至: {directory}（{count} 个文件，{mode}模式）")
+
+        seen = {}          # name -> (size, 大小最近一次变化的时间)
+        finished = set()   # 已确认写入完成的文件名
+        try:
+            while True:
+                now = time.time()
+                for name, (size, mtime_ns) in _snapshot().items():
+                    if name.startswith('.') or name.lower().endswith(TEMP_SUFFIXES):
+                        continue
+                    if baseline.get(name, (None, None))[1] == mtime_ns:
+                        continue
+                    prev = seen.get(name)
+                    if prev is None or prev[0] != size:
+                        seen[name] = (size, now)
+                        if prev is not None:
+                            finished.discard(name)
+                    elif size > 0 and now - prev[1] >= stable_seconds:
+                        finished.add(name)
+
+                done = [n for n in finished if n in seen]
+                if len(done) >= count:
+                    paths = [os.path.join(directory, n) for n in done]
+                    paths.sort(key=lambda p: os.path.getmtime(p))
+                    return paths[:count]
+
+                remaining = timeout - (time.time() - start_time)
+                if remaining <= 0:
+                    print(f"超时：在 {directory} 中未找到下载文件（已完成 {len(done)}/{count}）")
+                    return None
+
+                wait = min(poll_interval, remaining)
+                if seen and len(finished) < len(seen):
+                    # 有文件在等待大小稳定，按稳定时长的粒度复查
+                    wait = min(wait, max(0.05, stable_seconds / 4))
+                if watcher is None:
+                    if not os.path.isdir(directory):
+                        wait = min(1.0, remaining)
+                    time.sleep(wait)
+                    continue
+
+                for mask, name in watcher.read_events(wait):
+                    if not name or name.startswith('.') or name.lower().endswith(TEMP_SUFFIXES):
+                        continue
+                    if mask & (_IN_MOVED_TO | _IN_CLOSE_WRITE):
+                        try:
+                            st = os.stat(os.path.join(directory, name))
+                        except OSError:
+                            continue
+                        if baseline.get(name, (None, None))[1] == st.st_mtime_ns:
+                            continue
+                        seen[name] = (st.st_size, time.time())
+                        finished.add(name)
+        finally:
+            if watcher:
+                watcher.close()
+
+    @staticmethod
+    def copy_file(temp_file_dir, save_full_path, timeout=60, count=1, stable_seconds=1.0):
+        """
+        等待临时目录中出现新下载的文件，并将其复制到指定路径
+        count > 1 时 save_full_path 视为目标目录
+        """
+        files = FileTools.wait_for_files(temp_file_dir, count=count, timeout=timeout, stable_seconds=stable_seconds)
+        if not files:
+            return False
+
+        multiple = count > 1 or os.path.isdir(save_full_path)
+        target_dir = save_full_path if multiple else os.path.dirname(save_full_path)
+        # 确保目标目录存在
+        if target_dir:
+            os.makedirs(target_dir, exist_ok=True)
+
+        for source_file in files:
+            target = os.path.join(save_full_path, os.path.basename(source_file)) if multiple else save_full_path
+            FileTools.fast_copy(source_file, target)
+            print(f"文件已复制: {source_file} -> {target}")
+        return True
+
+    @staticmethod
+    def _reflink(src_fd, dst_fd):
+        if fcntl is None or not sys.platform.startswith("linux"):
+            return False
+        try:
+            fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def _kernel_copy(src_fd, dst_fd, size):
+        """
+        内核态复制（copy_file_range 优先，其次 sendfile），数据不经过用户态缓冲
+        """
+        copied = 0
+        use_range = hasattr(os, "copy_file_range")
+        while copied < size:
+            count = min(_COPY_CHUNK, size - copied)
+            if use_range:
+                try:
+                    sent = os.copy_file_range(src_fd, dst_fd, count)
+                except OSError:
+                    # 跨文件系统（旧内核）或不支持，改用 sendfile
+                    use_range = False
+                    continue
+            else:
+                sent = os.sendfile(dst_fd, src_fd, copied, count)
+            if sent == 0:
+                break
+            copied += sent
+        return copied == size
+
+    @staticmethod
+    def fast_copy(src, dst, link_mode="auto"):
+        """
+        复制单个文件（保留元数据，相当于 shutil.copy2）
+
+        :param link_mode: "auto" 先尝试 reflink，再用内核零拷贝；
+                          "hardlink" 同一文件系统时创建硬链接（目标与源共享数据，修改会互相影响）；
+                          "copy" 普通复制
+        :return: 实际使用的方式 "hardlink" / "reflink" / "zero-copy" / "copy"
+        :raises shutil.SameFileError: 目标就是源文件本身（或其硬链接），与 shutil.copy2 一致，不会截断源文件
+        """
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+        if link_mode == "hardlink":
+            # 先链接到临时名再原子替换，失败时原目标保持不变
+            tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.lnk"
+            try:
+                os.link(src, tmp)
+                os.replace(tmp, dst)
+                return "hardlink"
+            except OSError:
+                if os.path.lexists(tmp):
+                    os.unlink(tmp)
+
+        size = os.path.getsize(src)
+        if link_mode == "copy" or not sys.platform.startswith("linux") or size < _ZERO_COPY_MIN_SIZE:
+            shutil.copy2(src, dst)
+            return "copy"
+
+        method = None
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            if FileTools._reflink(fsrc.fileno(), fdst.fileno()):
+                method = "reflink"
+            elif FileTools._kernel_copy(fsrc.fileno(), fdst.fileno(), size):
+                method = "zero-copy"
+        if method is None:
+            shutil.copyfile(src, dst)
+            method = "copy"
+        shutil.copystat(src, dst)
+        return method
+
+    @staticmethod
+    def fast_move(src, dst):
+        """
+        移动单个文件：同一文件系统直接重命名，否则零拷贝复制后删除源文件
+        """
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        try:
+            os.replace(src, dst)
+            return "rename"
+        except OSError:
+            method = FileTools.fast_copy(src, dst)
+            os.unlink(src)
+            return method
+
+    @staticmethod
+    def expand_paths(value):
+        """
+        将路径列表、通配符或以 ; / 换行分隔的多个通配符展开为文件路径列表
+        通配符结果按名称排序，普通路径保持原顺序
+        """
+        if isinstance(value, (list, tuple)):
+            return [str(p) for p in value if p]
+        if not isinstance(value, str):
+            return []
+        paths = []
+        for pattern in value.replace(";", "\n").splitlines():
+            pattern = pattern.strip().strip('"')
+            if not pattern:
                 continue
-                
-            files = os.listdir(temp_file_dir)
-            # 过滤掉临时文件（根据需要调整后缀）
-            valid_files = [f for f in files if not f.endswith('.tmp') and not f.endswith('.crdownload')]
-            
-            if valid_files:
-                # 假设只有一个文件，或者取最新的一个
-                source_file = os.path.join(temp_file_dir, valid_files[0])
-                
-                # 确保目标目录存在
-                os.makedirs(os.path.dirname(save_full_path), exist_ok=True)
-                
-                # 复制文件
-                shutil.copy2(source_file, save_full_path)
-                print(f"文件已复制: {source_file} -> {save_full_path}")
-                return True
-                
-            time.sleep(1)
-        
-        print(f"超时：在 {temp_file_dir} 中未找到下载文件")
-        return False
+            if glob.has_magic(pattern):
+                paths.extend(sorted(p for p in glob.glob(pattern, recursive=True) if os.path.isfile(p)))
+            else:
+                paths.append(pattern)
+        return paths
 
     @staticmethod
-    def clear_directory(directory):
+    def resolve_paths(raw, context):
         """
-        清空指定目录下的所有文件和子目录
+        解析动作参数中的文件列表：{变量名} 引用的列表变量，或含 {变量} 占位符的通配符/路径文本
+        """
+        value = raw
+        if isinstance(value, str) and value.startswith("{") and value.endswith("}") and value[1:-1] in context:
+            value = context[value[1:-1]]
+        if isinstance(value, str):
+            try:
+                value = value.format(**context)
+            except Exception:
+                pass
+        return FileTools.expand_paths(value)
+
+    @staticmethod
+    def bulk_transfer(sources, dest_dir, move=False, link_mode="auto", overwrite=True, workers=4):
+        """
+        并行批量复制/移动文件到目标目录
+        同名的源文件写入同一目标，按输入顺序在同一线程内依次处理（覆盖时后者生效）
+
+        :return: {"done": [目标路径], "skipped": [源路径], "errors": [{"path", "error"}], "methods": {方式: 数量}}
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        action = "移动" if move else "复制"
+
+        def _one(src):
+            target = os.path.join(dest_dir, os.path.basename(src))
+            if not overwrite and os.path.exists(target):
+                return src, target, "skipped", None
+            try:
+                method = FileTools.fast_move(src, target) if move else FileTools.fast_copy(src, target, link_mode)
+                return src, target, method, None
+            except shutil.SameFileError:
+                # 源文件已在目标目录中
+                return src, target, "skipped", None
+            except Exception as e:
+                return src, target, None, str(e)
+
+        # 按目标文件分组，避免多个线程同时写同一个目标
+        groups = {}
+        for src in sources:
+            groups.setdefault(os.path.normcase(os.path.basename(src)), []).append(src)
+        collided = sum(len(g) for g in groups.values() if len(g) > 1)
+        if collided:
+            print(f"批量{action}: {collided} 个源文件同名，将依次写入同一目标")
+
+        result = {"done": [], "skipped": [], "errors": [], "methods": {}}
+        if groups:
+            with ThreadPoolExecutor(max_workers=max(1, min(int(workers or 1), len(groups)))) as pool:
+                outcomes = pool.map(lambda group: [_one(src) for src in group], groups.values())
+                for src, target, method, error in (item for group in outcomes for item in group):
+                    if error:
+                        result["errors"].append({"path": src, "error": error})
+                    elif method == "skipped":
+                        result["skipped"].append(src)
+                    else:
+                        result["done"].append(target)
+                        result["methods"][method] = result["methods"].get(method, 0) + 1
+
+        print(f"批量{action}完成: 成功 {len(result['done'])} 个, 跳过 {len(result['skipped'])} 个, "
+              f"失败 {len(result['errors'])} 个 -> {dest_dir} {result['methods']}")
+        for err in result["errors"][:5]:
+            print(f"  {action}失败: {err['path']} 原因: {err['error']}")
+        return result
+
+    @staticmethod
+    def clear_directory(directory, workers=8):
+        """
+        清空指定目录下的所有文件和子目录（并行删除，只输出汇总日志）
+
+        :return: {"files": 删除文件数, "dirs": 删除目录数, "errors": [{"path", "error"}]}
         """
         print(f"正在清空目录: {directory}")
+        summary = {"files": 0, "dirs": 0, "errors": []}
         if not os.path.exists(directory):
             print(f"目录不存在: {directory}")
-            return
+            return summary
 
-        for filename in os.listdir(directory):
-            file_path = os.path.join(directory, filename)
+        def _remove(entry):
             try:
-                if os.path.isfile(file_path) or os.path.islink(file_path):
-                    os.unlink(file_path)
-                    print(f"已删除文件: {file_path}")
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
-                    print(f"已删除目录: {file_path}")
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                    return "dirs", None
+                os.unlink(entry.path)
+                return "files", None
             except Exception as e:
-                print(f'删除 {file_path} 失败. 原因: {e}')
-        print(f"目录清空完成: {directory}")
+                return None, {"path": entry.path, "error": str(e)}
+
+        with os.scandir(directory) as it:
+            entries = list(it)
+        if entries:
+            with ThreadPoolExecutor(max_workers=max(1, min(int(workers or 1), len(entries)))) as pool:
+                for kind, error in pool.map(_remove, entries):
+                    if error:
+                        summary["errors"].append(error)
+                    else:
+                        summary[kind] += 1
+
+        for err in summary["errors"][:5]:
+            print(f"删除 {err['path']} 失败. 原因: {err['error']}")
+        print(f"目录清空完成: {directory}（文件 {summary['files']} 个, 目录 {summary['dirs']} 个, 失败 {len(summary['errors'])} 个）")
+        return summary
 
     @staticmethod
     def path_exists(path):
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+import itertools
+import threading
+from typing import Any, Dict, List, Sequence, Tuple
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+
+from utils.adaptive_wait import AdaptiveWait
+from utils.element_cache import ElementCache
+
+PATH_SEPARATOR = ">>"
+
+# 进入 frame 后在其文档上打标记；再次"已在目标路径"时核对标记，页面导航（新文档）后标记即消失
+_STAMP_JS = "document.__waFramePath = arguments[0];"
+_CHECK_JS = "return document.__waFramePath || null;"
+
+_PREFIXES = {
+    "css": By.CSS_SELECTOR, "xpath": By.XPATH, "id": By.ID, "name": By.NAME,
+    "tag": By.TAG_NAME, "class": By.CLASS_NAME,
+}
+
+
+class _FrameNotFound(Exception):
+    pass
+
+
+class FramePath:
+    """
+    frame 路径：从顶层文档开始逐级进入的 iframe 列表，例如 "outer >> css:iframe.editor >> index:0"
+
+    每段可写 ID/Name（默认，同 switch_to.frame("名称")）、css:/xpath:/id:/name:/tag:/class: 定位、index:序号，
+    也可以是 {"by", "value"} 字典或 WebElement。
+    按 WebDriver 会话记录当前所在路径，切换时只执行必要的命令：
+    - 有公共前缀时用 parent_frame 回退或回到顶层再进入，取命令更少者；目标与当前路径相同时不切换
+    - 沿用记录的位置前（原地、回退或继续深入）用一次脚本核对所在文档仍是进入时打过标记的那个
+    - iframe 元素句柄按 (窗口, 路径前缀) 缓存，同一页面再次进入无需重新查找；导航后清空
+    - 记录的路径与实际不符（标记不符、句柄失效、外部切换过）时回到顶层按完整路径重新进入
+    """
+
+    _states: Dict[str, Dict[str, Any]] = {}
+    _lock = threading.Lock()
+    _tags = itertools.count(1)
+
+    @staticmethod
+    def _key(driver) -> str:
+        return getattr(driver, "session_id", None) or str(id(driver))
+
+    @classmethod
+    def _state(cls, driver) -> Dict[str, Any]:
+        with cls._lock:
+            return cls._states.setdefault(cls._key(driver), {"path": (), "window": None, "handles": {}, "tag": None})
+
+    @staticmethod
+    def _segment(spec) -> Tuple:
+        if hasattr(spec, "id") and not isinstance(spec, (str, dict)):
+            return ("element", spec.id)
+        if isinstance(spec, int):
+            return ("index", spec)
+        if isinstance(spec, dict):
+            return (_PREFIXES.get(str(spec.get("by", "")).lower(), spec.get("by") or By.CSS_SELECTOR), str(spec.get("value", "")))
+        if isinstance(spec, (list, tuple)) and len(spec) == 2:
+            return (_PREFIXES.get(str(spec[0]).lower(), spec[0]), str(spec[1]))
+        text = str(spec).strip()
+        prefix, sep, rest = text.partition(":")
+        prefix = prefix.strip().lower()
+        if sep and prefix == "index":
+            return ("index", int(rest))
+        if sep and prefix in _PREFIXES:
+            return (_PREFIXES[prefix], rest.strip())
+        return ("frame", text)
+
+    @staticmethod
+    def _locator(segment: Tuple) -> Tuple[str, str]:
+        by, value = segment
+        if by != "frame":
+            return by, value
+        # 与 switch_to.frame("名称") 相同：按 id 或 name 匹配
+        quoted = value.replace("\\", "\\\\").replace('"', '\\"')
+        return By.CSS_SELECTOR, f'iframe[id="{quoted}"], frame[id="{quoted}"], iframe[name="{quoted}"], frame[name="{quoted}"]'
+
+    @classmethod
+    def parse(cls, path) -> Tuple[Tuple, Dict[Tuple, Any]]:
+        """
+        解析路径（字符串用 >> 分隔，或列表）
+        :return: (规范化路径, {路径前缀: WebElement})，后者为路径中直接给出的元素
+        """
+        if path is None or path == "":
+            return (), {}
+        if isinstance(path, str):
+            items: Sequence = [p for p in path.split(PATH_SEPARATOR) if p.strip()]
+        elif isinstance(path, (list, tuple)) and not (len(path) == 2 and isinstance(path[0], str) and path[0].lower() in _PREFIXES):
+            items = path
+        else:
+            items = [path]
+        segments, elements = [], {}
+        for spec in items:
+            segments.append(cls._segment(spec))
+            if segments[-1][0] == "element":
+                elements[tuple(segments)] = spec
+        return tuple(segments), elements
+
+    @classmethod
+    def current(cls, driver) -> Tuple:
+        return cls._state(driver)["path"]
+
+    @classmethod
+    def _set_path(cls, driver, state: Dict[str, Any], path: Tuple) -> None:
+        state["path"] = path
+        state["tag"] = None
+        ElementCache.for_driver(driver).set_frame_path(path)
+
+    @classmethod
+    def _stamp(cls, driver, state: Dict[str, Any]) -> None:
+        """给当前所在的 frame 文档打标记，供之后核对"""
+        if not state["path"]:
+            return
+        tag = f"{cls._key(driver)}:{next(cls._tags)}"
+        try:
+            driver.execute_script(_STAMP_JS, tag)
+            state["tag"] = tag
+        except WebDriverException:
+            state["tag"] = None
+
+    @staticmethod
+    def _still_inside(driver, state: Dict[str, Any]) -> bool:
+        """记录的 frame 文档是否仍是当前文档（导航、外部切换后标记不再匹配）"""
+        if not state["path"]:
+            return True
+        if not state["tag"]:
+            return False
+        try:
+            return driver.execute_script(_CHECK_JS) == state["tag"]
+        except WebDriverException:
+            return False
+
+    @classmethod
+    def on_window_switch(cls, driver, handle: str = None) -> None:
+        """切换窗口后位于新窗口的顶层文档"""
+        state = cls._state(driver)
+        state["window"] = handle
+        cls._set_path(driver, state, ())
+
+    @classmethod
+    def invalidate(cls, driver) -> None:
+        """页面导航后调用（driver.get、脚本跳转等）：回到顶层，丢弃该窗口缓存的 iframe 句柄"""
+        state = cls._state(driver)
+        state["handles"] = {k: v for k, v in state["handles"].items() if k[0] != state["window"]}
+        cls._set_path(driver, state, ())
+
+    @classmethod
+    def forget(cls, driver) -> None:
+        with cls._lock:
+            cls._states.pop(cls._key(driver), None)
+
+    @classmethod
+    def _switch_one(cls, driver, state: Dict[str, Any], prefix: Tuple, elements: Dict[Tuple, Any],
+                    timeout: float, wait: bool) -> None:
+        by, value = prefix[-1]
+        if by == "index":
+            driver.switch_to.frame(int(value))
+            return
+        cache_key = (state["window"], prefix)
+        handle = elements.get(prefix) or state["handles"].get(cache_key)
+        if handle is not None:
+            try:
+                driver.switch_to.frame(handle)
+                state["handles"][cache_key] = handle
+                return
+            except WebDriverException:
+                # 句柄已失效（页面已变化）
+                if by == "element":
+                    raise _FrameNotFound(f"frame 元素已失效: {value}")
+                state["handles"] = {k: v for k, v in state["handles"].items() if k[1][:len(prefix)] != prefix}
+        if by == "element":
+            raise _FrameNotFound(f"frame 元素不可用: {value}")
+        locator = cls._locator(prefix[-1])
+        if wait:
+            handle = AdaptiveWait(driver, timeout).until(EC.presence_of_element_located(locator),
+                                                         f"iframe 未找到: {cls.format(prefix)}")
+        else:
+            found = driver.find_elements(*locator)
+            if not found:
+                raise _FrameNotFound(cls.format(prefix))
+            handle = found[0]
+        driver.switch_to.frame(handle)
+        state["handles"][cache_key] = handle
+
+    @classmethod
+    def _descend(cls, driver, state: Dict[str, Any], target: Tuple, elements: Dict[Tuple, Any],
+                 timeout: float, wait: bool) -> None:
+        for i in range(len(state["path"]), len(target)):
+            prefix = target[:i + 1]
+            cls._switch_one(driver, state, prefix, elements, timeout, wait)
+            cls._set_path(driver, state, prefix)
+
+    @classmethod
+    def enter(cls, driver, path, timeout: float = 20) -> Tuple:
+        """
+        切换到绝对 frame 路径（空路径为顶层文档），返回规范化后的路径
+        找不到 frame 时抛出超时等异常
+        """
+        target, elements = cls.parse(path)
+        return cls._enter(driver, target, elements, timeout)
+
+    @classmethod
+    def enter_child(cls, driver, frame, timeout: float = 20) -> Tuple:
+        """从当前所在位置再进入一级（frame 可为 WebElement、ID/Name 或带前缀的定位）"""
+        segment, elements = cls.parse([frame])
+        target = cls.current(driver) + segment
+        return cls._enter(driver, target, {target: el for el in elements.values()}, timeout)
+
+    @classmethod
+    def _enter(cls, driver, target: Tuple, elements: Dict[Tuple, Any], timeout: float) -> Tuple:
+        state = cls._state(driver)
+        current = state["path"]
+        common = 0
+        while common < min(len(current), len(target)) and current[common] == target[common]:
+            common += 1
+        ups = len(current) - common
+        from_top = bool(ups) and (common == 0 or ups > 1 + common)
+        if current and not from_top and not cls._still_inside(driver, state):
+            # 要沿用记录的位置（原地、parent_frame 回退或继续深入），但页面已导航或被外部切换：
+            # 记录与句柄都不可信，回到顶层重新进入
+            state["handles"] = {k: v for k, v in state["handles"].items() if k[0] != state["window"]}
+            driver.switch_to.default_content()
+            cls._set_path(driver, state, ())
+            current, common, ups = (), 0, 0
+        if current == target:
+            return target
+
+        try:
+            if from_top:
+                driver.switch_to.default_content()
+                cls._set_path(driver, state, ())
+            elif ups:
+                for _ in range(ups):
+                    driver.switch_to.parent_frame()
+                cls._set_path(driver, state, target[:common])
+            # 先按记录的位置直接查找，不等待；失败说明记录不准或页面变了
+            cls._descend(driver, state, target, elements, timeout, wait=False)
+        except (_FrameNotFound, WebDriverException):
+            driver.switch_to.default_content()
+            cls._set_path(driver, state, ())
+            try:
+                cls._descend(driver, state, target, elements, timeout, wait=True)
+            except _FrameNotFound as e:
+                raise WebDriverException(str(e))
+        cls._stamp(driver, state)
+        return target
+
+    @classmethod
+    def reset(cls, driver) -> None:
+        """回到顶层文档（总是发送命令，用于纠正与实际不符的记录）"""
+        driver.switch_to.default_content()
+        cls._set_path(driver, cls._state(driver), ())
+
+    @classmethod
+    def parent(cls, driver, timeout: float = 20) -> Tuple:
+        """回到上一级 frame（同样先核对记录的位置）"""
+        return cls._enter(driver, cls.current(driver)[:-1], {}, timeout)
+
+    @staticmethod
+    def format(path: Sequence) -> str:
+        """规范化路径转为便于阅读的文本"""
+        parts: List[str] = []
+        for by, value in path:
+            parts.append(str(value) if by == "frame" else f"{by}:{value}")
+        return f" {PATH_SEPARATOR} ".join(parts) if parts else "(顶层文档)"
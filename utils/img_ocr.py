@@ -1,18 +1,75 @@
+import base64
+import binascii
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
+from typing import Any, Dict, List, Optional, Union
 from PIL import Image
 
+from utils.ocr_cache import OcrCache
+
 try:
     import ddddocr
 except ImportError:
     ddddocr = None
 
 
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+_JPEG_MAGIC = b"\xff\xd8\xff"
+
+_SHARED_INSTANCE: Optional["ImgOcr"] = None
+_SHARED_LOCK = threading.Lock()
+
+
 class ImgOcr:
     """
     验证码识别器（基于ddddocr）
     支持多种图片格式的PIL Image对象，输出识别结果字符串
+
+    模型加载耗时较长，流程中应通过 ImgOcr.shared() 复用进程内唯一实例
     """
 
+    @classmethod
+    def shared(cls) -> "ImgOcr":
+        """
+        获取进程内共享的识别器（首次调用时加载模型，线程安全）
+        """
+        global _SHARED_INSTANCE
+        if _SHARED_INSTANCE is None:
+            with _SHARED_LOCK:
+                if _SHARED_INSTANCE is None:
+                    instance = cls(show_ad=False)
+                    instance.cache = OcrCache.from_env()
+                    _SHARED_INSTANCE = instance
+        return _SHARED_INSTANCE
+
+    @classmethod
+    def warm_up(cls, background: bool = True) -> None:
+        """
+        预加载共享识别器并执行一次空识别（首次推理有额外初始化开销）
+
+        :param background: 是否在后台线程中执行
+        """
+        def _run():
+            try:
+                ocr = cls.shared()
+                ocr.ocr.classification(Image.new("RGB", (64, 24), "white"))
+                print("[OCR] 模型预热完成")
+            except Exception as e:
+                print(f"[OCR] 模型预热失败: {e}")
+
+        if background:
+            threading.Thread(target=_run, name="OcrWarmUp", daemon=True).start()
+        else:
+            _run()
+
+    @classmethod
+    def warm_up_if_enabled(cls) -> None:
+        """环境变量 OCR_WARMUP=1 时在后台预热（启动时调用）"""
+        if os.environ.get("OCR_WARMUP", "").strip().lower() in ("1", "true", "yes"):
+            cls.warm_up(background=True)
+
     def __init__(self, show_ad: bool = False):
         """
         初始化识别器
@@ -23,40 +80,130 @@ class ImgOcr:
             raise RuntimeError("OCR library 'ddddocr' (or its dependency 'onnxruntime') is not installed or failed to load. Please check your installation.")
             
         self.ocr = ddddocr.DdddOcr(show_ad=show_ad)
+        # 识别结果缓存（共享实例按环境变量启用）
+        self.cache: Optional[OcrCache] = None
 
-    def recognize(self, img: Image.Image) -> str:
+    def recognize(self, img: Union[Image.Image, bytes, str]) -> str:
         """
         识别验证码（支持多种图片格式）
-        
-        :param img: 任意格式的有效PIL Image对象（如PNG、JPG、GIF等）
+
+        PNG/JPEG 的原始字节（文件或 Base64 解码结果）直接交给 ddddocr，不做解码再编码；
+        其他格式或已在内存中修改过的 Image 对象才转换为 RGB PNG。
+
+        :param img: PIL Image对象、图片字节或本地图片路径
         :return: 识别结果文本
         :raises ValueError: 图片对象无效
         :raises RuntimeError: 识别过程中发生错误
         """
+        return self.recognize_with_info(img)["text"]
+
+    def recognize_with_info(self, img: Union[Image.Image, bytes, str], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        识别并返回是否命中缓存
+
+        :return: {"text": 识别结果, "cached": 是否来自缓存}
+        """
         try:
-            # 验证图片有效性
-            self._validate_image(img)
-            
-            # 处理图片并执行识别
-            img_bytes = self._process_image(img)
-            return self.ocr.classification(img_bytes)
+            data = self._to_classifier_bytes(img)
+            cache = self.cache if use_cache else None
+            key = None
+            if cache is not None:
+                key = cache.make_key(data)
+                text = cache.get(key)
+                if text is not None:
+                    return {"text": text, "cached": True}
+            text = self.ocr.classification(data)
+            if cache is not None:
+                cache.put(key, text)
+            return {"text": text, "cached": False}
             
         except ValueError as ve:
             raise ve
         except Exception as e:
             raise RuntimeError(f"验证码识别失败: {str(e)}")
 
+    def recognize_batch(self, images: List[Union[Image.Image, bytes, str]], max_workers: int = 4,
+                        use_cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        批量识别，限制并发数（onnxruntime 推理期间释放 GIL，线程即可并行）
+
+        :param images: PIL Image 对象、图片字节或图片路径列表
+        :param max_workers: 最大并发数
+        :param use_cache: 是否使用识别结果缓存
+        :return: 与输入顺序一致的结果列表 [{"text": str | None, "cached": bool, "error": str | None}]
+        """
+        def _one(item):
+            try:
+                result = self.recognize_with_info(item, use_cache=use_cache)
+                result["error"] = None
+                return result
+            except Exception as e:
+                return {"text": None, "cached": False, "error": str(e)}
+
+        if not images:
+            return []
+        max_workers = max(1, min(int(max_workers or 1), len(images)))
+        if max_workers == 1:
+            return [_one(item) for item in images]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Ocr") as pool:
+            return list(pool.map(_one, images))
+
+    @staticmethod
+    def decode_base64(base64_str: str) -> bytes:
+        """
+        Base64 字符串（可带 data URI 前缀）解码为图片字节，不经过 PIL
+
+        :raises ValueError: Base64 编码无效
+        """
+        if "base64," in base64_str:
+            base64_str = base64_str.split("base64,")[-1]
+        try:
+            return base64.b64decode(base64_str.strip(), validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("无效的 Base64 图片数据")
+
+    @staticmethod
+    def sniff_format(data: bytes) -> Optional[str]:
+        """根据文件头判断 ddddocr 可直接处理的格式（PNG/JPEG），其他返回 None"""
+        if data.startswith(_PNG_MAGIC):
+            return "PNG"
+        if data.startswith(_JPEG_MAGIC):
+            return "JPEG"
+        return None
+
+    def _to_classifier_bytes(self, img: Union[Image.Image, bytes, str]) -> bytes:
+        """
+        准备交给 ddddocr 的字节数据，能直通则直通
+        """
+        if isinstance(img, (bytes, bytearray, memoryview)):
+            data = bytes(img)
+            if not data:
+                raise ValueError("无效的图片对象")
+            if self.sniff_format(data):
+                return data
+            with Image.open(BytesIO(data)) as decoded:
+                return self._process_image(decoded)
+
+        if isinstance(img, (str, os.PathLike)):
+            with open(img, "rb") as f:
+                return self._to_classifier_bytes(f.read())
+
+        self._validate_image(img)
+        # 直接从 PNG/JPEG 文件打开、且未在内存中修改的图片，原始文件字节即可
+        filename = getattr(img, "filename", "")
+        if img.format in ("PNG", "JPEG") and filename and os.path.isfile(filename):
+            with open(filename, "rb") as f:
+                return f.read()
+        return self._process_image(img)
+
     def _validate_image(self, img: Image.Image) -> None:
         """
-        验证图片对象是否有效
+        验证图片对象是否有效（不调用 verify()，verify 之后图片对象将无法再使用）
         
         :param img: PIL Image对象
         :raises ValueError: 图片对象无效
         """
-        try:
-            # 验证图片完整性（会检查文件结构是否合法）
-            img.verify()
-        except Exception:
+        if not isinstance(img, Image.Image) or img.width <= 0 or img.height <= 0:
             raise ValueError("无效的图片对象")
 
     def _process_image(self, img: Image.Image) -> bytes:
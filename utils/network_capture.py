@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+from typing import Dict, List, Optional
+
+from utils.document_script import DocumentScript
+
+# 默认视为“下载”的 Content-Type
+DEFAULT_DOWNLOAD_TYPES = [
+    "application/vnd.ms-excel",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/octet-stream",
+    "application/zip",
+    "application/pdf",
+    "text/csv",
+]
+
+# 页面内 fetch / XHR 钩子：只记录可能是下载的响应，有匹配时立即唤醒等待者
+_HOOK_JS = r"""
+(function () {
+  if (window.__waNet) { return; }
+  var net = window.__waNet = {hits: [], consumed: 0, waiters: []};
+  var boring = /^(text\/(html|css|javascript|plain)|application\/(json|javascript|x-javascript)|image\/|font\/)/i;
+  function record(url, ct, cd) {
+    ct = ct || ''; cd = cd || '';
+    if (!cd && (!ct || boring.test(ct))) { return; }
+    var hit = {url: String(url), content_type: ct, disposition: cd, source: 'hook'};
+    net.hits.push(hit);
+    net.waiters = net.waiters.filter(function (w) { return !w(hit, net.hits.length - 1); });
+  }
+  net.record = record;
+  if (window.fetch) {
+    var origFetch = window.fetch;
+    window.fetch = function () {
+      return origFetch.apply(this, arguments).then(function (resp) {
+        try { record(resp.url, resp.headers.get('content-type'), resp.headers.get('content-disposition')); } catch (e) {}
+        return resp;
+      });
+    };
+  }
+  var origOpen = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__waUrl = url;
+    return origOpen.apply(this, arguments);
+  };
+  var origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    var xhr = this;
+    xhr.addEventListener('readystatechange', function () {
+      if (xhr.readyState === 2) {
+        try {
+          record(xhr.responseURL || xhr.__waUrl, xhr.getResponseHeader('content-type'), xhr.getResponseHeader('content-disposition'));
+        } catch (e) {}
+      }
+    });
+    return origSend.apply(this, arguments);
+  };
+})();
+"""
+
+# 异步等待：已有匹配立即返回，否则注册等待者，超时返回 null
+_WAIT_JS = r"""
+var rules = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+var net = window.__waNet;
+if (!net) { done({error: 'not_installed'}); return; }
+function ok(h) {
+  if (rules.url_contains && h.url.indexOf(rules.url_contains) < 0) { return false; }
+  if (/\.(js|css)(\?|$)/i.test(h.url)) { return false; }
+  var cd = h.disposition.toLowerCase(), ct = h.content_type.toLowerCase();
+  if (cd.indexOf('attachment') >= 0 || cd.indexOf('filename=') >= 0) { return true; }
+  for (var i = 0; i < rules.types.length; i++) { if (ct.indexOf(rules.types[i]) >= 0) { return true; } }
+  return false;
+}
+for (var i = net.consumed; i < net.hits.length; i++) {
+  if (ok(net.hits[i])) { net.consumed = i + 1; done(net.hits[i]); return; }
+}
+var finished = false;
+var timer = setTimeout(function () { finished = true; done(null); }, timeoutMs);
+net.waiters.push(function (hit, index) {
+  if (finished) { return true; }
+  if (!ok(hit)) { return false; }
+  finished = true; clearTimeout(timer); net.consumed = index + 1; done(hit); return true;
+});
+"""
+
+
+class NetworkCapture:
+    """
+    捕获页面产生的下载链接，替代每秒轮询 performance 日志
+
+    - 脚本钩子：注入 fetch/XHR 钩子（Chromium 内核通过 CDP 在每个新文档加载前注入），
+      等待时用一次异步脚本挂起，匹配到响应立即返回
+    - 性能日志：需启用 goog:loggingPrefs performance，用于捕获普通导航/表单提交触发的下载；
+      先按字符串预筛 Network.responseReceived 再解析 JSON
+    """
+
+    _script = DocumentScript(_HOOK_JS)
+
+    @classmethod
+    def install(cls, driver) -> bool:
+        """注入钩子（当前页面 + 之后打开的页面），返回是否成功"""
+        try:
+            cls._script.install(driver)
+            return True
+        except Exception as e:
+            print(f"注入网络监听脚本失败: {e}")
+            return False
+
+    @classmethod
+    def forget(cls, driver) -> None:
+        """浏览器关闭后清除注册记录"""
+        cls._script.forget(driver)
+
+    @staticmethod
+    def build_rules(content_types: Optional[List[str]] = None, url_contains: str = "") -> Dict:
+        types = [t.strip().lower() for t in (content_types or DEFAULT_DOWNLOAD_TYPES) if t and t.strip()]
+        return {"types": types, "url_contains": url_contains or ""}
+
+    @staticmethod
+    def match_response(url: str, headers: Dict, rules: Dict) -> bool:
+        """按 Content-Disposition / Content-Type 规则判断响应是否为下载"""
+        if rules.get("url_contains") and rules["url_contains"] not in url:
+            return False
+        path = url.split("?", 1)[0].lower()
+        if path.endswith(".js") or path.endswith(".css"):
+            return False
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        disposition = str(headers.get("content-disposition", "")).lower()
+        if "attachment" in disposition or "filename=" in disposition:
+            return True
+        content_type = str(headers.get("content-type", "")).lower()
+        return any(t in content_type for t in rules.get("types", []))
+
+    @staticmethod
+    def _wait_hook(driver, rules: Dict, timeout: float) -> Optional[Dict]:
+        """
+        :return: 命中结果；超时返回 None；钩子不可用（未注入/页面已跳转）返回 {"error": ...}
+        """
+        previous = None
+        try:
+            previous = driver.timeouts.script
+        except Exception:
+            pass
+        try:
+            driver.set_script_timeout(timeout + 5)
+            return driver.execute_async_script(_WAIT_JS, rules, int(timeout * 1000))
+        except Exception as e:
+            return {"error": str(e)}
+        finally:
+            if previous is not None:
+                try:
+                    driver.set_script_timeout(previous)
+                except Exception:
+                    pass
+
+    @staticmethod
+    def scan_performance_logs(driver, rules: Dict) -> Optional[str]:
+        """读取一次性能日志，返回第一个匹配的下载链接；未启用性能日志时抛出异常"""
+        for entry in driver.get_log("performance"):
+            raw = entry.get("message", "")
+            # 绝大多数日志不是 responseReceived，先做字符串预筛，避免逐条 JSON 解析
+            if "Network.responseReceived" not in raw:
+                continue
+            try:
+                message = json.loads(raw)["message"]
+                if message.get("method") != "Network.responseReceived":
+                    continue
+                response = message["params"]["response"]
+                if NetworkCapture.match_response(response.get("url", ""), response.get("headers", {}), rules):
+                    return response["url"]
+            except Exception:
+                continue
+        return None
+
+    @staticmethod
+    def wait_for_download_url(driver, timeout: float = 20, mode: str = "auto",
+                              content_types: Optional[List[str]] = None, url_contains: str = "",
+                              slice_seconds: float = 0.5) -> Optional[str]:
+        """
+        等待下载链接
+
+        :param mode: "hook" 仅脚本钩子；"log" 仅性能日志；"auto" 两者交替（钩子挂起 slice_seconds 后检查一次日志）
+        """
+        rules = NetworkCapture.build_rules(content_types, url_contains)
+        end_time = time.time() + timeout
+        use_hook = mode in ("auto", "hook")
+        use_log = mode in ("auto", "log")
+        print(f"正在监听网络以捕获下载链接（{mode}）...")
+
+        while True:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                return None
+
+            if use_log:
+                try:
+                    url = NetworkCapture.scan_performance_logs(driver, rules)
+                    if url:
+                        print(f"捕获到下载链接(性能日志): {url}")
+                        return url
+                except Exception:
+                    if mode == "log":
+                        print("性能日志不可用（需启用 goog:loggingPrefs performance）")
+                        return None
+                    use_log = False
+
+            if use_hook:
+                wait = remaining if not use_log else min(slice_seconds, remaining)
+                hit = NetworkCapture._wait_hook(driver, rules, wait)
+                if hit and not hit.get("error"):
+                    print(f"捕获到下载链接(脚本钩子): {hit['url']}")
+                    return hit["url"]
+                if hit and hit.get("error"):
+                    # 页面跳转后钩子丢失（非 Chromium 时不会自动注入），重新注入当前页面
+                    if not NetworkCapture.install(driver) and not use_log:
+                        return None
+                    if not use_log:
+                        time.sleep(min(0.1, max(0.0, end_time - time.time())))
+            elif use_log:
+                time.sleep(min(slice_seconds, max(0.0, end_time - time.time())))
+            else:
+                return None
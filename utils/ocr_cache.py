@@ -0,0 +1,110 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class OcrCache:
+    """
+    OCR 结果缓存：以图片字节的内容哈希为键
+    内存 LRU + 可选 SQLite 持久化，均按 TTL 过期
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: str = "", ttl: float = 86400):
+        """
+        :param max_entries: 内存中最多缓存的条目数（0 表示禁用内存缓存）
+        :param db_path: SQLite 文件路径（为空则不落盘）
+        :param ttl: 过期时间（秒，0 表示永不过期）
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = float(ttl or 0)
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._open_db(db_path)
+
+    @classmethod
+    def from_env(cls) -> "OcrCache":
+        """按环境变量 OCR_CACHE_SIZE / OCR_CACHE_DB / OCR_CACHE_TTL 创建"""
+        def _num(name, default):
+            try:
+                return float(os.environ.get(name, default))
+            except ValueError:
+                return default
+        return cls(max_entries=int(_num("OCR_CACHE_SIZE", 1024)),
+                   db_path=os.environ.get("OCR_CACHE_DB", "").strip(),
+                   ttl=_num("OCR_CACHE_TTL", 86400))
+
+    @staticmethod
+    def make_key(data: bytes) -> str:
+        """图片内容哈希（blake2b，速度与 md5 相当）"""
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _open_db(self, db_path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS ocr_cache (key TEXT PRIMARY KEY, text TEXT, created REAL)")
+        self._db.commit()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl > 0 and time.time() - created > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """命中返回识别结果，未命中或已过期返回 None"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT text, created FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    if not self._expired(row[1]):
+                        self._remember(key, row[0], row[1])
+                        self.hits += 1
+                        return row[0]
+                    self._db.execute("DELETE FROM ocr_cache WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, text, now)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO ocr_cache (key, text, created) VALUES (?, ?, ?)", (key, text, now))
+                self._db.commit()
+
+    def _remember(self, key: str, text: str, created: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (text, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM ocr_cache")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import time
+from typing import Dict, Optional
+
+from utils.document_script import DocumentScript
+
+# 页面活动记录：进行中的 fetch/XHR 数量（文档 load 之前也算作忙）、最近一次网络活动与 DOM 变化时间
+_ACTIVITY_JS = r"""
+(function () {
+  if (window.__waActivity) { return; }
+  var act = window.__waActivity = {pending: 0, lastNet: Date.now(), lastDom: Date.now()};
+  function begin() { act.pending++; act.lastNet = Date.now(); }
+  function end() { act.pending = Math.max(0, act.pending - 1); act.lastNet = Date.now(); }
+  if (document.readyState !== 'complete') {
+    begin();
+    window.addEventListener('load', end, {once: true});
+  }
+  if (window.fetch) {
+    var origFetch = window.fetch;
+    window.fetch = function () {
+      begin();
+      try {
+        return origFetch.apply(this, arguments).then(function (r) { end(); return r; }, function (e) { end(); throw e; });
+      } catch (e) { end(); throw e; }
+    };
+  }
+  var origSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    begin();
+    this.addEventListener('loadend', end, {once: true});
+    try { return origSend.apply(this, arguments); } catch (e) { end(); throw e; }
+  };
+  try {
+    // 图片、脚本等静态资源不经过 fetch/XHR，用资源时间线补充最近活动时间
+    new PerformanceObserver(function () { act.lastNet = Date.now(); }).observe({type: 'resource'});
+  } catch (e) {}
+  new MutationObserver(function () { act.lastDom = Date.now(); })
+    .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+# 在页面内计时判断是否安静，满足条件或超时才返回，只占用一次 WebDriver 往返
+_WAIT_QUIET_JS = r"""
+var opts = arguments[0], done = arguments[arguments.length - 1];
+var act = window.__waActivity;
+if (!act) { done({error: 'not_installed'}); return; }
+var start = Date.now();
+function check() {
+  var now = Date.now();
+  var netOk = !opts.network_ms || (act.pending === 0 && now - act.lastNet >= opts.network_ms);
+  var domOk = !opts.dom_ms || now - act.lastDom >= opts.dom_ms;
+  if (netOk && domOk) { done({ok: true, pending: act.pending, waited: now - start}); return; }
+  if (now - start >= opts.timeout_ms) { done({ok: false, pending: act.pending, waited: now - start}); return; }
+  setTimeout(check, opts.interval);
+}
+check();
+"""
+
+
+class PageWait:
+    """
+    页面就绪等待：网络空闲 / DOM 稳定，替代固定时长的延时
+
+    - 网络空闲：没有进行中的 fetch/XHR，且最近 N 毫秒内没有网络活动（含静态资源）
+    - DOM 稳定：最近 N 毫秒内没有 DOM 变化（MutationObserver）
+    Chromium 内核通过 CDP 在每个新文档加载前注入记录脚本，因此导航前调用 install 可统计到页面自身发起的请求
+    """
+
+    _script = DocumentScript(_ACTIVITY_JS)
+
+    @classmethod
+    def install(cls, driver) -> bool:
+        """注入活动记录脚本（当前页面 + 之后打开的页面），返回是否成功"""
+        try:
+            cls._script.install(driver)
+            return True
+        except Exception as e:
+            print(f"注入页面活动监听脚本失败: {e}")
+            return False
+
+    @classmethod
+    def forget(cls, driver) -> None:
+        """浏览器关闭后清除注册记录"""
+        cls._script.forget(driver)
+
+    @staticmethod
+    def _run_wait(driver, options: Dict, timeout: float) -> Optional[Dict]:
+        previous = None
+        try:
+            previous = driver.timeouts.script
+        except Exception:
+            pass
+        try:
+            driver.set_script_timeout(timeout + 5)
+            return driver.execute_async_script(_WAIT_QUIET_JS, options)
+        except Exception as e:
+            return {"error": str(e)}
+        finally:
+            if previous is not None:
+                try:
+                    driver.set_script_timeout(previous)
+                except Exception:
+                    pass
+
+    @staticmethod
+    def wait_quiet(driver, network_idle_ms: int = 0, dom_stable_ms: int = 0, timeout: float = 20) -> bool:
+        """
+        等待页面安静（两个条件都给出时需同时满足）
+
+        :param network_idle_ms: 网络空闲持续时长（毫秒），0 表示不检查
+        :param dom_stable_ms: DOM 无变化持续时长（毫秒），0 表示不检查
+        :return: 是否在超时前满足条件
+        """
+        network_idle_ms = max(0, int(network_idle_ms or 0))
+        dom_stable_ms = max(0, int(dom_stable_ms or 0))
+        if not network_idle_ms and not dom_stable_ms:
+            return True
+        shortest = min(ms for ms in (network_idle_ms, dom_stable_ms) if ms)
+        interval = max(10, min(100, shortest // 4))
+        end_time = time.time() + timeout
+
+        while True:
+            remaining = end_time - time.time()
+            if remaining <= 0:
+                return False
+            result = PageWait._run_wait(driver, {
+                "network_ms": network_idle_ms,
+                "dom_ms": dom_stable_ms,
+                "timeout_ms": int(remaining * 1000),
+                "interval": interval,
+            }, remaining)
+            if result and result.get("error"):
+                # 页面跳转后记录脚本丢失（非 Chromium 不会自动注入），重新注入后继续等待
+                if not PageWait.install(driver):
+                    return False
+                time.sleep(min(0.1, max(0.0, end_time - time.time())))
+                continue
+            return bool(result and result.get("ok"))
+
+    @staticmethod
+    def wait_network_idle(driver, idle_ms: int = 500, timeout: float = 20) -> bool:
+        print(f"等待网络空闲 {idle_ms}ms, 超时: {timeout}秒")
+        ok = PageWait.wait_quiet(driver, network_idle_ms=idle_ms, timeout=timeout)
+        print("网络已空闲" if ok else "等待网络空闲超时")
+        return ok
+
+    @staticmethod
+    def wait_dom_stable(driver, idle_ms: int = 500, timeout: float = 20) -> bool:
+        print(f"等待 DOM 稳定 {idle_ms}ms, 超时: {timeout}秒")
+        ok = PageWait.wait_quiet(driver, dom_stable_ms=idle_ms, timeout=timeout)
+        print("DOM 已稳定" if ok else "等待 DOM 稳定超时")
+        return ok
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from utils.file_tools import FileTools
+
+# 不复制：浏览器运行时锁文件与各类缓存（缓存可用共享磁盘缓存目录替代）
+SKIP_NAMES = {
+    "SingletonLock", "SingletonCookie", "SingletonSocket", "lockfile", "LOCK",
+    "Cache", "Code Cache", "GPUCache", "ShaderCache", "GrShaderCache", "GraphiteDawnCache", "DawnCache",
+    "Crashpad", "BrowserMetrics", "Service Worker", "blob_storage",
+}
+
+# 浏览器只读取、不原地修改的目录（扩展与组件数据），可硬链接共享
+IMMUTABLE_DIRS = {
+    "Extensions", "WidevineCdm", "hyphen-data", "ZxcvbnData", "MEIPreload", "SSLErrorAssistant",
+    "FileTypePolicies", "CertificateRevocation", "OriginTrials", "Subresource Filter", "Dictionaries",
+    "TrustTokenKeyCommitments", "Crowd Deny", "FirstPartySetsPreloaded", "OnDeviceHeadSuggestModel",
+    "pnacl", "AutofillStates", "PKIMetadata", "Safe Browsing",
+}
+
+# LevelDB 的 .ldb 表文件写入后不再修改（只会被删除），同样可硬链接
+IMMUTABLE_SUFFIXES = (".ldb",)
+
+
+class ProfileManager:
+    """
+    浏览器用户数据目录的模板克隆
+
+    准备好一个“模板”用户数据目录（登录、扩展、设置完成后关闭浏览器），
+    每个会话从模板克隆一份独立目录，互不加锁：
+    - 只读部分（扩展、组件数据、LevelDB 表文件）硬链接
+    - 其余文件（SQLite、Preferences 等会被原地修改）尽量 reflink 写时复制，否则复制
+    克隆目录在关闭浏览器、流程结束或进程退出时删除
+    """
+
+    _clones: Dict[str, Dict] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _is_immutable(rel_path: str) -> bool:
+        parts = rel_path.replace("\\", "/").split("/")
+        return any(p in IMMUTABLE_DIRS for p in parts[:-1]) or parts[-1].endswith(IMMUTABLE_SUFFIXES)
+
+    @classmethod
+    def clone(cls, template_dir: str, base_dir: str = None, run_id=None, workers: int = 8) -> str:
+        """
+        克隆模板目录
+        :param base_dir: 克隆目录的父目录（默认系统临时目录，需与模板同一文件系统才能硬链接/reflink）
+        :param run_id: 所属流程运行标识，流程结束时统一清理
+        :return: 克隆目录路径
+        """
+        if not os.path.isdir(template_dir):
+            raise FileNotFoundError(f"模板用户数据目录不存在: {template_dir}")
+        if base_dir:
+            os.makedirs(base_dir, exist_ok=True)
+        clone_dir = tempfile.mkdtemp(prefix="wa_profile_", dir=base_dir)
+
+        files = []
+        for root, dirs, names in os.walk(template_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_NAMES]
+            rel_root = os.path.relpath(root, template_dir)
+            target_root = clone_dir if rel_root == "." else os.path.join(clone_dir, rel_root)
+            os.makedirs(target_root, exist_ok=True)
+            for name in names:
+                if name in SKIP_NAMES:
+                    continue
+                rel = name if rel_root == "." else os.path.join(rel_root, name)
+                files.append(rel)
+
+        stats = {"hardlink": 0, "reflink": 0, "zero-copy": 0, "copy": 0}
+
+        def _one(rel):
+            src = os.path.join(template_dir, rel)
+            if os.path.islink(src):
+                return None
+            mode = "hardlink" if cls._is_immutable(rel) else "auto"
+            return FileTools.fast_copy(src, os.path.join(clone_dir, rel), link_mode=mode)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+                for method in pool.map(_one, files):
+                    if method:
+                        stats[method] = stats.get(method, 0) + 1
+        except Exception:
+            shutil.rmtree(clone_dir, ignore_errors=True)
+            raise
+
+        with cls._lock:
+            cls._clones[clone_dir] = {"template": template_dir, "run_id": run_id, "driver": None}
+        print(f"[Profile] 已从模板克隆用户数据目录: {clone_dir} {stats}")
+        return clone_dir
+
+    @classmethod
+    def attach(cls, clone_dir: str, driver) -> None:
+        """记录克隆目录所属的浏览器，关闭浏览器时一并清理"""
+        with cls._lock:
+            if clone_dir in cls._clones:
+                cls._clones[clone_dir]["driver"] = driver
+
+    @staticmethod
+    def _in_use(info: Dict) -> bool:
+        """浏览器仍在运行（例如 detach 模式流程结束后保留窗口）时不能删除其目录"""
+        driver = info.get("driver")
+        if driver is None:
+            return False
+        try:
+            driver.current_window_handle
+            return True
+        except Exception:
+            return False
+
+    @classmethod
+    def release(cls, clone_dir: str) -> None:
+        with cls._lock:
+            cls._clones.pop(clone_dir, None)
+        shutil.rmtree(clone_dir, ignore_errors=True)
+
+    @classmethod
+    def release_driver(cls, driver) -> Optional[str]:
+        """删除该浏览器使用的克隆目录（需在 driver.quit() 之后调用）"""
+        with cls._lock:
+            clone_dir = next((d for d, info in cls._clones.items() if info["driver"] is driver), None)
+        if clone_dir:
+            cls.release(clone_dir)
+        return clone_dir
+
+    @classmethod
+    def release_run(cls, run_id) -> int:
+        """删除该次运行创建、且浏览器已关闭的克隆目录"""
+        with cls._lock:
+            items = [(d, info) for d, info in cls._clones.items() if info["run_id"] == run_id]
+        released = 0
+        for clone_dir, info in items:
+            if not cls._in_use(info):
+                cls.release(clone_dir)
+                released += 1
+        return released
+
+    @classmethod
+    def release_all(cls) -> None:
+        with cls._lock:
+            items = list(cls._clones.items())
+        for clone_dir, info in items:
+            if not cls._in_use(info):
+                cls.release(clone_dir)
+
+
+atexit.register(ProfileManager.release_all)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+import base64
+import hashlib
+import json
+import os
+import secrets
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from utils.element_cache import ElementCache
+from utils.frame_path import FramePath
+
+try:
+    from cryptography.exceptions import InvalidTag
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+    InvalidTag = ValueError
+
+DEFAULT_SNAPSHOT_DIR = "sessions"
+KEY_ENV = "WEB_SESSION_KEY"
+KEY_DIR_ENV = "WEB_SESSION_KEY_DIR"
+KEY_FILE_NAME = "session.key"
+
+_MAGIC = b"WAS2"
+_PBKDF2_ROUNDS = 310_000
+_SALT_SIZE = 16
+_NONCE_SIZE = 12
+
+_READ_STORAGE_JS = """
+function dump(s) { var o = {}; for (var i = 0; i < s.length; i++) { var k = s.key(i); o[k] = s.getItem(k); } return o; }
+return {origin: location.origin, local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_WRITE_STORAGE_JS = """
+var local = arguments[0] || {}, session = arguments[1] || {};
+Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });
+Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });
+"""
+
+
+def _require_crypto() -> None:
+    if AESGCM is None:
+        raise RuntimeError("登录状态快照需要 cryptography 库，请执行 pip install cryptography")
+
+
+def _key_dir() -> str:
+    """本机密钥所在目录：用户配置目录，与快照目录分开"""
+    override = os.environ.get(KEY_DIR_ENV, "").strip()
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "ViewAuto")
+    base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "viewauto")
+
+
+def _dpapi(data: bytes, protect: bool) -> bytes:
+    """Windows DPAPI：密钥绑定当前用户，复制到其他账户或机器上无法解开"""
+    import ctypes
+    from ctypes import wintypes
+
+    class _Blob(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    buf = ctypes.create_string_buffer(data, len(data))
+    blob_in, blob_out = _Blob(len(data), buf), _Blob()
+    crypt32 = ctypes.windll.crypt32
+    func = crypt32.CryptProtectData if protect else crypt32.CryptUnprotectData
+    if not func(ctypes.byref(blob_in), None, None, None, None, 0, ctypes.byref(blob_out)):
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+class SessionSnapshot:
+    """
+    登录状态快照：指定域名的 Cookies + localStorage + sessionStorage，加密保存到本地文件
+
+    - 加密：AES-256-GCM（cryptography 库），密钥由口令（或本机密钥）经 PBKDF2 派生，
+      文件头作为附加认证数据，文件被篡改或口令错误时视为无效
+    - 本机密钥保存在用户配置目录（不与快照放在一起），Windows 上用 DPAPI 加密存放
+    - 过期：保存时记录 expires_at（最长有效期，以及可选的关键 Cookie 最早过期时间）
+    - 写入为临时文件 + 原子替换，多个浏览器会话可同时读取同一快照
+    """
+
+    @staticmethod
+    def default_path(domain: str) -> str:
+        safe = "".join(c if c.isalnum() or c in ".-_" else "_" for c in domain) or "default"
+        return os.path.join(DEFAULT_SNAPSHOT_DIR, f"{safe}.session")
+
+    @staticmethod
+    def key_path() -> str:
+        return os.path.join(_key_dir(), KEY_FILE_NAME)
+
+    @classmethod
+    def _machine_key(cls) -> bytes:
+        """读取（必要时生成）本机密钥"""
+        key_path = cls.key_path()
+        if not os.path.exists(key_path):
+            os.makedirs(os.path.dirname(key_path), exist_ok=True)
+            key = secrets.token_bytes(32)
+            stored = _dpapi(key, protect=True) if sys.platform == "win32" else key
+            try:
+                fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(stored)
+            except FileExistsError:
+                # 并发会话已生成
+                time.sleep(0.05)
+        with open(key_path, "rb") as f:
+            stored = f.read()
+        return _dpapi(stored, protect=False) if sys.platform == "win32" else stored
+
+    @classmethod
+    def _secret(cls, password: str = "") -> bytes:
+        """口令优先，其次环境变量 WEB_SESSION_KEY，最后使用本机密钥"""
+        secret = password or os.environ.get(KEY_ENV, "")
+        if secret:
+            return secret.encode("utf-8")
+        return cls._machine_key()
+
+    @staticmethod
+    def _derive(secret: bytes, salt: bytes) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", secret, salt, _PBKDF2_ROUNDS, dklen=32)
+
+    @classmethod
+    def encrypt(cls, payload: Dict, password: str = "") -> bytes:
+        _require_crypto()
+        salt, nonce = secrets.token_bytes(_SALT_SIZE), secrets.token_bytes(_NONCE_SIZE)
+        header = _MAGIC + salt + nonce
+        body = AESGCM(cls._derive(cls._secret(password), salt)).encrypt(
+            nonce, json.dumps(payload, ensure_ascii=False).encode("utf-8"), header)
+        return base64.b64encode(header + body)
+
+    @classmethod
+    def decrypt(cls, blob: bytes, password: str = "") -> Optional[Dict]:
+        """解密失败（口令错误/文件损坏/被篡改/旧格式）返回 None"""
+        _require_crypto()
+        try:
+            raw = base64.b64decode(blob, validate=True)
+        except Exception:
+            return None
+        head_size = len(_MAGIC) + _SALT_SIZE + _NONCE_SIZE
+        if len(raw) < head_size + 16 or not raw.startswith(_MAGIC):
+            return None
+        salt, nonce = raw[len(_MAGIC):len(_MAGIC) + _SALT_SIZE], raw[len(_MAGIC) + _SALT_SIZE:head_size]
+        try:
+            plain = AESGCM(cls._derive(cls._secret(password), salt)).decrypt(nonce, raw[head_size:], raw[:head_size])
+            return json.loads(plain.decode("utf-8"))
+        except (InvalidTag, ValueError):
+            return None
+
+    @staticmethod
+    def _domain_matches(cookie_domain: str, domain: str) -> bool:
+        cookie_domain = (cookie_domain or "").lstrip(".").lower()
+        domain = domain.lstrip(".").lower()
+        return cookie_domain == domain or cookie_domain.endswith("." + domain) or domain.endswith("." + cookie_domain)
+
+    @classmethod
+    def capture(cls, driver, domain: str = "", max_age_hours: float = 12, required_cookies: List[str] = None) -> Dict:
+        """读取当前页面所在源的存储与该域名下的 Cookies"""
+        storage = driver.execute_script(_READ_STORAGE_JS)
+        origin = storage.get("origin", "")
+        domain = domain or (urlparse(origin).hostname or "")
+
+        cookies = None
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                # CDP 可一次取到所有子域的 Cookies（含 HttpOnly）
+                cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+                # 保留 sameSite（SameSite=None 的跨站/SSO Cookie 恢复时不能退化为 Lax）与精确的过期时间
+                cookies = [{"name": c["name"], "value": c["value"], "domain": c.get("domain", ""), "path": c.get("path", "/"),
+                            "secure": c.get("secure", False), "httpOnly": c.get("httpOnly", False),
+                            **({"sameSite": c["sameSite"]} if c.get("sameSite") else {}),
+                            **({"expiry": c["expires"]} if c.get("expires", -1) > 0 else {})} for c in cookies]
+            except Exception:
+                cookies = None
+        if cookies is None:
+            cookies = driver.get_cookies()
+        cookies = [c for c in cookies if cls._domain_matches(c.get("domain", domain), domain)]
+
+        now = time.time()
+        expires_at = now + max_age_hours * 3600 if max_age_hours else None
+        for name in required_cookies or []:
+            expiry = next((c.get("expiry") for c in cookies if c["name"] == name), None)
+            if expiry is not None:
+                expires_at = expiry if expires_at is None else min(expires_at, expiry)
+        return {"domain": domain, "origin": origin, "created": now, "expires_at": expires_at,
+                "required_cookies": list(required_cookies or []),
+                "cookies": cookies, "local_storage": storage.get("local", {}), "session_storage": storage.get("session", {})}
+
+    @staticmethod
+    def is_valid(snapshot: Optional[Dict]) -> bool:
+        if not snapshot:
+            return False
+        expires_at = snapshot.get("expires_at")
+        if expires_at is not None and time.time() >= expires_at:
+            return False
+        names = {c["name"] for c in snapshot.get("cookies", [])}
+        return all(name in names for name in snapshot.get("required_cookies", []))
+
+    @classmethod
+    def save(cls, path: str, snapshot: Dict, password: str = "") -> str:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls.encrypt(snapshot, password))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str, password: str = "") -> Optional[Dict]:
+        """读取快照；文件不存在、无法解密或已过期返回 None"""
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            snapshot = cls.decrypt(f.read(), password)
+        if snapshot is None:
+            print(f"登录状态快照无法解密: {path}")
+            return None
+        if not cls.is_valid(snapshot):
+            print(f"登录状态快照已过期: {path}")
+            return None
+        return snapshot
+
+    @classmethod
+    def apply(cls, driver, snapshot: Dict) -> None:
+        """
+        把快照写回浏览器：Cookies 优先用 CDP 一次写入（无需先打开该域名），
+        存储需在对应源的页面上写入，必要时先打开 origin
+        """
+        now = time.time()
+        cookies = [c for c in snapshot.get("cookies", []) if not c.get("expiry") or c["expiry"] > now]
+        origin = snapshot.get("origin", "")
+        has_storage = snapshot.get("local_storage") or snapshot.get("session_storage")
+
+        current_origin = ""
+        try:
+            parsed = urlparse(driver.current_url)
+            current_origin = f"{parsed.scheme}://{parsed.netloc}"
+        except Exception:
+            pass
+
+        cdp_done = False
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                params = [{"name": c["name"], "value": c["value"], "domain": c.get("domain", ""), "path": c.get("path", "/"),
+                           "secure": c.get("secure", False), "httpOnly": c.get("httpOnly", False),
+                           **({"sameSite": c["sameSite"]} if c.get("sameSite") else {}),
+                           **({"expires": c["expiry"]} if c.get("expiry") else {})} for c in cookies]
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+                cdp_done = True
+            except Exception:
+                cdp_done = False
+
+        if origin and current_origin != origin and (has_storage or not cdp_done):
+            driver.get(origin)
+            FramePath.invalidate(driver)
+            ElementCache.for_driver(driver).invalidate()
+        if not cdp_done:
+            for cookie in cookies:
+                data = {k: cookie[k] for k in ("name", "value", "path", "domain", "secure", "httpOnly", "sameSite", "expiry") if k in cookie}
+                if "expiry" in data:
+                    # WebDriver 要求整数秒
+                    data["expiry"] = int(data["expiry"])
+                try:
+                    driver.add_cookie(data)
+                except Exception:
+                    # 域名与当前页面不完全一致时去掉 domain 重试
+                    data.pop("domain", None)
+                    try:
+                        driver.add_cookie(data)
+                    except Exception as e:
+                        print(f"写入 Cookie 失败 {cookie.get('name')}: {e}")
+        if has_storage:
+            driver.execute_script(_WRITE_STORAGE_JS, snapshot.get("local_storage", {}), snapshot.get("session_storage", {}))
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from utils.frame_path import FramePath
+
+# 非阻塞导航：在旧文档上打标记后跳转，新文档没有该标记即说明导航已提交
+_NAVIGATE_JS = "document.__waTabNav = 1; window.location.href = arguments[0];"
+_READY_JS = "return document.__waTabNav ? 'pending' : document.readyState;"
+
+
+def switch_window(driver, handle: str) -> None:
+    """切换窗口，同时把记录的 frame 路径重置为新窗口的顶层文档"""
+    driver.switch_to.window(handle)
+    FramePath.on_window_switch(driver, handle)
+
+
+class WindowIndex:
+    """
+    窗口句柄 -> URL 索引（按 WebDriver 会话缓存）
+
+    Chromium 内核通过一次 CDP Target.getTargets 取得全部标签页的 URL（窗口句柄即 targetId），
+    无需逐个切换窗口；其他浏览器使用缓存，只对未知句柄切换读取一次 URL。
+    """
+
+    _maps: Dict[str, Dict[str, str]] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(driver) -> str:
+        return getattr(driver, "session_id", None) or str(id(driver))
+
+    @classmethod
+    def remember(cls, driver, handle: str, url: str) -> None:
+        with cls._lock:
+            cls._maps.setdefault(cls._key(driver), {})[handle] = url
+
+    @classmethod
+    def forget(cls, driver, handle: str = None) -> None:
+        with cls._lock:
+            if handle is None:
+                cls._maps.pop(cls._key(driver), None)
+            else:
+                cls._maps.get(cls._key(driver), {}).pop(handle, None)
+
+    @staticmethod
+    def _cdp_targets(driver, handles: List[str]) -> Optional[Dict[str, str]]:
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return None
+        try:
+            infos = driver.execute_cdp_cmd("Target.getTargets", {}).get("targetInfos", [])
+        except Exception:
+            return None
+        urls = {info.get("targetId"): info.get("url", "") for info in infos if info.get("type") == "page"}
+        mapping = {h: urls[h] for h in handles if h in urls}
+        # 句柄与 targetId 对不上（非 chromedriver）时放弃 CDP 结果
+        return mapping if len(mapping) == len(handles) else None
+
+    @classmethod
+    def snapshot(cls, driver, refresh: bool = False) -> Dict[str, str]:
+        """
+        当前全部窗口的 {句柄: URL}
+        :param refresh: 非 Chromium 时是否忽略缓存、逐个切换重新读取
+        """
+        handles = list(driver.window_handles)
+        mapping = cls._cdp_targets(driver, handles)
+        if mapping is not None:
+            with cls._lock:
+                cls._maps[cls._key(driver)] = dict(mapping)
+            return mapping
+
+        with cls._lock:
+            cached = dict(cls._maps.get(cls._key(driver), {}))
+        mapping = {h: cached[h] for h in handles if h in cached and not refresh}
+        unknown = [h for h in handles if h not in mapping]
+        if unknown:
+            try:
+                original = driver.current_window_handle
+            except Exception:
+                original = None
+            for handle in unknown:
+                switch_window(driver, handle)
+                mapping[handle] = driver.current_url
+            if original and original in handles:
+                switch_window(driver, original)
+        with cls._lock:
+            cls._maps[cls._key(driver)] = dict(mapping)
+        return mapping
+
+    @classmethod
+    def find(cls, driver, url_substring: str) -> Optional[str]:
+        """
+        查找 URL 包含子串的窗口并切换过去，返回句柄；找不到返回 None
+        缓存命中后会核对一次实际 URL，缓存过期时整体刷新再找
+        """
+        for refresh in (False, True):
+            for handle, url in cls.snapshot(driver, refresh=refresh).items():
+                if url_substring not in url:
+                    continue
+                switch_window(driver, handle)
+                current = driver.current_url
+                cls.remember(driver, handle, current)
+                if url_substring in current:
+                    return handle
+        return None
+
+
+class TabPool:
+    """
+    在一个浏览器中打开多个标签页，轮流派发 URL，使各标签页的页面加载相互重叠
+
+    WebDriver 同一时刻只能操作一个标签页：导航通过脚本发起后立即返回，
+    处理某个已就绪标签页的同时，其余标签页仍在后台加载。
+    """
+
+    def __init__(self, driver, size: int = 4, ready_state: str = "complete", poll_interval: float = 0.05):
+        """
+        :param size: 标签页数量（包含当前标签页）
+        :param ready_state: 视为就绪的 document.readyState（complete / interactive）
+        """
+        self.driver = driver
+        self.ready_states = ("interactive", "complete") if ready_state == "interactive" else ("complete",)
+        self.poll_interval = poll_interval
+        self.original = driver.current_window_handle
+        self.handles: List[str] = [self.original]
+        self._opened: List[str] = []
+        for _ in range(max(1, int(size)) - 1):
+            driver.switch_to.new_window("tab")
+            handle = driver.current_window_handle
+            FramePath.on_window_switch(driver, handle)
+            self.handles.append(handle)
+            self._opened.append(handle)
+        # 句柄 -> (任务序号, URL, 开始时间)，按派发先后排列
+        self._busy: "OrderedDict[str, Tuple[int, str, float]]" = OrderedDict()
+
+    @property
+    def idle_handles(self) -> List[str]:
+        return [h for h in self.handles if h not in self._busy]
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._busy)
+
+    def navigate(self, handle: str, index: int, url: str) -> None:
+        """在指定标签页发起导航（不等待加载）"""
+        switch_window(self.driver, handle)
+        self.driver.execute_script(_NAVIGATE_JS, url)
+        FramePath.invalidate(self.driver)
+        self._busy[handle] = (index, url, time.time())
+        WindowIndex.remember(self.driver, handle, url)
+
+    def next_ready(self, timeout: float = 30) -> Tuple[Optional[str], int, str, bool]:
+        """
+        等待任一加载中的标签页就绪并切换过去（先派发的优先）
+        :return: (句柄, 任务序号, URL, 是否就绪)；超时的标签页返回 是否就绪=False
+        """
+        while self._busy:
+            now = time.time()
+            for handle, (index, url, started) in list(self._busy.items()):
+                switch_window(self.driver, handle)
+                try:
+                    state = self.driver.execute_script(_READY_JS)
+                except Exception:
+                    state = "pending"
+                if state in self.ready_states or now - started >= timeout:
+                    del self._busy[handle]
+                    return handle, index, url, state in self.ready_states
+            time.sleep(self.poll_interval)
+        return None, -1, "", False
+
+    def close(self) -> None:
+        """关闭池中新开的标签页并回到原标签页"""
+        for handle in self._opened:
+            try:
+                switch_window(self.driver, handle)
+                self.driver.close()
+            except Exception:
+                pass
+            WindowIndex.forget(self.driver, handle)
+        try:
+            switch_window(self.driver, self.original)
+        except Exception:
+            pass
+        self._busy.clear()
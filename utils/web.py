@@ -2,15 +2,16 @@
 
 import os
 import time
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
 
-
-import json
-import requests
-from pathlib import Path
+from utils.download_manager import DownloadManager, DEFAULT_CHUNK_SIZE
+from utils.network_capture import NetworkCapture
+from utils.page_wait import PageWait
+from utils.tab_pool import WindowIndex
+from utils.frame_path import FramePath
+from utils.adaptive_wait import AdaptiveWait
 
 class Web:
 
@@ -19,19 +20,29 @@ class Web:
     def wait_page_loaded(driver, locator: tuple = (By.TAG_NAME, "body"), timeout: int = 20):
         print(f"等待页面加载完成, 超时: {timeout}秒")
         try:
-            WebDriverWait(driver, timeout).until(EC.presence_of_element_located(locator))
-            WebDriverWait(driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+            AdaptiveWait(driver, timeout).until(EC.presence_of_element_located(locator))
+            AdaptiveWait(driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
             print("页面加载完成")
             return True
         except Exception as e:
             print(f"页面加载超时: 错误: {e}")
             return False
 
+    @staticmethod
+    def wait_network_idle(driver, idle_ms: int = 500, timeout: int = 20):
+        """等待没有进行中的请求且持续 idle_ms 毫秒无网络活动"""
+        return PageWait.wait_network_idle(driver, idle_ms=idle_ms, timeout=timeout)
+
+    @staticmethod
+    def wait_dom_stable(driver, idle_ms: int = 500, timeout: int = 20):
+        """等待 DOM 持续 idle_ms 毫秒没有变化"""
+        return PageWait.wait_dom_stable(driver, idle_ms=idle_ms, timeout=timeout)
+
     @staticmethod
     def wait_element_located(driver, locator: tuple, timeout: int = 20):
         print(f"等待元素定位: {locator[0]}='{locator[1]}', 超时: {timeout}秒")
         try:
-            element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located(locator))
+            element = AdaptiveWait(driver, timeout).until(EC.presence_of_element_located(locator))
             print(f"元素定位成功: {locator[0]}='{locator[1]}'")
             return element
         except Exception as e:
@@ -42,7 +53,7 @@ class Web:
     def wait_all_elements_located(driver, locator: tuple, timeout: int = 20):
         print(f"等待所有元素定位: {locator[0]}='{locator[1]}', 超时: {timeout}秒")
         try:
-            elements = WebDriverWait(driver, timeout).until(EC.presence_of_all_elements_located(locator))
+            elements = AdaptiveWait(driver, timeout).until(EC.presence_of_all_elements_located(locator))
             print(f"所有元素定位成功: 找到{len(elements)}个元素")
             return elements
         except Exception as e:
@@ -53,7 +64,7 @@ class Web:
     def wait_element_visible(driver, locator: tuple, timeout: int = 20):
         print(f"等待元素可见: {locator[0]}='{locator[1]}', 超时: {timeout}秒")
         try:
-            element = WebDriverWait(driver, timeout).until(EC.visibility_of_element_located(locator))
+            element = AdaptiveWait(driver, timeout).until(EC.visibility_of_element_located(locator))
             print(f"元素可见成功: {locator[0]}='{locator[1]}'")
             return element
         except Exception as e:
@@ -64,7 +75,7 @@ class Web:
     def wait_all_elements_visible(driver, locator: tuple, timeout: int = 20):
         print(f"等待所有元素可见: {locator[0]}='{locator[1]}', 超时: {timeout}秒")
         try:
-            elements = WebDriverWait(driver, timeout).until(EC.visibility_of_all_elements_located(locator))
+            elements = AdaptiveWait(driver, timeout).until(EC.visibility_of_all_elements_located(locator))
             print(f"所有元素可见成功: 找到{len(elements)}个可见元素")
             return elements
         except Exception as e:
@@ -76,12 +87,12 @@ class Web:
         try:
             if element is not None:
                 print(f"等待元素隐藏: WebElement, 超时: {timeout}秒")
-                result = WebDriverWait(driver, timeout).until(lambda d: not element.is_displayed())
+                result = AdaptiveWait(driver, timeout).until(lambda d: not element.is_displayed())
                 print("元素隐藏成功")
                 return result
             if locator is not None:
                 print(f"等待元素隐藏: {locator[0]}='{locator[1]}', 超时: {timeout}秒")
-                result = WebDriverWait(driver, timeout).until(EC.invisibility_of_element_located(locator))
+                result = AdaptiveWait(driver, timeout).until(EC.invisibility_of_element_located(locator))
                 print(f"元素隐藏成功: {locator[0]}='{locator[1]}'")
                 return result
             raise ValueError("必须提供 locator 或 element")
@@ -102,7 +113,7 @@ class Web:
                     if e.is_displayed():
                         return False
                 return True
-            WebDriverWait(driver, timeout).until(_all_hidden)
+            AdaptiveWait(driver, timeout).until(_all_hidden)
             print(f"所有元素隐藏成功: {locator[0]}='{locator[1]}'")
             return True
         except Exception as e:
@@ -113,7 +124,7 @@ class Web:
     def wait_element_clickable(driver, locator: tuple, timeout: int = 20):
         print(f"等待元素可点击: {locator[0]}='{locator[1]}', 超时: {timeout}秒")
         try:
-            element = WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(locator))
+            element = AdaptiveWait(driver, timeout).until(EC.element_to_be_clickable(locator))
             print(f"元素可点击成功: {locator[0]}='{locator[1]}'")
             return element
         except Exception as e:
@@ -151,20 +162,29 @@ class Web:
         print("鼠标悬停输入文本完成")
 
     @staticmethod
-    def switch_frame(driver, iframe_id: str | None = None, timeout: int = 20):
-        print("切换到默认文档上下文以刷新frame列表")
-        try:
-            driver.switch_to.default_content()
-        except Exception as e:
-            print(f"切回默认文档失败: {e}")
-        if iframe_id:
-            print(f"按ID切换到 iframe: {iframe_id}")
-            iframe_el = Web.wait_element_located(driver, (By.ID, iframe_id), timeout=timeout)
-        else:
+    def switch_frame(driver, iframe_id=None, timeout: int = 20):
+        """
+        切换 iframe
+        - 字符串/列表：从顶层文档开始的 frame 路径，如 "outer >> inner"（单个 ID/Name 即一级路径）
+        - WebElement：从当前位置进入该 iframe
+        - 空：进入页面中第一个 iframe
+        已在目标路径时不发送命令；与当前路径有公共前缀时只切换差异部分
+        """
+        if iframe_id is None or iframe_id == "":
             print("检测到 iframe，尝试切换...")
-            iframe_el = Web.wait_element_located(driver, (By.TAG_NAME, "iframe"), timeout=timeout)
-        driver.switch_to.frame(iframe_el)
-        print("已切换到 iframe")
+            path = FramePath.enter(driver, [(By.TAG_NAME, "iframe")], timeout=timeout)
+        elif isinstance(iframe_id, (str, list, tuple)):
+            print(f"切换到 iframe 路径: {iframe_id}")
+            path = FramePath.enter(driver, iframe_id, timeout=timeout)
+        else:
+            path = FramePath.enter_child(driver, iframe_id, timeout=timeout)
+        print(f"已切换到 iframe: {FramePath.format(path)}")
+        return True
+
+    @staticmethod
+    def switch_default_content(driver):
+        FramePath.reset(driver)
+        print("已切换到默认文档")
         return True
 
 
@@ -284,7 +304,7 @@ class Web:
                 (parent_title_locator[0], parent_title_locator[1].replace("//div[contains(@class,'spmain-submenu-title')]", "//ul[contains(@class,'spmain-submenu-content')]")),
                 timeout=timeout
             )
-        WebDriverWait(driver, timeout).until(lambda d: d.execute_script("return getComputedStyle(arguments[0]).display!=='none';", submenu_ul))
+        AdaptiveWait(driver, timeout).until(lambda d: d.execute_script("return getComputedStyle(arguments[0]).display!=='none';", submenu_ul))
         item_el = Web.wait_element_located(driver, item_li_locator, timeout=timeout)
         driver.execute_script("arguments[0].scrollIntoView({block:'center'});", item_el)
         def _ready(d):
@@ -301,99 +321,31 @@ class Web:
                 return bool(res)
             except:
                 return False
-        WebDriverWait(driver, timeout).until(_ready)
+        AdaptiveWait(driver, timeout).until(_ready)
         print("子菜单项目已可交互")
         return item_el
 
     @staticmethod
     def get_download_url_from_logs(driver, timeout=20):
         """从性能日志中捕获下载链接"""
-        print("正在监听网络日志以捕获下载链接...")
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            logs = driver.get_log('performance')
-            for entry in logs:
-                try:
-                    message = json.loads(entry['message'])['message']
-                    if message['method'] == 'Network.responseReceived':
-                        params = message['params']
-                        response = params['response']
-                        headers = {k.lower(): v for k, v in response.get('headers', {}).items()}
-                        
-                        # 检查是否为附件下载
-                        # 1. 检查 Content-Disposition
-                        content_disposition = headers.get('content-disposition', '')
-                        if 'attachment' in content_disposition or 'filename=' in content_disposition:
-                            url = response['url']
-                            print(f"捕获到下载链接(Content-Disposition): {url}")
-                            return url
-                        
-                        # 2. 检查 Content-Type (常见的Excel/二进制流)
-                        content_type = headers.get('content-type', '')
-                        if 'application/vnd.ms-excel' in content_type or \
-                        'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in content_type or \
-                        'application/octet-stream' in content_type:
-                            # 进一步过滤掉非目标URL（例如 .js, .css, .png 等，虽然ContentType通常不对，但为了保险）
-                            url = response['url']
-                            if not url.endswith('.js') and not url.endswith('.css'):
-                                print(f"捕获到下载链接(Content-Type): {url}")
-                                return url
-                                
-                except Exception:
-                    continue
-            time.sleep(1)
-        return None
+        return NetworkCapture.wait_for_download_url(driver, timeout=timeout, mode="log")
 
     @staticmethod
-    def http_download(url: str, save_path: str, driver=None, cookies=None, user_agent=None, timeout: int = 120):
-        """HTTP下载文件，支持使用Selenium的Cookies"""
+    def wait_download_url(driver, timeout=20, mode="auto", content_types=None, url_contains=""):
+        """
+        事件驱动地捕获下载链接（fetch/XHR 钩子 + 性能日志），匹配到即返回
+        需先调用 NetworkCapture.install(driver) 注入钩子，再触发下载
+        """
+        return NetworkCapture.wait_for_download_url(driver, timeout=timeout, mode=mode,
+                                                    content_types=content_types, url_contains=url_contains)
+
+    @staticmethod
+    def http_download(url: str, save_path: str, driver=None, cookies=None, user_agent=None, timeout: int = 120,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE, segments: int = 4, resume: bool = True):
+        """HTTP下载文件，支持使用Selenium的Cookies（按域名复用连接，大文件分段并行，支持断点续传）"""
         try:
-            # 确保保存目录存在
-            save_dir = Path(save_path).parent
-            save_dir.mkdir(parents=True, exist_ok=True)
-            
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            }
-            req_cookies = {}
-            
-            # 优先使用传入的cookies和ua
-            if user_agent:
-                headers["User-Agent"] = user_agent
-            if cookies:
-                req_cookies = cookies
-                
-            # 如果提供了driver且没有提供cookies，则从driver获取
-            if driver and not req_cookies:
-                selenium_cookies = driver.get_cookies()
-                for cookie in selenium_cookies:
-                    req_cookies[cookie['name']] = cookie['value']
-                
-                # 尝试获取当前User-Agent
-                if not user_agent:
-                    try:
-                        ua = driver.execute_script("return navigator.userAgent")
-                        if ua:
-                            headers["User-Agent"] = ua
-                    except:
-                        pass
-            
-            print(f"开始HTTP下载: {url}")
-            print(f"保存路径: {save_path}")
-            
-            response = requests.get(url, headers=headers, cookies=req_cookies, timeout=timeout, stream=True)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            downloaded_size = 0
-            
-            with open(save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-            print(f"文件下载成功：{save_path}")
+            DownloadManager.download(url, save_path, driver=driver, cookies=cookies, user_agent=user_agent,
+                                     timeout=timeout, chunk_size=chunk_size, segments=segments, resume=resume)
             return True
         except Exception as e:
             print(f"文件下载失败：{e}")
@@ -401,18 +353,19 @@ class Web:
 
     @staticmethod
     def switch_to_window_by_url(driver, url_substring: str, max_attempts: int = 3, interval: int = 10, verify_locator: tuple | None = None, verify_timeout: int = 10):
+        """
+        切换到 URL 包含子串的窗口（按句柄 -> URL 索引查找，不逐个切换窗口）
+        未找到时在 interval 秒内持续短轮询，窗口出现即切换
+        """
         print(f"开始切换窗口: 目标URL包含 '{url_substring}', 最大重试: {max_attempts}, 间隔: {interval}秒")
         for attempt in range(1, max_attempts + 1):
-            found = False
-            for handle in driver.window_handles:
-                driver.switch_to.window(handle)
-                current_url = driver.current_url
-                print(f"切换到窗口 {handle}, 当前URL: {current_url}")
-                if url_substring in current_url:
-                    found = True
-                    print(f"成功切换到目标窗口 {handle}")
-                    break
-            if found:
+            deadline = time.time() + (interval if attempt < max_attempts else 0)
+            handle = WindowIndex.find(driver, url_substring)
+            while handle is None and time.time() < deadline:
+                time.sleep(0.2)
+                handle = WindowIndex.find(driver, url_substring)
+            if handle:
+                print(f"成功切换到目标窗口 {handle}")
                 try:
                     Web.wait_page_loaded(driver, (By.TAG_NAME, "body"))
                     if verify_locator:
@@ -429,7 +382,6 @@ class Web:
             else:
                 if attempt < max_attempts:
                     print("未找到目标窗口，准备重试")
-                    time.sleep(interval)
                     continue
                 else:
                     raise Exception("未找到目标窗口句柄")